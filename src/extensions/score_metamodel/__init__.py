@@ -13,9 +13,11 @@
 import importlib
 import os
 import pkgutil
+import re
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from ruamel.yaml import YAML
 from sphinx.application import Sphinx
@@ -24,7 +26,9 @@ from sphinx_needs.config import NeedType
 from sphinx_needs.data import NeedsInfoType, NeedsView, SphinxNeedsData
 
 from .external_needs import connect_external_needs
+from .graph_conditions import GraphCheck, compile_graph_check
 from .log import CheckLogger
+from .parallel_checks import check_workers, run_local_checks_in_workers
 
 logger = logging.get_logger(__name__)
 
@@ -41,6 +45,22 @@ class ScoreNeedType(NeedType):
     parts: int
 
 
+@dataclass(frozen=True)
+class FieldPattern:
+    """An option or link of a need type and the compiled pattern of its values."""
+
+    field: str
+    # None if the pattern in metamodel.yaml is not a valid regex
+    pattern: re.Pattern[str] | None
+    required: bool
+    field_type: str  # 'option' or 'link'
+
+
+# Fields to validate per need type (directive). Types without mandatory options
+# are not part of it, as they have no type info for the semantic check.
+ValidationTable = dict[str, tuple[FieldPattern, ...]]
+
+
 @dataclass
 class ProhibitedWordCheck:
     name: str
@@ -128,10 +148,21 @@ def _run_checks(app: Sphinx, exception: Exception | None) -> None:
     )
     # Need-Local checks: checks which can be checked file-local, without a
     # graph of other needs.
-    for need in needs_local_needs.values():
-        for check in enabled_local_checks:
-            logger.debug(f"Running local check {check} for need {need['id']}")
-            check(app, need, log)
+    workers = check_workers(app.config.score_metamodel_check_workers)
+    if workers > 1:
+        logger.debug(f"Running local checks in {workers} worker processes")
+        # Options the checks may access directly, even if they are empty
+        keep = frozenset(default_options()).union(
+            *(check.option_check for check in app.config.prohibited_words_checks)
+        )
+        run_local_checks_in_workers(
+            app, needs_local_needs.values(), enabled_local_checks, log, workers, keep
+        )
+    else:
+        for need in needs_local_needs.values():
+            for check in enabled_local_checks:
+                logger.debug(f"Running local check {check} for need {need['id']}")
+                check(app, need, log)
 
     # Graph-Based checks: These warnings require a graph of all other needs to
     # be checked.
@@ -164,6 +195,102 @@ def convert_checks_to_dataclass(checks_dict) -> list[ProhibitedWordCheck]:
     ]
 
 
+def index_need_types(needs_types: list[ScoreNeedType]) -> dict[str, ScoreNeedType]:
+    """Map the directive of every need type to its definition."""
+    return {need_type["directive"]: need_type for need_type in needs_types}
+
+
+def get_need_type(
+    needs_types_by_directive: dict[str, ScoreNeedType], directive: str
+) -> ScoreNeedType:
+    try:
+        return needs_types_by_directive[directive]
+    except KeyError:
+        raise ValueError(f"Need type {directive} not found in needs_types") from None
+
+
+def collect_allowed_options(
+    needs_types: list[ScoreNeedType],
+) -> dict[str, frozenset[str]]:
+    """
+    The option names a need of each type may use: its options and links, and the
+    default options. The '*_back' links sphinx-needs adds are ignored by the check.
+    """
+    common = frozenset(default_options())
+    return {
+        need_type["directive"]: common.union(
+            need_type.get("mandatory_options") or {},
+            need_type.get("opt_opt") or {},
+            (link for link, _ in need_type.get("req_link") or ()),
+            (link for link, _ in need_type.get("opt_link") or ()),
+        )
+        for need_type in needs_types
+    }
+
+
+def _compile_pattern(
+    directive: str, field: str, pattern: str
+) -> re.Pattern[str] | None:
+    try:
+        return re.compile(pattern)
+    except (TypeError, re.error) as err:
+        logger.warning(
+            f"metamodel.yaml: {directive}.{field}: "
+            f"pattern `{pattern}` is not a valid regex pattern. ({err})",
+            type="score_metamodel",
+        )
+        return None
+
+
+def compile_validation_table(needs_types: list[ScoreNeedType]) -> ValidationTable:
+    """
+    Compile the option and link patterns of all need types once, instead of
+    for every need. Invalid patterns are reported here, their fields are then
+    only checked for presence.
+    """
+    table: ValidationTable = {}
+    for need_type in needs_types:
+        mandatory_options = need_type.get("mandatory_options") or {}
+        if not mandatory_options:
+            continue
+        directive = need_type["directive"]
+        fields = [
+            (mandatory_options, True, "option"),
+            (need_type.get("opt_opt") or {}, False, "option"),
+            (dict(need_type.get("req_link") or []), True, "link"),
+            # Optional links are not validated yet
+            # (dict(need_type.get("opt_link") or []), False, "link"),
+        ]
+        table[directive] = tuple(
+            FieldPattern(
+                field=field,
+                pattern=_compile_pattern(directive, field, pattern),
+                required=required,
+                field_type=field_type,
+            )
+            for patterns, required, field_type in fields
+            for field, pattern in patterns.items()
+        )
+    return table
+
+
+def compile_graph_checks(graph_check_dict: dict[str, Any]) -> dict[str, GraphCheck]:
+    """
+    Compile the conditions of all graph checks once. Invalid checks are reported
+    here and are not run.
+    """
+    compiled: dict[str, GraphCheck] = {}
+    for check_name, check_config in graph_check_dict.items():
+        try:
+            compiled[check_name] = compile_graph_check(check_name, check_config)
+        except (ValueError, TypeError) as err:
+            logger.warning(
+                f"metamodel.yaml: graph check {check_name}: {err}",
+                type="score_metamodel",
+            )
+    return compiled
+
+
 def load_metamodel_data():
     """
     Load and process metamodel.yaml.
@@ -173,6 +300,10 @@ def load_metamodel_data():
             - 'needs_types': A list of processed need types.
             - 'needs_extra_links': A list of extra link definitions.
             - 'needs_extra_options': A sorted list of all option keys.
+            - 'needs_types_by_directive': The need types by their directive.
+            - 'needs_types_validation': The compiled patterns per need type.
+            - 'needs_types_allowed_options': The allowed option names per need type.
+            - 'graph_checks_compiled': The graph checks with compiled conditions.
     """
     yaml_path = Path(__file__).resolve().parent / "metamodel.yaml"
 
@@ -263,6 +394,10 @@ def load_metamodel_data():
         "needs_extra_links": needs_extra_links_list,
         "needs_extra_options": needs_extra_options,
         "needs_graph_check": graph_check_dict,
+        "graph_checks_compiled": compile_graph_checks(graph_check_dict),
+        "needs_types_by_directive": index_need_types(needs_types_list),
+        "needs_types_validation": compile_validation_table(needs_types_list),
+        "needs_types_allowed_options": collect_allowed_options(needs_types_list),
     }
 
 
@@ -323,9 +458,14 @@ def setup(app: Sphinx) -> dict[str, str | bool]:
 
     # Assign everything to Sphinx config
     app.config.needs_types = metamodel["needs_types"]
+    # Shared by the local checks, to look up the type of a need
+    app.config.needs_types_by_directive = metamodel["needs_types_by_directive"]
+    app.config.needs_types_validation = metamodel["needs_types_validation"]
+    app.config.needs_types_allowed_options = metamodel["needs_types_allowed_options"]
     app.config.needs_extra_links = metamodel["needs_extra_links"]
     app.config.needs_extra_options = metamodel["needs_extra_options"]
     app.config.graph_checks = metamodel["needs_graph_check"]
+    app.config.graph_checks_compiled = metamodel["graph_checks_compiled"]
     app.config.prohibited_words_checks = metamodel["prohibited_words_checks"]
 
     # app.config.stop_words = metamodel["stop_words"]
@@ -348,6 +488,17 @@ def setup(app: Sphinx) -> dict[str, str | bool]:
         ),
     )
 
+    app.add_config_value(
+        "score_metamodel_check_workers",
+        1,
+        rebuild="",
+        types=int,
+        description=(
+            "Number of processes running the need-local checks. "
+            "1 runs them in the build process, 0 uses one process per CPU"
+        ),
+    )
+
     _ = app.connect("build-finished", _run_checks)
 
     return {
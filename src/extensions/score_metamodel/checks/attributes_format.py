@@ -13,19 +13,11 @@
 
 import string
 
-from score_metamodel import CheckLogger, ProhibitedWordCheck, ScoreNeedType, local_check
+from score_metamodel import CheckLogger, ProhibitedWordCheck, get_need_type, local_check
 from sphinx.application import Sphinx
 from sphinx_needs.data import NeedsInfoType
 
 
-def get_need_type(needs_types: list[ScoreNeedType], directive: str) -> ScoreNeedType:
-    for need_type in needs_types:
-        assert isinstance(need_type, dict), need_type
-        if need_type["directive"] == directive:
-            return need_type
-    raise ValueError(f"Need type {directive} not found in needs_types")
-
-
 # req-Id: tool_req__docs_common_attr_id_scheme
 @local_check
 def check_id_format(app: Sphinx, need: NeedsInfoType, log: CheckLogger):
@@ -34,7 +26,7 @@ def check_id_format(app: Sphinx, need: NeedsInfoType, log: CheckLogger):
     the requirement id or not.
     ---
     """
-    need_options = get_need_type(app.config.needs_types, need["type"])
+    need_options = get_need_type(app.config.needs_types_by_directive, need["type"])
     expected_parts = need_options.get("parts", 3)
     id_parts = need["id"].split("__")
     id_parts_len = len(id_parts)
@@ -105,7 +97,7 @@ def _check_options_for_prohibited_words(
 # req-Id: tool_req__docs_common_attr_title
 @local_check
 def check_for_prohibited_words(app: Sphinx, need: NeedsInfoType, log: CheckLogger):
-    need_options = get_need_type(app.config.needs_types, need["type"])
+    need_options = get_need_type(app.config.needs_types_by_directive, need["type"])
     prohibited_word_checks: list[ProhibitedWordCheck] = (
         app.config.prohibited_words_checks
     )
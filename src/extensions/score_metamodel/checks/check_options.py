@@ -14,24 +14,13 @@ import re
 
 from score_metamodel import (
     CheckLogger,
-    ScoreNeedType,
-    default_options,
+    FieldPattern,
+    ValidationTable,
     local_check,
 )
 from sphinx.application import Sphinx
 from sphinx_needs.data import NeedsInfoType
 
-FieldCheck = tuple[dict[str, str], bool]
-CheckingDictType = dict[str, list[FieldCheck]]
-
-
-def get_need_type(needs_types: list[ScoreNeedType], directive: str) -> ScoreNeedType:
-    for need_type in needs_types:
-        assert isinstance(need_type, dict), need_type
-        if need_type["directive"] == directive:
-            return need_type
-    raise ValueError(f"Need type {directive} not found in needs_types")
-
 
 def _normalize_values(raw_value: str | list[str] | None) -> list[str]:
     """Normalize a raw value into a list of strings."""
@@ -45,24 +34,23 @@ def _normalize_values(raw_value: str | list[str] | None) -> list[str]:
 
 
 def _validate_value_pattern(
-    value: str, pattern: str, need: NeedsInfoType, field: str, log: CheckLogger
+    value: str,
+    pattern: re.Pattern[str],
+    need: NeedsInfoType,
+    field: str,
+    log: CheckLogger,
 ) -> None:
     """Check if a value matches the given pattern, log warnings if not."""
-    try:
-        if not re.match(pattern, value):
-            log.warning_for_option(need, field, f"does not follow pattern `{pattern}`.")
-    except TypeError:
+    if not pattern.match(value):
         log.warning_for_option(
-            need, field, f"pattern `{pattern}` is not a valid regex pattern."
+            need, field, f"does not follow pattern `{pattern.pattern}`."
         )
 
 
 def validate_fields(
     need: NeedsInfoType,
     log: CheckLogger,
-    fields: dict[str, str],
-    required: bool,
-    field_type: str,
+    fields: tuple[FieldPattern, ...],
     allowed_prefixes: list[str],
 ):
     """
@@ -70,9 +58,8 @@ def validate_fields(
 
     :param need: The need object containing the data.
     :param log: Logger for warnings.
-    :param fields: A dictionary of field names and their regex patterns.
-    :param required: Whether the fields are required (True) or optional (False).
-    :param field_type: A string indicating the field type ('option' or 'link').
+    :param fields: The fields of the need type with their compiled regex patterns,
+                   whether they are required and their type ('option' or 'link').
     """
 
     def remove_prefix(word: str, prefixes: list[str]) -> str:
@@ -80,12 +67,12 @@ def validate_fields(
         # Removes any prefix allowed by configuration, if prefix is there.
         return [word.removeprefix(prefix) for prefix in prefixes][0]
 
-    for field, pattern in fields.items():
-        raw_value: str | list[str] | None = need.get(field, None)
+    for field in fields:
+        raw_value: str | list[str] | None = need.get(field.field, None)
         if raw_value in [None, [], ""]:
-            if required:
+            if field.required:
                 log.warning_for_need(
-                    need, f"is missing required {field_type}: `{field}`."
+                    need, f"is missing required {field.field_type}: `{field.field}`."
                 )
             continue  # Skip empty optional fields
         # Try except used to add more context to Error without passing variables
@@ -97,11 +84,14 @@ def validate_fields(
                 f"An Attribute inside need {need['id']} is "
                 "not of type str. Only Strings are allowed"
             ) from err
+        # Invalid patterns are reported once, when the metamodel is loaded
+        if field.pattern is None:
+            continue
         # The filter ensures that the function is only called when needed.
         for value in values:
             if allowed_prefixes:
                 value = remove_prefix(value, allowed_prefixes)
-            _validate_value_pattern(value, pattern, need, field, log)
+            _validate_value_pattern(value, field.pattern, need, field.field, log)
 
 
 # req-Id: tool_req__docs_req_attr_reqtype
@@ -120,43 +110,18 @@ def check_options(
     Checks that required and optional options and links are present
     and follow their defined patterns.
     """
-    production_needs_types = app.config.needs_types
-
-    try:
-        need_options = get_need_type(production_needs_types, need["type"])
-    except ValueError:
-        log.warning_for_option(need, "type", "no type info defined for semantic check.")
-        return
+    # Compiled by load_metamodel_data, only types with mandatory options are in it
+    validation_table: ValidationTable = app.config.needs_types_validation
 
-    if not need_options.get("mandatory_options", {}):
+    fields = validation_table.get(need["type"])
+    if fields is None:
         log.warning_for_option(need, "type", "no type info defined for semantic check.")
         return
 
-    # Validate Options and Links
-    checking_dict: CheckingDictType = {
-        "option": [
-            (need_options.get("mandatory_options", {}), True),
-            (need_options.get("opt_opt", {}), False),
-        ],
-        "link": [
-            (dict(need_options.get("req_link", [])), True),
-            #    (dict(need_options.get("opt_link", [])), False),
-        ],
-    }
-
     # If undefined this is an empty list
     allowed_prefixes = app.config.allowed_external_prefixes
 
-    for field_type, check_fields in checking_dict.items():
-        for field_values, is_required in check_fields:
-            validate_fields(
-                need,
-                log,
-                field_values,
-                required=is_required,
-                field_type=field_type,
-                allowed_prefixes=allowed_prefixes,
-            )
+    validate_fields(need, log, fields, allowed_prefixes=allowed_prefixes)
 
 
 @local_check
@@ -171,37 +136,23 @@ def check_extra_options(
     system attributes.
     """
 
-    production_needs_types = app.config.needs_types
-    default_options_list = default_options()
-    try:
-        need_options = get_need_type(production_needs_types, need["type"])
-    except ValueError:
+    # Computed once by load_metamodel_data
+    allowed_options = app.config.needs_types_allowed_options.get(need["type"])
+    if allowed_options is None:
         msg = "no type info defined for semantic check."
         log.warning_for_option(need, "type", msg)
         return
 
-    required_options: dict[str, str] = need_options.get("mandatory_options", {})
-    optional_options: dict[str, str] = need_options.get("opt_opt", {})
-    required_links: list[str] = [x[0] for x in need_options.get("req_link", ())]
-    optional_links: list[str] = [x[0] for x in need_options.get("opt_link", ())]
-
-    allowed_options = (
-        list(required_options.keys())
-        + list(optional_options.keys())
-        + required_links
-        + optional_links
-        + default_options_list
-    )
-
-    extra_options = [
+    extra_options = {
         option
-        for option in need
-        if option not in allowed_options
-        and need[option] not in [None, {}, "", []]
-        and not option.endswith("_back")
-    ]
+        for option in need.keys() - allowed_options
+        if need[option] not in [None, {}, "", []] and not option.endswith("_back")
+    }
 
     if extra_options:
-        extra_options_str = ", ".join(f"`{option}`" for option in extra_options)
+        # In the order of the need, so the warning is stable
+        extra_options_str = ", ".join(
+            f"`{option}`" for option in need if option in extra_options
+        )
         msg = f"has these extra options: {extra_options_str}."
         log.warning_for_need(need, msg)
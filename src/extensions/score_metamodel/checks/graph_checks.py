@@ -10,135 +10,64 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
-import operator
-from collections.abc import Callable
-from functools import reduce
-from typing import Any
+from collections.abc import Iterable
 
 from score_metamodel import (
     CheckLogger,
+    ScoreNeedType,
     graph_check,
 )
+from score_metamodel.graph_conditions import GraphCheck
 from sphinx.application import Sphinx
-from sphinx_needs.config import NeedType
 from sphinx_needs.data import NeedsInfoType, NeedsView
 
 
-def eval_need_check(need: NeedsInfoType, check: str, log: CheckLogger) -> bool:
-    """
-    Perform a single check on a need:
-    1. Split the check into its parts
-       (e.g. "status == valid" -> ["status", "==", "valid"])
-    2. Perform the check with the operator specified in the yaml file.
-    """
-    oper: dict[str, Callable[[Any, Any], bool]] = {
-        "==": operator.eq,
-        "!=": operator.ne,
-        ">": operator.gt,
-        "<": operator.lt,
-        ">=": operator.ge,
-        "<=": operator.le,
-    }
-
-    parts = check.split(" ")
-
-    if len(parts) != 3:
-        raise ValueError(f"Invalid check defined: {check}")
-
-    if parts[1] not in oper:
-        raise ValueError(f"Binary Operator not defined: {parts[1]}")
-
-    if parts[0] not in need:
-        msg = f"Attribute not defined: {parts[0]}"
-        log.warning_for_need(need, msg)
-        return False
-
-    return oper[parts[1]](need[parts[0]], parts[2])
-
-
-def eval_need_condition(
-    need: NeedsInfoType, condition: str | dict[str, list[Any]], log: CheckLogger
-) -> bool:
-    """Evaluate a condition on a need:
-    1. Check if the condition is only a simple check (e.g. "status == valid")
-       If so call the check function.
-    2. If the condition is a combination of multiple checks
-       (e.g. "and: [check1, check2]")
-       Recursively call the eval_need_function for each check and combine the
-       results with the binary operation which was specified in the yaml file.
-    """
+def partition_needs_by_type(
+    needs: Iterable[NeedsInfoType],
+) -> dict[str, list[NeedsInfoType]]:
+    """Group the needs by their type, keeping their order within each type."""
+    needs_by_type: dict[str, list[NeedsInfoType]] = {}
+    for need in needs:
+        needs_by_type.setdefault(need["type"], []).append(need)
+    return needs_by_type
 
-    oper: dict[str, Any] = {
-        "and": operator.and_,
-        "or": operator.or_,
-        "not": lambda x: not x,
-        "xor": operator.xor,
-    }
-
-    if not isinstance(condition, dict):
-        if not isinstance(condition, str):
-            raise ValueError(
-                f"Invalid condition type: condition ({type(condition)}),"
-                " expected str or dict."
-            )
-        return eval_need_check(need, condition, log)
-
-    cond: str = list(condition.keys())[0]
-    vals: list[Any] = list(condition.values())[0]
-
-    if cond == "not":
-        if not isinstance(vals, list) or len(vals) != 1:
-            raise ValueError("Operator 'not' requires exactly one operand.")
-        return oper["not"](eval_need_condition(need, vals[0], log))
-
-    if cond in ["and", "or", "xor"]:
-        return reduce(
-            lambda a, b: oper[cond](a, b),
-            (eval_need_condition(need, val, log) for val in vals),
-        )
-    raise ValueError(f"Unsupported condition operator: {cond}")
+
+def warn_unknown_need_types(
+    needs_types_by_directive: dict[str, ScoreNeedType],
+    checks: Iterable[GraphCheck],
+    log: CheckLogger,
+):
+    """Report every need type used by the graph checks but not defined, once."""
+    used_types = dict.fromkeys(pat for check in checks for pat in check.types)
+    for pat in used_types:
+        if pat not in needs_types_by_directive:
+            log.warning(f"Unknown need type `{pat}` in graph check.", location=None)
 
 
 def filter_needs_by_criteria(
-    needs_types: list[NeedType],
-    needs: list[NeedsInfoType],
-    needs_selection_criteria: dict[str, str],
+    needs_by_type: dict[str, list[NeedsInfoType]],
+    check: GraphCheck,
     log: CheckLogger,
 ) -> list[NeedsInfoType]:
-    """Create a list of needs that match the selection criteria.:
-    - If it is an include selection add the include to the pattern
-    - If it is an exclude selection add a "^" to the pattern
+    """Create a list of needs which fulfill the condition of the check.
+    - If it is an include selection only the buckets of these types are looked at
+    - If it is an exclude selection all buckets except these types
     """
-
-    selected_needs: list[NeedsInfoType] = []
-    pattern: list[str] = []
-    need_pattern: str = list(needs_selection_criteria.keys())[0]
-    # Verify Inputs
-    if need_pattern in ["include", "exclude"]:
-        for pat in list(needs_selection_criteria.values())[0].split(","):
-            pattern.append(pat.lstrip())
+    if check.include:
+        buckets = [needs_by_type.get(pat, []) for pat in check.types]
     else:
-        raise ValueError(f"Invalid need selection: {needs_selection_criteria}")
+        buckets = [
+            needs
+            for need_type, needs in needs_by_type.items()
+            if check.selects_type(need_type)
+        ]
 
-    if "condition" in needs_selection_criteria:
-        condition = needs_selection_criteria["condition"]
-    else:
-        raise ValueError(f"Invalid selection: {needs_selection_criteria}")
-
-    for pat in pattern:
-        if not any(need_type["directive"] == pat for need_type in needs_types):
-            log.warning(f"Unknown need type `{pat}` in graph check.")
-
-    for need in needs:
-        if need_pattern == "include":
-            sel = need["type"] in pattern
-        else:
-            sel = need["type"] not in pattern
-
-        if sel and (eval_need_condition(need, condition, log)):
-            selected_needs.append(need)
-
-    return selected_needs
+    return [
+        need
+        for needs in buckets
+        for need in needs
+        if check.condition.evaluate(need, log)
+    ]
 
 
 @graph_check
@@ -147,27 +76,27 @@ def check_metamodel_graph(
     all_needs: NeedsView,
     log: CheckLogger,
 ):
-    graph_checks_global = app.config.graph_checks
+    # Compiled once by load_metamodel_data
+    graph_checks_global: dict[str, GraphCheck] = app.config.graph_checks_compiled
     # Convert list to dictionary for easy lookup
     needs_dict_all = {need["id"]: need for need in all_needs.values()}
-    needs_local = list(all_needs.filter_is_external(False).values())
+    # Partitioned once, each check only looks at the types it selects
+    needs_by_type = partition_needs_by_type(
+        all_needs.filter_is_external(False).values()
+    )
+
+    warn_unknown_need_types(
+        app.config.needs_types_by_directive, graph_checks_global.values(), log
+    )
 
     # Iterate over all graph checks
-    for check_name, check_config in graph_checks_global.items():
-        needs_selection_criteria: dict[str, str] = check_config.get("needs")
-        check_to_perform: dict[str, str | dict] = check_config.get("check")
-        explanation = check_config.get("explanation", "")
-        assert explanation != "", (
-            f"Explanation for graph check {check_name} is missing. "
-            "Explanations are mandatory for graph checks."
-        )
+    for check in graph_checks_global.values():
         # Get all needs matching the selection criteria
-        selected_needs = filter_needs_by_criteria(
-            app.config.needs_types, needs_local, needs_selection_criteria, log
-        )
+        selected_needs = filter_needs_by_criteria(needs_by_type, check, log)
 
         for need in selected_needs:
-            for parent_relation in list(check_to_perform.keys()):
+            for link_check in check.link_checks:
+                parent_relation = link_check.relation
                 if parent_relation not in need:
                     msg = (
                         f"Attribute not defined: `{parent_relation}` "
@@ -185,12 +114,10 @@ def check_metamodel_graph(
                         log.warning_for_need(need, msg)
                         continue
 
-                    if not eval_need_condition(
-                        parent_need, check_to_perform[parent_relation], log
-                    ):
+                    if not link_check.condition.evaluate(parent_need, log):
                         msg = (
                             f"Parent need `{parent_id}` does not fulfill "
-                            f"condition `{check_to_perform[parent_relation]}`."
-                            f" Explanation: {explanation}"
+                            f"condition `{link_check.source}`."
+                            f" Explanation: {check.explanation}"
                         )
                         log.warning_for_need(need, msg)
@@ -0,0 +1,192 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Compiles the graph checks of metamodel.yaml once, when the metamodel is loaded.
+
+A condition like 'safety == QM' or {'and': ['safety != QM', 'status == valid']}
+becomes a small tree of nodes, with the operators and attribute names already
+resolved. Evaluating it for a need does not parse anything anymore.
+The nodes are plain dataclasses, so they can be pickled with the Sphinx config.
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any
+
+from sphinx_needs.data import NeedsInfoType
+
+from .log import CheckLogger
+
+COMPARISON_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+COMBINING_OPERATORS: dict[str, Callable[[bool, bool], bool]] = {
+    "and": operator.and_,
+    "or": operator.or_,
+    "xor": operator.xor,
+}
+
+
+class Condition(ABC):
+    """A compiled condition, which can be evaluated for any need."""
+
+    @abstractmethod
+    def evaluate(self, need: NeedsInfoType, log: CheckLogger) -> bool: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison(Condition):
+    """'<attribute> <operator> <value>', e.g. 'status == valid'"""
+
+    attribute: str
+    compare: Callable[[Any, Any], bool]
+    value: str
+
+    def evaluate(self, need: NeedsInfoType, log: CheckLogger) -> bool:
+        if self.attribute not in need:
+            log.warning_for_need(need, f"Attribute not defined: {self.attribute}")
+            return False
+        return self.compare(need[self.attribute], self.value)
+
+
+@dataclass(frozen=True, slots=True)
+class Negation(Condition):
+    operand: Condition
+
+    def evaluate(self, need: NeedsInfoType, log: CheckLogger) -> bool:
+        return not self.operand.evaluate(need, log)
+
+
+@dataclass(frozen=True, slots=True)
+class Combination(Condition):
+    """'and', 'or' or 'xor' of several conditions"""
+
+    combine: Callable[[bool, bool], bool]
+    operands: tuple[Condition, ...]
+
+    def evaluate(self, need: NeedsInfoType, log: CheckLogger) -> bool:
+        # All operands are evaluated, so every missing attribute is reported
+        return reduce(
+            self.combine, [operand.evaluate(need, log) for operand in self.operands]
+        )
+
+
+def compile_condition(condition: str | dict[str, list[Any]]) -> Condition:
+    """
+    Compile a condition of a graph check:
+    1. A simple check (e.g. "status == valid") is split into its parts.
+    2. A combination of multiple checks (e.g. "and: [check1, check2]") is
+       compiled recursively.
+    Raises a ValueError if the condition is not valid, or a TypeError if it is
+    neither a string nor a dict.
+    """
+    if isinstance(condition, str):
+        parts = condition.split(" ")
+        if len(parts) != 3:
+            raise ValueError(f"Invalid check defined: {condition}")
+        attribute, oper, value = parts
+        if oper not in COMPARISON_OPERATORS:
+            raise ValueError(f"Binary Operator not defined: {oper}")
+        return Comparison(attribute, COMPARISON_OPERATORS[oper], value)
+
+    if not isinstance(condition, dict):
+        raise TypeError(
+            f"Invalid condition type: condition ({type(condition)}),"
+            " expected str or dict."
+        )
+
+    cond, vals = next(iter(condition.items()))
+
+    if cond == "not":
+        if not isinstance(vals, list) or len(vals) != 1:
+            raise ValueError("Operator 'not' requires exactly one operand.")
+        return Negation(compile_condition(vals[0]))
+
+    if cond in COMBINING_OPERATORS:
+        if not isinstance(vals, list) or not vals:
+            raise ValueError(f"Operator '{cond}' requires at least one operand.")
+        return Combination(
+            COMBINING_OPERATORS[cond], tuple(compile_condition(val) for val in vals)
+        )
+    raise ValueError(f"Unsupported condition operator: {cond}")
+
+
+@dataclass(frozen=True)
+class LinkCheck:
+    """The condition every need linked via 'relation' has to fulfill."""
+
+    relation: str
+    condition: Condition
+    # As written in metamodel.yaml, for the warning
+    source: str | dict[str, Any]
+
+
+@dataclass(frozen=True)
+class GraphCheck:
+    name: str
+    # Whether the needs of 'types' are checked, or all needs except them
+    include: bool
+    types: tuple[str, ...]
+    condition: Condition
+    link_checks: tuple[LinkCheck, ...]
+    explanation: str
+
+    def selects_type(self, need_type: str) -> bool:
+        return (need_type in self.types) == self.include
+
+
+def compile_graph_check(name: str, config: dict[str, Any]) -> GraphCheck:
+    """
+    Compile one entry of 'graph_checks' in metamodel.yaml.
+    Raises a ValueError (or a TypeError) if the check is not valid.
+    """
+    needs_selection_criteria: dict[str, str] = config.get("needs", {})
+    need_pattern = next(iter(needs_selection_criteria), None)
+    if need_pattern not in ["include", "exclude"]:
+        raise ValueError(f"Invalid need selection: {needs_selection_criteria}")
+    if "condition" not in needs_selection_criteria:
+        raise ValueError(f"Invalid selection: {needs_selection_criteria}")
+
+    explanation = config.get("explanation", "")
+    if not explanation:
+        raise ValueError(
+            f"Explanation for graph check {name} is missing. "
+            "Explanations are mandatory for graph checks."
+        )
+
+    check_to_perform: dict[str, str | dict[str, Any]] = config.get("check", {})
+    return GraphCheck(
+        name=name,
+        include=need_pattern == "include",
+        types=tuple(
+            dict.fromkeys(
+                pat.lstrip()
+                for pat in needs_selection_criteria[need_pattern].split(",")
+            )
+        ),
+        condition=compile_condition(needs_selection_criteria["condition"]),
+        link_checks=tuple(
+            LinkCheck(relation, compile_condition(source), source)
+            for relation, source in check_to_perform.items()
+        ),
+        explanation=explanation,
+    )
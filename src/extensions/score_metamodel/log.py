@@ -11,7 +11,8 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 import os
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, Literal
 
 from docutils.nodes import Node
 from sphinx_needs import logging
@@ -20,6 +21,8 @@ from sphinx_needs.logging import SphinxLoggerAdapter
 
 Location = str | tuple[str | None, int | None] | Node | None
 NewCheck = tuple[str, Location]
+# A message logged by a check in a worker process: kind, msg, location, is_new_check
+CheckRecord = tuple[Literal["check", "info", "warning"], str, Location, bool]
 logger = logging.get_logger(__name__)
 
 
@@ -31,6 +34,10 @@ class CheckLogger:
         self._prefix = prefix
         self._new_checks: list[NewCheck] = []
 
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
     @staticmethod
     def _location(need: NeedsInfoType, prefix: str):
         def get(key: str) -> Any:
@@ -89,6 +96,16 @@ class CheckLogger:
     ):
         self._log.warning(msg, type="score_metamodel", location=location)
 
+    def replay(self, records: Iterable[CheckRecord]):
+        """Log the messages recorded by a CheckRecorder, in their order."""
+        for kind, msg, location, is_new_check in records:
+            if kind == "check":
+                self._log_message(msg, location, is_new_check)
+            elif kind == "info":
+                self.info(msg, location)
+            else:
+                self.warning(msg, location)
+
     @property
     def has_warnings(self):
         return self._warning_count > 0
@@ -120,3 +137,36 @@ class CheckLogger:
 
         for msg, location in self._new_checks:
             self.info(msg, location)
+
+
+class CheckRecorder(CheckLogger):
+    """
+    Records the messages of checks instead of logging them. Used in worker
+    processes, the records are replayed by the CheckLogger of the build.
+    """
+
+    def __init__(self, prefix: str):
+        super().__init__(logger, prefix)
+        self.records: list[CheckRecord] = []
+
+    def _log_message(
+        self,
+        msg: str,
+        location: Location,
+        is_new_check: bool = False,
+    ):
+        self.records.append(("check", msg, location, is_new_check))
+
+    def info(
+        self,
+        msg: str,
+        location: Location,
+    ):
+        self.records.append(("info", msg, location, False))
+
+    def warning(
+        self,
+        msg: str,
+        location: Location,
+    ):
+        self.records.append(("warning", msg, location, False))
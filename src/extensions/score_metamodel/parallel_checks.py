@@ -0,0 +1,119 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Runs the need-local checks in worker processes ('score_metamodel_check_workers').
+
+The Sphinx app can not be sent to other processes. The local checks only read
+a few config values, so the workers get a stand-in app with just these (the
+compiled metamodel), and the needs as plain dicts without their empty options.
+The needs are split into consecutive chunks, and the messages recorded for each
+chunk are replayed through the CheckLogger of the build in the order of the
+chunks. So the log is the same as when running the checks one after another.
+"""
+
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, cast
+
+from sphinx.application import Sphinx
+from sphinx_needs.data import NeedsInfoType
+
+from .log import CheckLogger, CheckRecord, CheckRecorder
+
+# The config values the local checks use
+LOCAL_CHECK_CONFIG = [
+    "needs_types_by_directive",
+    "needs_types_validation",
+    "needs_types_allowed_options",
+    "allowed_external_prefixes",
+    "prohibited_words_checks",
+]
+
+# Several chunks per worker, so a slow chunk does not hold up the others
+CHUNKS_PER_WORKER = 4
+
+LocalCheck = Callable[[Any, NeedsInfoType, CheckLogger], None]
+
+
+def check_workers(configured: int) -> int:
+    """Number of worker processes, 0 means one per CPU."""
+    return configured if configured > 0 else os.cpu_count() or 1
+
+
+def local_check_app(app: Sphinx) -> SimpleNamespace:
+    """A picklable stand-in for 'app', with the config the local checks use."""
+    return SimpleNamespace(
+        config=SimpleNamespace(
+            **{name: getattr(app.config, name) for name in LOCAL_CHECK_CONFIG}
+        )
+    )
+
+
+def minimal_need(need: NeedsInfoType, keep: frozenset[str]) -> NeedsInfoType:
+    """
+    The need as a plain dict, without the empty options (most of them are).
+    The options in 'keep' are always sent, even if they are empty.
+    """
+    # Not a complete NeedsInfoType anymore, but the checks only read the
+    # options it still has.
+    return cast(
+        NeedsInfoType,
+        {
+            option: value
+            for option, value in need.items()
+            if option in keep or value not in [None, {}, "", []]
+        },
+    )
+
+
+def _check_chunk(
+    checks: list[LocalCheck],
+    app: SimpleNamespace,
+    prefix: str,
+    needs: list[NeedsInfoType],
+) -> list[CheckRecord]:
+    log = CheckRecorder(prefix)
+    for need in needs:
+        for check in checks:
+            check(app, need, log)
+    return log.records
+
+
+def run_local_checks_in_workers(
+    app: Sphinx,
+    needs: Iterable[NeedsInfoType],
+    checks: list[LocalCheck],
+    log: CheckLogger,
+    workers: int,
+    keep: frozenset[str] = frozenset(),
+):
+    """
+    Run 'checks' on all 'needs' in 'workers' processes and log their messages
+    through 'log', in the same order as when running them in this process.
+    """
+    shipped = [minimal_need(need, keep) for need in needs]
+    if not shipped or not checks:
+        return
+    chunk_size = -(-len(shipped) // (workers * CHUNKS_PER_WORKER))
+    chunks = [
+        shipped[start : start + chunk_size]
+        for start in range(0, len(shipped), chunk_size)
+    ]
+    check_chunk = partial(_check_chunk, checks, local_check_app(app), log.prefix)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        # map returns the results in the order of the chunks
+        for records in executor.map(check_chunk, chunks):
+            log.replay(records)
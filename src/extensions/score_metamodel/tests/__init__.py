@@ -16,10 +16,10 @@ from unittest.mock import MagicMock
 import pytest
 from sphinx.util.logging import SphinxLoggerAdapter
 
-from src.extensions.score_metamodel import CheckLogger, NeedsInfoType
+from src.extensions.score_metamodel import CheckLogger, NeedsInfoType, ScoreNeedType
 
 
-def fake_check_logger():
+def fake_check_logger(prefix: str | None = None):
     """Creates a CheckLogger with a mocked backend."""
 
     class FakeCheckLogger(CheckLogger):
@@ -27,7 +27,7 @@ def fake_check_logger():
             self._mock_logger = MagicMock(spec=SphinxLoggerAdapter)
             self._mock_logger.warning = MagicMock()
             self._mock_logger.info = MagicMock()
-            app_path = MagicMock()
+            app_path = MagicMock() if prefix is None else prefix
             super().__init__(self._mock_logger, app_path)
 
         def assert_no_warnings(self):
@@ -106,3 +106,14 @@ def need(**kwargs: Any) -> NeedsInfoType:
     kwargs.setdefault("lineno", "42")
 
     return NeedsInfoType(**kwargs)
+
+
+def need_type(**kwargs: Any) -> ScoreNeedType:
+    """Convenience function to create a ScoreNeedType object with some defaults."""
+
+    kwargs.setdefault("title", kwargs["directive"])
+    kwargs.setdefault("prefix", kwargs["directive"] + "__")
+    kwargs.setdefault("tags", [])
+    kwargs.setdefault("parts", 3)
+
+    return ScoreNeedType(**kwargs)
@@ -0,0 +1,170 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Measures how long evaluating the conditions of all graph checks in metamodel.yaml
+takes with the previous interpreter, which parses them for every need, and
+when they are compiled once.
+
+Run it from the repository root:
+    python -m src.extensions.score_metamodel.tests.benchmark_graph_conditions
+"""
+
+import argparse
+import operator
+import time
+from collections.abc import Callable
+from functools import reduce
+from typing import Any
+
+from sphinx_needs import logging
+from sphinx_needs.data import NeedsInfoType
+
+from src.extensions.score_metamodel import CheckLogger, load_metamodel_data
+from src.extensions.score_metamodel.graph_conditions import (
+    Condition,
+    compile_condition,
+)
+from src.extensions.score_metamodel.tests import need
+
+
+# The interpreter checks/graph_checks.py used before graph_conditions.py, as it
+# was. It splits and dispatches every condition again for every need.
+def eval_need_check(need: NeedsInfoType, check: str, log: CheckLogger) -> bool:
+    oper: dict[str, Callable[[Any, Any], bool]] = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        ">": operator.gt,
+        "<": operator.lt,
+        ">=": operator.ge,
+        "<=": operator.le,
+    }
+
+    parts = check.split(" ")
+
+    if len(parts) != 3:
+        raise ValueError(f"Invalid check defined: {check}")
+
+    if parts[1] not in oper:
+        raise ValueError(f"Binary Operator not defined: {parts[1]}")
+
+    if parts[0] not in need:
+        msg = f"Attribute not defined: {parts[0]}"
+        log.warning_for_need(need, msg)
+        return False
+
+    return oper[parts[1]](need[parts[0]], parts[2])
+
+
+def eval_need_condition(
+    need: NeedsInfoType, condition: str | dict[str, list[Any]], log: CheckLogger
+) -> bool:
+    oper: dict[str, Any] = {
+        "and": operator.and_,
+        "or": operator.or_,
+        "not": lambda x: not x,
+        "xor": operator.xor,
+    }
+
+    if not isinstance(condition, dict):
+        if not isinstance(condition, str):
+            raise ValueError(
+                f"Invalid condition type: condition ({type(condition)}),"
+                " expected str or dict."
+            )
+        return eval_need_check(need, condition, log)
+
+    cond: str = list(condition.keys())[0]
+    vals: list[Any] = list(condition.values())[0]
+
+    if cond == "not":
+        if not isinstance(vals, list) or len(vals) != 1:
+            raise ValueError("Operator 'not' requires exactly one operand.")
+        return oper["not"](eval_need_condition(need, vals[0], log))
+
+    if cond in ["and", "or", "xor"]:
+        return reduce(
+            lambda a, b: oper[cond](a, b),
+            (eval_need_condition(need, val, log) for val in vals),
+        )
+    raise ValueError(f"Unsupported condition operator: {cond}")
+
+
+def make_needs(count: int) -> list[NeedsInfoType]:
+    return [
+        need(
+            id=f"feat_req__example__{i}",
+            type="feat_req",
+            safety=["QM", "ASIL_B"][i % 2],
+            status=["valid", "draft"][i % 3 % 2],
+            security=["YES", "NO"][i % 5 % 2],
+        )
+        for i in range(count)
+    ]
+
+
+def graph_conditions() -> list[Any]:
+    """All conditions of the graph checks, as written in metamodel.yaml."""
+    conditions: list[Any] = []
+    for check in load_metamodel_data()["needs_graph_check"].values():
+        conditions.append(check["needs"]["condition"])
+        conditions.extend(check["check"].values())
+    return conditions
+
+
+def _best_of(repeats: int, func: Callable[[], object]) -> float:
+    timings: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(count: int, repeats: int) -> tuple[float, float]:
+    needs = make_needs(count)
+    conditions = graph_conditions()
+    log = CheckLogger(logging.get_logger(__name__), "")
+
+    def parsed_per_need():
+        for condition in conditions:
+            for n in needs:
+                eval_need_condition(n, condition, log)
+
+    compiled: list[Condition] = [compile_condition(c) for c in conditions]
+
+    def compiled_once():
+        for condition in compiled:
+            for n in needs:
+                condition.evaluate(n, log)
+
+    return _best_of(repeats, parsed_per_need), _best_of(repeats, compiled_once)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--needs", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    parsed, compiled = run_benchmark(args.needs, args.repeats)
+
+    print(f"{args.needs} needs, best of {args.repeats} runs")
+    print("| Conditions       | Time [s] |")
+    print("|------------------|----------|")
+    print(f"| parsed per need  | {parsed:8.3f} |")
+    print(f"| compiled once    | {compiled:8.3f} |")
+    print(f"Speedup: {parsed / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
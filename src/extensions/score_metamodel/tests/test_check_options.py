@@ -11,63 +11,62 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
-from typing import TypedDict
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from attribute_plugin import add_test_properties
+from score_metamodel import (
+    ScoreNeedType,
+    collect_allowed_options,
+    compile_validation_table,
+    index_need_types,
+)
 from score_metamodel.checks.check_options import (
     check_extra_options,
     check_options,
 )
-from score_metamodel.tests import fake_check_logger, need
+from score_metamodel.tests import fake_check_logger, need, need_type
 from sphinx.application import Sphinx
 
 
-class NeedTypeDict(TypedDict, total=False):
-    directive: str
-    mandatory_options: dict[str, str | int] | None
-    opt_opt: dict[str, str] | None
-
-
 class TestCheckOptions:
-    NEED_TYPE_INFO: list[NeedTypeDict] = [
-        {
-            "directive": "tool_req",
-            "mandatory_options": {
+    NEED_TYPE_INFO: list[ScoreNeedType] = [
+        need_type(
+            directive="tool_req",
+            mandatory_options={
                 "id": "^tool_req__.*$",
                 "some_required_option": "^some_value__.*$",
             },
-        }
+        )
     ]
-    NEED_TYPE_INFO_WITH_OPT_OPT: list[NeedTypeDict] = [
-        {
-            "directive": "tool_req",
-            "mandatory_options": {
+    NEED_TYPE_INFO_WITH_OPT_OPT: list[ScoreNeedType] = [
+        need_type(
+            directive="tool_req",
+            mandatory_options={
                 "id": "^tool_req__.*$",
                 "some_required_option": "^some_value__.*$",
             },
-            "opt_opt": {
+            opt_opt={
                 "some_optional_option": "^some_value__.*$",
             },
-        }
+        )
     ]
 
-    NEED_TYPE_INFO_WITHOUT_MANDATORY_OPTIONS: list[NeedTypeDict] = [
-        {
-            "directive": "workflow",
-            "mandatory_options": None,
-        },
+    NEED_TYPE_INFO_WITHOUT_MANDATORY_OPTIONS: list[ScoreNeedType] = [
+        need_type(
+            directive="workflow",
+            mandatory_options=None,
+        ),
     ]
 
-    NEED_TYPE_INFO_WITH_INVALID_OPTION_TYPE: list[NeedTypeDict] = [
-        {
-            "directive": "workflow",
-            "mandatory_options": {
+    NEED_TYPE_INFO_WITH_INVALID_OPTION_TYPE: list[ScoreNeedType] = [
+        need_type(
+            directive="workflow",
+            mandatory_options={
                 "id": "^wf_req__.*$",
                 "some_invalid_option": 42,
             },
-        }
+        )
     ]
 
     @add_test_properties(
@@ -89,7 +88,10 @@ class TestCheckOptions:
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO
+        app.config.needs_types_by_directive = index_need_types(self.NEED_TYPE_INFO)
+        app.config.needs_types_validation = compile_validation_table(
+            self.NEED_TYPE_INFO
+        )
         # Expect that the checks pass
         check_options(app, need_1, logger)
         logger.assert_warning(
@@ -116,7 +118,9 @@ class TestCheckOptions:
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO
+        app.config.needs_types_allowed_options = collect_allowed_options(
+            self.NEED_TYPE_INFO
+        )
         # Expect that the checks pass
         check_extra_options(app, need_1, logger)
         logger.assert_warning(
@@ -146,7 +150,12 @@ class TestCheckOptions:
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO_WITHOUT_MANDATORY_OPTIONS
+        app.config.needs_types_by_directive = index_need_types(
+            self.NEED_TYPE_INFO_WITHOUT_MANDATORY_OPTIONS
+        )
+        app.config.needs_types_validation = compile_validation_table(
+            self.NEED_TYPE_INFO_WITHOUT_MANDATORY_OPTIONS
+        )
         app.config.allowed_external_prefixes = []
         # Expect that the checks pass
         check_options(app, need_1, logger)
@@ -162,8 +171,8 @@ class TestCheckOptions:
     )
     def test_invalid_option_type(self):
         """
-        Given any need of known type with missing mandatory options info
-        it should raise an error
+        Given a need type with an invalid pattern, it should be reported
+        once when the metamodel is loaded, and not for every need
         """
         need_1 = need(
             target_id="wf_req__001",
@@ -174,17 +183,45 @@ class TestCheckOptions:
             lineno=None,
         )
 
+        with patch("score_metamodel.logger") as metamodel_logger:
+            validation_table = compile_validation_table(
+                self.NEED_TYPE_INFO_WITH_INVALID_OPTION_TYPE + self.NEED_TYPE_INFO
+            )
+        metamodel_logger.warning.assert_called_once()
+        assert (
+            "workflow.some_invalid_option: pattern `42` is not a valid regex pattern."
+            in metamodel_logger.warning.call_args.args[0]
+        )
+
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO_WITH_INVALID_OPTION_TYPE
+        app.config.needs_types_validation = validation_table
         app.config.allowed_external_prefixes = []
-        # Expect that the checks pass
+        # Not reported again for the need
         check_options(app, need_1, logger)
-        logger.assert_warning(
-            "pattern `42` is not a valid regex pattern.",
-            expect_location=False,
+        logger.assert_no_warnings()
+
+    @add_test_properties(
+        partially_verifies=["tool_req__docs_metamodel"],
+        test_type="requirements-based",
+        derivation_technique="requirements-analysis",
+    )
+    def test_invalid_regex_pattern_reported_at_load(self):
+        """Given a pattern that does not compile, it should be reported at load"""
+        with patch("score_metamodel.logger") as metamodel_logger:
+            validation_table = compile_validation_table(
+                [
+                    need_type(
+                        directive="tool_req", mandatory_options={"id": "^(tool_req"}
+                    )
+                ]
+            )
+        assert (
+            "pattern `^(tool_req` is not a valid regex pattern."
+            in (metamodel_logger.warning.call_args.args[0])
         )
+        assert validation_table["tool_req"][0].pattern is None
 
     @add_test_properties(
         partially_verifies=["tool_req__docs_metamodel"],
@@ -210,7 +247,9 @@ class TestCheckOptions:
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO_WITH_OPT_OPT
+        app.config.needs_types_allowed_options = collect_allowed_options(
+            self.NEED_TYPE_INFO_WITH_OPT_OPT
+        )
         app.config.allowed_external_prefixes = []
         # Expect that the checks pass
         check_extra_options(app, need_1, logger)
@@ -239,8 +278,52 @@ class TestCheckOptions:
         logger = fake_check_logger()
         app = Mock(spec=Sphinx)
         app.config = Mock()
-        app.config.needs_types = self.NEED_TYPE_INFO
+        app.config.needs_types_by_directive = index_need_types(self.NEED_TYPE_INFO)
+        app.config.needs_types_validation = compile_validation_table(
+            self.NEED_TYPE_INFO
+        )
         app.config.allowed_external_prefixes = []
 
         with pytest.raises(ValueError, match="Only Strings are allowed"):
             check_options(app, need_1, logger)
+
+    @add_test_properties(
+        partially_verifies=["tool_req__docs_metamodel"],
+        test_type="requirements-based",
+        derivation_technique="requirements-analysis",
+    )
+    def test_links_and_back_links_are_no_extra_options(self):
+        """
+        Given a need with links, back links and several unknown options,
+        only the unknown options should be reported, in the order of the need
+        """
+        need_1 = need(
+            target_id="tool_req__001",
+            id="tool_req__001",
+            type="tool_req",
+            some_required_option="some_value__001",
+            zz_option="zz",
+            satisfies=["tool_req__002"],
+            satisfies_back=["tool_req__003"],
+            aa_option="aa",
+            docname=None,
+            lineno=None,
+        )
+
+        logger = fake_check_logger()
+        app = Mock(spec=Sphinx)
+        app.config = Mock()
+        app.config.needs_types_allowed_options = collect_allowed_options(
+            [
+                need_type(
+                    **self.NEED_TYPE_INFO[0],
+                    opt_link=[("satisfies", "^tool_req__.*$")],
+                )
+            ]
+        )
+        check_extra_options(app, need_1, logger)
+
+        logger.assert_warning(
+            "has these extra options: `zz_option`, `aa_option`.",
+            expect_location=False,
+        )
@@ -0,0 +1,108 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+from typing import Any
+
+from attribute_plugin import add_test_properties
+from score_metamodel.checks.graph_checks import (
+    filter_needs_by_criteria,
+    partition_needs_by_type,
+    warn_unknown_need_types,
+)
+from score_metamodel.graph_conditions import compile_graph_check
+
+from src.extensions.score_metamodel.tests import fake_check_logger, need
+
+NEEDS = [
+    need(id="feat_req__1", type="feat_req", safety="QM"),
+    need(id="comp_req__1", type="comp_req", safety="QM"),
+    need(id="tool_req__1", type="tool_req", safety="QM"),
+    need(id="feat_req__2", type="feat_req", safety="ASIL_B"),
+    need(id="comp_req__2", type="comp_req", safety="QM"),
+]
+
+
+def _graph_check(needs: dict[str, str]) -> Any:
+    return compile_graph_check(
+        "qm_check",
+        {
+            "needs": needs,
+            "check": {"satisfies": "safety == QM"},
+            "explanation": "QM requirements cannot satisfy ASIL requirements.",
+        },
+    )
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_partition_needs_by_type():
+    """Test that needs are grouped by type, in their original order"""
+    needs_by_type = partition_needs_by_type(NEEDS)
+    assert {t: [n["id"] for n in needs] for t, needs in needs_by_type.items()} == {
+        "feat_req": ["feat_req__1", "feat_req__2"],
+        "comp_req": ["comp_req__1", "comp_req__2"],
+        "tool_req": ["tool_req__1"],
+    }
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_filter_needs_by_included_and_excluded_types():
+    """Test that only the buckets of the selected types are checked"""
+    logger = fake_check_logger()
+    needs_by_type = partition_needs_by_type(NEEDS)
+
+    included = _graph_check(
+        {"include": "comp_req, feat_req", "condition": "safety == QM"}
+    )
+    assert [
+        n["id"] for n in filter_needs_by_criteria(needs_by_type, included, logger)
+    ] == [
+        "comp_req__1",
+        "comp_req__2",
+        "feat_req__1",
+    ]
+
+    excluded = _graph_check({"exclude": "comp_req", "condition": "safety == QM"})
+    assert [
+        n["id"] for n in filter_needs_by_criteria(needs_by_type, excluded, logger)
+    ] == [
+        "feat_req__1",
+        "tool_req__1",
+    ]
+    logger.assert_no_warnings()
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_unknown_need_type_reported_once():
+    """Test that an unknown type used by several graph checks is reported once"""
+    logger = fake_check_logger()
+    checks = [
+        _graph_check({"include": "feat_req, unknown_req", "condition": "safety == QM"}),
+        _graph_check({"exclude": "unknown_req", "condition": "safety == QM"}),
+    ]
+    needs_types_by_directive: Any = {"feat_req": {"directive": "feat_req"}}
+
+    warn_unknown_need_types(needs_types_by_directive, checks, logger)
+    logger.assert_warning(
+        "Unknown need type `unknown_req` in graph check.", expect_location=False
+    )
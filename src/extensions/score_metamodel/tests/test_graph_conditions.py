@@ -0,0 +1,152 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import pickle
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from attribute_plugin import add_test_properties
+
+from src.extensions.score_metamodel import compile_graph_checks
+from src.extensions.score_metamodel.graph_conditions import (
+    compile_condition,
+    compile_graph_check,
+)
+from src.extensions.score_metamodel.tests import fake_check_logger, need
+
+GRAPH_CHECK: dict[str, Any] = {
+    "needs": {
+        "include": "feat_req, comp_req",
+        "condition": {"and": ["safety != QM", "status == valid"]},
+    },
+    "check": {"satisfies": "safety != QM"},
+    "explanation": "Safety requirements can only satisfy safety requirements.",
+}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        ("safety == QM", False),
+        ("safety != QM", True),
+        ({"and": ["safety == ASIL_B", "status == valid"]}, True),
+        ({"and": ["safety == ASIL_B", "status == draft"]}, False),
+        ({"or": ["safety == QM", "status == valid"]}, True),
+        ({"xor": ["safety == ASIL_B", "status == valid"]}, False),
+        ({"not": ["safety == QM"]}, True),
+        ({"not": [{"or": ["safety == QM", "status == draft"]}]}, True),
+    ],
+)
+def test_compiled_condition(condition: str | dict[str, Any], expected: bool):
+    """Test that compiled conditions evaluate like the yaml describes"""
+    logger = fake_check_logger()
+    need_1 = need(id="feat_req__1", safety="ASIL_B", status="valid")
+    assert compile_condition(condition).evaluate(need_1, logger) == expected
+    logger.assert_no_warnings()
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_compiled_condition_reports_missing_attribute():
+    """Test that an attribute missing in the need is reported for the need"""
+    logger = fake_check_logger()
+    condition = compile_condition({"or": ["security == YES", "status == valid"]})
+    assert condition.evaluate(need(id="feat_req__1", status="valid"), logger)
+    logger.assert_warning("Attribute not defined: security", expect_location=False)
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+@pytest.mark.parametrize(
+    "condition, exception, error",
+    [
+        ("safety==QM", ValueError, "Invalid check defined: safety==QM"),
+        ("safety ~ QM", ValueError, "Binary Operator not defined: ~"),
+        ({"not": ["safety == QM", "status == valid"]}, ValueError, "exactly one"),
+        ({"and": []}, ValueError, "Operator 'and' requires at least one operand."),
+        ({"nand": ["safety == QM"]}, ValueError, "Unsupported condition operator"),
+        (["safety == QM"], TypeError, "Invalid condition type"),
+    ],
+)
+def test_invalid_condition_raises(
+    condition: Any, exception: type[Exception], error: str
+):
+    """Test that syntax errors in conditions are found when compiling"""
+    with pytest.raises(exception, match=error):
+        compile_condition(condition)
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_compile_graph_check():
+    """Test that the need selection and link checks of a graph check are compiled"""
+    check = compile_graph_check("safety_link", GRAPH_CHECK)
+
+    assert check.types == ("feat_req", "comp_req")
+    assert check.selects_type("comp_req")
+    assert not check.selects_type("tool_req")
+    assert [lc.relation for lc in check.link_checks] == ["satisfies"]
+    assert check.link_checks[0].source == "safety != QM"
+    # Stored in the Sphinx environment together with the config
+    assert pickle.loads(pickle.dumps(check)) == check
+
+    excluding = compile_graph_check(
+        "safety_link",
+        {**GRAPH_CHECK, "needs": {"exclude": "tool_req", "condition": "safety == QM"}},
+    )
+    assert excluding.selects_type("comp_req")
+    assert not excluding.selects_type("tool_req")
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_invalid_graph_check_reported_at_load():
+    """Test that invalid graph checks are reported once, and not run"""
+    graph_checks = {
+        "valid": GRAPH_CHECK,
+        "invalid_condition": {**GRAPH_CHECK, "check": {"satisfies": "safety = QM"}},
+        "no_explanation": {**GRAPH_CHECK, "explanation": ""},
+        "invalid_type": {**GRAPH_CHECK, "check": {"satisfies": ["safety == QM"]}},
+    }
+    with patch("src.extensions.score_metamodel.logger") as metamodel_logger:
+        compiled = compile_graph_checks(graph_checks)
+
+    assert list(compiled) == ["valid"]
+    messages = [call.args[0] for call in metamodel_logger.warning.call_args_list]
+    missing_explanation = (
+        "Explanation for graph check no_explanation is missing. "
+        "Explanations are mandatory for graph checks."
+    )
+    invalid_type = "Invalid condition type: condition (<class 'list'>), expected"
+    assert messages == [
+        "metamodel.yaml: graph check invalid_condition: Binary Operator not defined: =",
+        f"metamodel.yaml: graph check no_explanation: {missing_explanation}",
+        f"metamodel.yaml: graph check invalid_type: {invalid_type} str or dict.",
+    ]
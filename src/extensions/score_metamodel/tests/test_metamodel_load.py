@@ -71,6 +71,21 @@ def test_load_metamodel_data():
         types=["req_type"],
     )
 
+    assert result["needs_types_by_directive"] == {"type1": result["needs_types"][0]}
+
+    assert {"opt1", "global_opt", "link1", "link2", "id"} <= (
+        result["needs_types_allowed_options"]["type1"]
+    )
+
+    validation = result["needs_types_validation"]["type1"]
+    assert [(f.field, f.pattern.pattern, f.required) for f in validation] == [
+        ("opt1", "value1", True),
+        ("opt2", "value2", False),
+        ("opt3", "value3", False),
+        ("global_opt", "global_value", False),
+        ("link1", "value1", True),
+    ]
+
     assert "needs_graph_check" in result
     assert result["needs_graph_check"]["needs_graph_check"]["needs"] == {
         "include": "type1",
@@ -0,0 +1,126 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+from unittest.mock import Mock
+
+from attribute_plugin import add_test_properties
+from score_metamodel import (
+    collect_allowed_options,
+    compile_validation_table,
+    index_need_types,
+)
+from score_metamodel.checks.check_options import check_extra_options, check_options
+from score_metamodel.log import CheckRecorder
+from score_metamodel.parallel_checks import minimal_need, run_local_checks_in_workers
+from sphinx.application import Sphinx
+
+from src.extensions.score_metamodel.tests import fake_check_logger, need, need_type
+
+NEED_TYPES = [
+    need_type(
+        directive="tool_req",
+        mandatory_options={"id": "^tool_req__.*$", "status": "^(valid|draft)$"},
+    )
+]
+
+
+def _app() -> Mock:
+    app = Mock(spec=Sphinx)
+    app.config = Mock()
+    app.config.needs_types_by_directive = index_need_types(NEED_TYPES)
+    app.config.needs_types_validation = compile_validation_table(NEED_TYPES)
+    app.config.needs_types_allowed_options = collect_allowed_options(NEED_TYPES)
+    app.config.allowed_external_prefixes = []
+    app.config.prohibited_words_checks = []
+    return app
+
+
+def _needs():
+    return [
+        need(
+            id=f"tool_req__{i}" if i % 3 else f"wrong_id__{i}",
+            type="tool_req" if i % 7 else "unknown_req",
+            status=["valid", "draft", "invalid"][i % 3],
+            extra_option="" if i % 2 else f"extra {i}",
+        )
+        for i in range(40)
+    ]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_recorded_messages_are_replayed_in_order():
+    """Test that messages recorded in a worker are logged like direct ones"""
+    direct = fake_check_logger()
+    recorder = CheckRecorder(direct.prefix)
+    for log in [direct, recorder]:
+        log.warning_for_need(need(id="tool_req__1"), "first")
+        log.warning_for_option(need(id="tool_req__2"), "status", "second", True)
+        log.warning("third", None)
+
+    replayed = fake_check_logger()
+    replayed.replay(recorder.records)
+
+    assert (
+        replayed._mock_logger.warning.call_args_list
+        == direct._mock_logger.warning.call_args_list
+    )
+    assert replayed.has_warnings and replayed.has_infos
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_checks_in_workers_log_like_sequential_checks():
+    """Test that running local checks in workers gives the same log, in order"""
+    checks = [check_options, check_extra_options]
+    app = _app()
+
+    # The prefix is sent to the workers, so it can not be a mock
+    sequential = fake_check_logger(prefix="docs")
+    for n in _needs():
+        for check in checks:
+            check(app, n, sequential)
+
+    parallel = fake_check_logger(prefix="docs")
+    run_local_checks_in_workers(app, _needs(), checks, parallel, workers=3)
+
+    assert sequential._mock_logger.warning.call_count > 10
+    assert (
+        parallel._mock_logger.warning.call_args_list
+        == sequential._mock_logger.warning.call_args_list
+    )
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_metamodel"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_minimal_need_drops_empty_options():
+    """Test that empty options are not sent to the workers, unless kept"""
+    shipped = minimal_need(
+        need(id="tool_req__1", status="", tags=[], extra_option=None, content=""),
+        keep=frozenset({"content"}),
+    )
+    assert shipped == {
+        "id": "tool_req__1",
+        "content": "",
+        "docname": "docname",
+        "doctype": "rst",
+        "lineno": "42",
+    }
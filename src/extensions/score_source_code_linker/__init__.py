@@ -20,17 +20,30 @@ source code links from a JSON file and add them to the needs.
 # req-Id: tool_req__docs_dd_link_source_code_link
 # This whole directory implements the above mentioned tool requirements
 
-from collections import defaultdict
-from copy import deepcopy
+import heapq
+import os
+from collections.abc import Iterator, Sequence
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import cast
 
 from sphinx.application import Sphinx
+from sphinx.config import ENUM
 from sphinx.environment import BuildEnvironment
 from sphinx_needs.data import NeedsInfoType, NeedsMutable, SphinxNeedsData
 from sphinx_needs.logging import get_logger
 
+from src.extensions.score_source_code_linker.cache_format import (
+    CACHE_FORMATS,
+    DEFAULT_CACHE_FORMAT,
+    InvalidCacheError,
+    validate_cache,
+)
 from src.extensions.score_source_code_linker.generate_source_code_links_json import (
+    DEFAULT_COMMENT_PREFIXES,
+    DEFAULT_TAG_KEYWORDS,
+    TagMatcher,
     generate_source_code_links_json,
 )
 from src.extensions.score_source_code_linker.need_source_links import (
@@ -41,20 +54,26 @@ from src.extensions.score_source_code_linker.need_source_links import (
 )
 from src.extensions.score_source_code_linker.needlinks import (
     NeedLink,
+    NeedLinkColumns,
     load_source_code_links_json,
 )
 from src.extensions.score_source_code_linker.testlink import (
     DataForTestLink,
-    load_data_of_test_case_json,
-    load_test_xml_parsed_json,
+    derive_test_links,
+)
+from src.extensions.score_source_code_linker.xml_manifest import (
+    load_xml_manifest,
+    manifest_test_cases,
 )
 from src.extensions.score_source_code_linker.xml_parser import (
     construct_and_add_need,
     run_xml_parser,
 )
 from src.helper_lib import (
+    RepoContext,
     find_git_root,
     find_ws_root,
+    resolve_repo_context,
 )
 from src.helper_lib.additional_functions import get_github_link
 
@@ -69,13 +88,69 @@ LOGGER = get_logger(__name__)
 #          ╰──────────────────────────────────────╯
 
 
+_NeedGroups = Iterator[tuple[str, list[NeedLink], list[DataForTestLink]]]
+
+
+def _need_ids(links: Sequence[NeedLink | DataForTestLink]) -> list[str]:
+    if isinstance(links, NeedLinkColumns):
+        return links.needs
+    return [link.need for link in links]
+
+
+def _sorted_by_need[T: (NeedLink, DataForTestLink)](
+    links: Sequence[T],
+) -> Iterator[T]:
+    """
+    Yields the links ordered by need ID. Only the order is computed up front, the
+    links of a NeedLinkColumns are built one at a time.
+    The sort is stable, links of the same need keep the order they were found in.
+    """
+    needs = _need_ids(links)
+    order = sorted(range(len(needs)), key=needs.__getitem__)
+    return (links[i] for i in order)
+
+
+def iter_grouped_by_need(
+    source_code_links: Sequence[NeedLink],
+    test_case_links: Sequence[DataForTestLink] | None = None,
+) -> Iterator[SourceCodeLinks]:
+    """
+    Groups the given need links and test case links by their need ID.
+    Both inputs are sorted by need ID and merged, the groups are yielded one
+    need at a time in order of their need ID. This keeps the grouped cache
+    stable between builds and lets it be written without building all groups
+    first.
+    """
+    # One (need, CodeLinks, TestLinks) per need and input, merged below
+    code_groups: _NeedGroups = (
+        (need, list(links), [])
+        for need, links in groupby(
+            _sorted_by_need(source_code_links), key=attrgetter("need")
+        )
+    )
+    test_groups: _NeedGroups = (
+        (need, [], list(links))
+        for need, links in groupby(
+            _sorted_by_need(test_case_links or []), key=attrgetter("need")
+        )
+    )
+    for need, groups in groupby(
+        heapq.merge(code_groups, test_groups, key=itemgetter(0)), key=itemgetter(0)
+    ):
+        links = NeedSourceLinks()
+        for _, code_links, test_links in groups:
+            links.CodeLinks += code_links
+            links.TestLinks += test_links
+        yield SourceCodeLinks(need=need, links=links)
+
+
 def group_by_need(
-    source_code_links: list[NeedLink],
-    test_case_links: list[DataForTestLink] | None = None,
+    source_code_links: Sequence[NeedLink],
+    test_case_links: Sequence[DataForTestLink] | None = None,
 ) -> list[SourceCodeLinks]:
     """
-    Groups the given need links and test case links by their need ID.
-    Returns a nested dictionary structure with 'CodeLink' and 'TestLink' categories.
+    Groups the given need links and test case links by their need ID,
+    ordered by need ID. See 'iter_grouped_by_need'.
     Example output:
 
 
@@ -87,33 +162,29 @@ def group_by_need(
         }
       }
     """
-    # TODO: I wonder if there is a more efficent way to do this
-    grouped_by_need: dict[str, NeedSourceLinks] = defaultdict(
-        lambda: NeedSourceLinks(TestLinks=[], CodeLinks=[])
-    )
+    return list(iter_grouped_by_need(source_code_links, test_case_links))
+
+
+# The RepoContext of the current build, by workspace root. See 'get_repo_context'.
+_repo_contexts: dict[Path | None, RepoContext] = {}
+
+
+def get_repo_context() -> RepoContext:
+    """
+    The repository all links of this build point to.
+    git is only queried by the first caller, the test code linker and the
+    link injection then share the same RepoContext.
+    """
+    ws_root = find_ws_root()
+    repo = _repo_contexts.get(ws_root)
+    if repo is None:
+        repo = _repo_contexts[ws_root] = resolve_repo_context()
+    return repo
 
-    # Group source code links
-    for needlink in source_code_links:
-        grouped_by_need[needlink.need].CodeLinks.append(needlink)
-
-    # Group test case links
-    if test_case_links is not None:
-        for testlink in test_case_links:
-            grouped_by_need[testlink.need].TestLinks.append(testlink)
-
-    # Build final list of SourceCodeLinks
-    result: list[SourceCodeLinks] = [
-        SourceCodeLinks(
-            need=need,
-            links=NeedSourceLinks(
-                CodeLinks=need_links.CodeLinks,
-                TestLinks=need_links.TestLinks,
-            ),
-        )
-        for need, need_links in grouped_by_need.items()
-    ]
 
-    return result
+def forget_repo_context(app: Sphinx, env: BuildEnvironment, docnames: list[str]):
+    # HEAD may have moved since the previous build in this process (e.g. Esbonio)
+    _repo_contexts.clear()
 
 
 def get_cache_filename(build_dir: Path, filename: str) -> Path:
@@ -124,7 +195,24 @@ def get_cache_filename(build_dir: Path, filename: str) -> Path:
     return build_dir / filename
 
 
-def build_and_save_combined_file(outdir: Path):
+def is_cache_usable(file: Path) -> bool:
+    """
+    Checks that a cache in _build exists, is complete and has the current schema.
+    Corrupt or outdated caches are reported, the caller rebuilds them.
+    """
+    if not file.exists():
+        return False
+    try:
+        validate_cache(file)
+    except InvalidCacheError as e:
+        LOGGER.info(f"{e} Rebuilding it.", type="score_source_code_linker")
+        return False
+    return True
+
+
+def build_and_save_combined_file(
+    outdir: Path, cache_format: str = DEFAULT_CACHE_FORMAT
+):
     """
     Reads the saved partial caches of codelink & testlink
     Builds the combined JSON cache & saves it
@@ -132,13 +220,17 @@ def build_and_save_combined_file(outdir: Path):
     source_code_links = load_source_code_links_json(
         get_cache_filename(outdir, "score_source_code_linker_cache.json")
     )
-    test_code_links = load_test_xml_parsed_json(
-        get_cache_filename(outdir, "score_xml_parser_cache.json")
+    # Missing if 'bazel-testlogs' does not exist, then there are no test links
+    test_code_links = derive_test_links(
+        manifest_test_cases(
+            load_xml_manifest(get_cache_filename(outdir, "score_test_cases_cache.json"))
+        )
     )
 
     store_source_code_links_combined_json(
         outdir / "score_scl_grouped_cache.json",
-        group_by_need(source_code_links, test_code_links),
+        iter_grouped_by_need(source_code_links, test_code_links),
+        cache_format,
     )
 
 
@@ -159,6 +251,54 @@ def setup_source_code_linker(app: Sphinx, ws_root: Path):
         types=bool,
         description="Skip rescanning source code files via the source code linker.",
     )
+    app.add_config_value(
+        "source_code_linker_scan_workers",
+        os.cpu_count() or 1,
+        rebuild="",
+        types=int,
+        description="Number of processes used to scan source files for need "
+        "references. 1 disables parallel scanning.",
+    )
+    app.add_config_value(
+        "source_code_linker_xml_workers",
+        os.cpu_count() or 1,
+        rebuild="",
+        types=int,
+        description="Number of processes used to parse the test.xml files in "
+        "'bazel-testlogs'. 1 disables parallel parsing.",
+    )
+    app.add_config_value(
+        "source_code_linker_hash_files",
+        False,
+        rebuild="",
+        types=bool,
+        description="Store a content digest per scanned file, so files that were "
+        "touched but not modified are not rescanned.",
+    )
+    app.add_config_value(
+        "source_code_linker_cache_format",
+        DEFAULT_CACHE_FORMAT,
+        rebuild="",
+        types=ENUM(*CACHE_FORMATS),
+        description="Format of the caches in _build. 'json' is indented and easy to "
+        "read, 'compact' is smaller and faster to load.",
+    )
+    app.add_config_value(
+        "source_code_linker_tags",
+        DEFAULT_TAG_KEYWORDS,
+        rebuild="env",
+        types=list,
+        description="Keywords that mark a need reference in source code, "
+        "e.g. 'req-Id:'.",
+    )
+    app.add_config_value(
+        "source_code_linker_comment_prefixes",
+        DEFAULT_COMMENT_PREFIXES,
+        rebuild="env",
+        types=list,
+        description="Comment prefixes that may precede a keyword, "
+        "e.g. '#', '//', '--' or ';'.",
+    )
 
     # Define need_string_links here to not have it in conf.py
     # source_code_link and testlinks have the same schema
@@ -175,16 +315,26 @@ def setup_source_code_linker(app: Sphinx, ws_root: Path):
         app.outdir, "score_source_code_linker_cache.json"
     )
 
-    if (
-        not scl_cache_json.exists()
-        or not app.config.skip_rescanning_via_source_code_linker
+    if not app.config.skip_rescanning_via_source_code_linker or not is_cache_usable(
+        scl_cache_json
     ):
         LOGGER.debug(
             "INFO: Generating source code links JSON file.",
             type="score_source_code_linker",
         )
 
-        generate_source_code_links_json(ws_root, scl_cache_json)
+        generate_source_code_links_json(
+            ws_root,
+            scl_cache_json,
+            app.config.source_code_linker_scan_workers,
+            get_cache_filename(app.outdir, "score_source_code_linker_file_index.json"),
+            app.config.source_code_linker_hash_files,
+            TagMatcher(
+                app.config.source_code_linker_tags,
+                app.config.source_code_linker_comment_prefixes,
+            ),
+            app.config.source_code_linker_cache_format,
+        )
 
 
 def register_test_code_linker(app: Sphinx):
@@ -195,16 +345,15 @@ def register_test_code_linker(app: Sphinx):
 
 
 def setup_test_code_linker(app: Sphinx, env: BuildEnvironment):
-    tl_cache_json = get_cache_filename(app.outdir, "score_xml_parser_cache.json")
-    if (
-        not tl_cache_json.exists()
-        or not app.config.skip_rescanning_via_source_code_linker
+    tl_cache_json = get_cache_filename(app.outdir, "score_test_cases_cache.json")
+    if not app.config.skip_rescanning_via_source_code_linker or not is_cache_usable(
+        tl_cache_json
     ):
         ws_root = find_ws_root()
         if not ws_root:
             return
         LOGGER.debug(
-            "INFO: Generating score_xml_parser JSON file.",
+            "INFO: Generating score_test_cases JSON file.",
             type="score_source_code_linker",
         )
         # sanity check if extension is enabled
@@ -222,16 +371,13 @@ def setup_test_code_linker(app: Sphinx, env: BuildEnvironment):
             LOGGER.info(f"{'=' * 80}", type="score_source_code_linker")
             return
 
-        run_xml_parser(app, env)
+        run_xml_parser(app, env, get_repo_context())
         return
-    tcn_cache = get_cache_filename(app.outdir, "score_testcaseneeds_cache.json")
-    assert tcn_cache.exists(), (
-        f"TestCaseNeed Cache file does not exist.Checked Path: {tcn_cache}"
-    )
     # TODO: Make this more efficent, idk how though.
-    test_case_needs = load_data_of_test_case_json(tcn_cache)
+    test_case_needs = manifest_test_cases(load_xml_manifest(tl_cache_json))
+    repo = get_repo_context() if test_case_needs else None
     for tcn in test_case_needs:
-        construct_and_add_need(app, tcn)
+        construct_and_add_need(app, tcn, repo)
 
 
 def register_combined_linker(app: Sphinx):
@@ -243,13 +389,16 @@ def register_combined_linker(app: Sphinx):
 
 def setup_combined_linker(app: Sphinx, _: BuildEnvironment):
     grouped_cache = get_cache_filename(app.outdir, "score_scl_grouped_cache.json")
-    gruped_cache_exists = grouped_cache.exists()
-    if not gruped_cache_exists or not app.config.skip_rescanning_via_source_code_linker:
+    if not app.config.skip_rescanning_via_source_code_linker or not is_cache_usable(
+        grouped_cache
+    ):
         LOGGER.debug(
             "Did not find combined json 'score_scl_grouped_cache.json' in _build."
             "Generating new one"
         )
-        build_and_save_combined_file(app.outdir)
+        build_and_save_combined_file(
+            app.outdir, app.config.source_code_linker_cache_format
+        )
 
 
 def setup_once(app: Sphinx):
@@ -271,6 +420,8 @@ def setup_once(app: Sphinx):
     # When BUILD_WORKSPACE_DIRECTORY is set, we are inside a git repository.
     assert find_git_root()
 
+    app.connect("env-before-read-docs", forget_repo_context)
+
     # Register & Run (if needed) parsing & saving of JSON caches
     setup_source_code_linker(app, ws_root)
     register_test_code_linker(app)
@@ -292,33 +443,91 @@ def setup(app: Sphinx) -> dict[str, str | bool]:
     }
 
 
+def build_prefixed_id_lookup(
+    all_needs: NeedsMutable, prefixes: list[str]
+) -> dict[str, str]:
+    """
+    Maps IDs without external 'prefixes' to the prefixed ID of an existing need.
+    Built once per build, so resolving a link is a single dict lookup no matter
+    how many external needs sources are configured.
+    If an ID exists with several prefixes, the first prefix in 'prefixes' wins.
+    """
+    lookup: dict[str, str] = {}
+    # Reversed, so that earlier prefixes overwrite later ones
+    for prefix in reversed(prefixes):
+        if not prefix:
+            continue
+        for need_id in all_needs:
+            if need_id.startswith(prefix):
+                lookup[need_id[len(prefix) :]] = need_id
+    return lookup
+
+
 def find_need(
-    all_needs: NeedsMutable, id: str, prefixes: list[str]
+    all_needs: NeedsMutable,
+    id: str,
+    prefixes: list[str],
+    prefixed_ids: dict[str, str] | None = None,
 ) -> NeedsInfoType | None:
     """
     Checks all possible external 'prefixes' for an ID
     So that the linker can add the link to the correct NeedsInfoType object.
+    Pass 'prefixed_ids' (see build_prefixed_id_lookup) when resolving many IDs.
     """
     if id in all_needs:
         return all_needs[id]
 
-    # Try all possible prefixes
-    for prefix in prefixes:
-        prefixed_id = f"{prefix}{id}"
-        if prefixed_id in all_needs:
-            LOGGER.warning("linking to external needs is not supported!")
-            return all_needs[prefixed_id]
+    if prefixed_ids is not None:
+        prefixed_id = prefixed_ids.get(id)
+    else:
+        # Try all possible prefixes
+        prefixed_id = next(
+            (f"{p}{id}" for p in prefixes if f"{p}{id}" in all_needs), None
+        )
+    if prefixed_id is None:
+        return None
+
+    LOGGER.warning("linking to external needs is not supported!")
+    return all_needs[prefixed_id]
+
+
+def apply_need_updates(
+    needs_data: SphinxNeedsData, updates: dict[str, dict[str, str]]
+) -> set[str]:
+    """
+    Write the collected 'source_code_link'/'testlink' options of all needs in a
+    single pass.
+
+    The needs are updated in place, so there is no need to remove and re-add
+    each of them. Only their cached need nodes are dropped, which is what
+    'remove_need' did on top. Everything else is picked up once by the
+    post-processing of sphinx-needs.
 
-    return None
+    Returns the documents of all needs whose links changed.
+    """
+    needs = needs_data.get_needs_mutable()
+    changed_docs: set[str] = set()
+    for need_id, options in updates.items():
+        need = cast(dict[str, object], needs[need_id])
+        docname = need.get("docname")
+        if isinstance(docname, str) and any(
+            need.get(option) != value for option, value in options.items()
+        ):
+            changed_docs.add(docname)
+        need.update(options)
+        needs_data.remove_need_node(need_id)
+    return changed_docs
 
 
 # re-qid: gd_req__req__attr_impl
-def inject_links_into_needs(app: Sphinx, env: BuildEnvironment) -> None:
+def inject_links_into_needs(app: Sphinx, env: BuildEnvironment) -> list[str]:
     """
     'Main' function that facilitates the running of all other functions
     in correct order.
     This function is also 'connected' to the message Sphinx emits,
     therefore the one that's called directly.
+    Returns the documents whose needs got other links, Sphinx writes them again
+    even if they did not change themselves (e.g. during 'live_preview').
     Args:
         env: Buildenvironment, this is filled automatically
         app: Sphinx app application, this is filled automatically
@@ -327,10 +536,9 @@ def inject_links_into_needs(app: Sphinx, env: BuildEnvironment) -> None:
     assert ws_root
 
     Needs_Data = SphinxNeedsData(env)
+    # Only needs that get links are touched (in place), all others are left
+    # alone. Copying the whole needs graph is not necessary for that.
     needs = Needs_Data.get_needs_mutable()
-    needs_copy = deepcopy(
-        needs
-    )  # TODO: why do we create a copy? Can we also needs_copy = needs[:]? copy(needs)?
 
     # Enabled automatically for DEBUGGING
     if LOGGER.getEffectiveLevel() >= 10:
@@ -351,8 +559,13 @@ def inject_links_into_needs(app: Sphinx, env: BuildEnvironment) -> None:
     # For some reason the prefix 'sphinx_needs internally' is CAPSLOCKED.
     # So we have to make sure we uppercase the prefixes
     prefixes = [x["id_prefix"].upper() for x in app.config.needs_external_needs]
+    # Query git only once, not for every single link
+    repo = get_repo_context() if source_code_links_by_need else None
+    prefixed_ids = build_prefixed_id_lookup(needs, prefixes)
+    # Collected first and applied in one go, see 'apply_need_updates'
+    updates: dict[str, dict[str, str]] = {}
     for source_code_links in source_code_links_by_need:
-        need = find_need(needs_copy, source_code_links.need, prefixes)
+        need = find_need(needs, source_code_links.need, prefixes, prefixed_ids)
         if need is None:
             # TODO: print github annotations as in https://github.com/eclipse-score/bazel_registry/blob/7423b9996a45dd0a9ec868e06a970330ee71cf4f/tools/verify_semver_compatibility_level.py#L126-L129
             for n in source_code_links.links.CodeLinks:
@@ -369,20 +582,18 @@ def inject_links_into_needs(app: Sphinx, env: BuildEnvironment) -> None:
                 )
             continue
 
-        need_as_dict = cast(dict[str, object], need)
-
-        need_as_dict["source_code_link"] = ", ".join(
-            f"{get_github_link(n)}<>{n.file}:{n.line}"
-            for n in source_code_links.links.CodeLinks
-        )
-        need_as_dict["testlink"] = ", ".join(
-            f"{get_github_link(n)}<>{n.name}" for n in source_code_links.links.TestLinks
-        )
+        updates[need["id"]] = {
+            "source_code_link": ", ".join(
+                f"{get_github_link(n, repo)}<>{n.file}:{n.line}"
+                for n in source_code_links.links.CodeLinks
+            ),
+            "testlink": ", ".join(
+                f"{get_github_link(n, repo)}<>{n.name}"
+                for n in source_code_links.links.TestLinks
+            ),
+        }
 
-        # NOTE: Removing & adding the need is important to make sure
-        # the needs gets 're-evaluated'.
-        Needs_Data.remove_need(need["id"])
-        Needs_Data.add_need(need)
+    return sorted(apply_need_updates(Needs_Data, updates))
 
 
 #          ╭──────────────────────────────────────╮
@@ -0,0 +1,254 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+This file defines the formats the source code linker caches can be written in.
+
+'json'    => Indented JSON with one object per link. Easy to read while debugging.
+'compact' => JSON without whitespace. Lists of links are stored as rows of values
+             next to a single list of column names. Loading them does not need an
+             'object_hook' call per link, the objects are built in one go.
+
+Loaders detect the format from the content, so switching the config value does
+not invalidate existing caches.
+
+Every cache is plain JSON. The schema version, the size and a checksum of the
+cache are stored next to it, in a '.meta' file. Caches are written to a temporary
+file that is renamed over the old one, so an interrupted build never leaves a
+truncated cache behind. Caches that are corrupt anyway, or were written with
+another schema, are rejected with an 'InvalidCacheError' and rebuilt.
+"""
+
+# req-Id: tool_req__docs_dd_link_source_code_link
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO
+
+CACHE_FORMATS = ("json", "compact")
+DEFAULT_CACHE_FORMAT = "json"
+
+# Bump this whenever the layout of any cache written via 'dump_cache' changes.
+# Caches with a different schema are discarded and rebuilt.
+CACHE_SCHEMA_VERSION = 1
+
+
+class InvalidCacheError(Exception):
+    """Raised for caches that are missing, corrupt or written with another schema."""
+
+
+def compact_payload(columns: Any, rows: list[Any]) -> dict[str, Any]:
+    return {"format": "compact", "columns": columns, "rows": rows}
+
+
+def is_compact_payload(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("format") == "compact"
+
+
+def compact_rows(data: dict[str, Any], columns: Any) -> list[Any]:
+    """Rows of a compact payload, after checking they have the expected layout."""
+    assert data["columns"] == columns, (
+        f"Cache was written with columns {data['columns']}, expected {columns}."
+    )
+    return data["rows"]
+
+
+def _checksum(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _json_encoder(
+    encoder: type[json.JSONEncoder] | None, cache_format: str
+) -> json.JSONEncoder:
+    assert cache_format in CACHE_FORMATS, (
+        f"Unknown cache format '{cache_format}', expected one of {CACHE_FORMATS}."
+    )
+    cls = encoder or json.JSONEncoder
+    if cache_format == "compact":
+        return cls(separators=(",", ":"), ensure_ascii=False)
+    return cls(indent=2, ensure_ascii=False)
+
+
+def metadata_file(file: Path) -> Path:
+    """The file next to a cache, holding its schema version, size and checksum."""
+    return file.with_name(f"{file.name}.meta")
+
+
+class CacheWriter:
+    """Writes the payload of a cache and keeps track of its size and checksum."""
+
+    def __init__(self, f: BinaryIO, cache_format: str):
+        self._f = f
+        self._cache_format = cache_format
+        self._hash = hashlib.blake2b(digest_size=16)
+        self.size = 0
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        self._hash.update(data)
+        self.size += len(data)
+        self._f.write(data)
+
+    def metadata(self) -> bytes:
+        metadata = {
+            "schema": CACHE_SCHEMA_VERSION,
+            "size": self.size,
+            "checksum": self._hash.hexdigest(),
+            "format": self._cache_format,
+        }
+        return json.dumps(metadata, separators=(",", ":")).encode()
+
+
+def _temporary_file(file: Path) -> tuple[int, str]:
+    # The temporary file has to be on the same filesystem for an atomic rename
+    return tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix=".tmp")
+
+
+@contextmanager
+def write_cache(file: Path, cache_format: str) -> Iterator[CacheWriter]:
+    """
+    Write a cache and its metadata to temporary files next to 'file', and rename
+    them once both are complete. If writing fails, 'file' is left untouched.
+    """
+    # After `rm -rf _build` or on clean builds the directory does not exist,
+    # so we need to create it
+    file.parent.mkdir(parents=True, exist_ok=True)
+    metadata = metadata_file(file)
+    tmp_files: list[str] = []
+    try:
+        fd, tmp = _temporary_file(file)
+        tmp_files.append(tmp)
+        with os.fdopen(fd, "wb") as f:
+            writer = CacheWriter(f, cache_format)
+            yield writer
+            f.flush()
+            os.fsync(f.fileno())
+        fd, tmp_metadata = _temporary_file(metadata)
+        tmp_files.append(tmp_metadata)
+        with os.fdopen(fd, "wb") as f:
+            f.write(writer.metadata())
+            f.flush()
+            os.fsync(f.fileno())
+        # A cache renamed without its metadata does not match the old metadata,
+        # so it is rebuilt like any other corrupt cache
+        os.replace(tmp, file)
+        os.replace(tmp_metadata, metadata)
+    except BaseException:
+        for tmp_file in tmp_files:
+            Path(tmp_file).unlink(missing_ok=True)
+        raise
+
+
+def dump_cache(
+    file: Path,
+    data: Any,
+    encoder: type[json.JSONEncoder] | None = None,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+):
+    text = _json_encoder(encoder, cache_format).encode(data)
+    with write_cache(file, cache_format) as cache:
+        cache.write(text)
+
+
+def dump_cache_items(
+    file: Path,
+    items: Iterable[Any],
+    encoder: type[json.JSONEncoder] | None = None,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+    columns: Any = None,
+):
+    """
+    Same as dump_cache for a list of items, but the items are encoded and written
+    one at a time. Neither the whole list nor its JSON have to be in memory.
+    In the 'compact' format the items are the rows of a compact payload, with
+    'columns' as their layout.
+    """
+    json_encoder = _json_encoder(encoder, cache_format)
+    with write_cache(file, cache_format) as cache:
+        if cache_format == "compact":
+            layout = json.dumps(columns, separators=(",", ":"))
+            cache.write(f'{{"format":"compact","columns":{layout},"rows":[')
+            separator = ","
+        else:
+            cache.write("[")
+            separator = ",\n  "
+        written = False
+        for item in items:
+            text = json_encoder.encode(item)
+            if cache_format != "compact":
+                # Indent the item as if it was encoded as part of the list.
+                # JSON strings can not contain raw newlines, so this is safe.
+                text = text.replace("\n", "\n  ")
+            cache.write((separator if written else separator[1:]) + text)
+            written = True
+        if cache_format == "compact":
+            cache.write("]}")
+        else:
+            cache.write("\n]" if written else "]")
+
+
+def _read_payload(file: Path) -> bytes:
+    try:
+        payload = file.read_bytes()
+    except OSError as e:
+        raise InvalidCacheError(f"Cache '{file}' could not be read: {e}") from e
+    try:
+        metadata = json.loads(metadata_file(file).read_bytes())
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        metadata = None
+    if not isinstance(metadata, dict) or "schema" not in metadata:
+        raise InvalidCacheError(f"Cache '{file}' has no metadata.")
+    if metadata["schema"] != CACHE_SCHEMA_VERSION:
+        raise InvalidCacheError(
+            f"Cache '{file}' was written with schema {metadata['schema']}, "
+            f"expected {CACHE_SCHEMA_VERSION}."
+        )
+    # Checked first, a truncated cache does not need to be hashed
+    if metadata.get("size") != len(payload):
+        raise InvalidCacheError(f"Cache '{file}' is truncated.")
+    if metadata.get("checksum") != _checksum(payload):
+        raise InvalidCacheError(f"Cache '{file}' is corrupt, its checksum differs.")
+    return payload
+
+
+def cache_format_of(file: Path) -> str:
+    """
+    The format 'file' was written in, according to its metadata.
+    Caches that were not written yet have the default format.
+    """
+    try:
+        metadata = json.loads(metadata_file(file).read_bytes())
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return DEFAULT_CACHE_FORMAT
+    if isinstance(metadata, dict) and metadata.get("format") in CACHE_FORMATS:
+        return metadata["format"]
+    return DEFAULT_CACHE_FORMAT
+
+
+def validate_cache(file: Path):
+    """
+    Check the metadata and checksum of a cache without decoding it.
+    Raises an InvalidCacheError if it can not be used.
+    """
+    _ = _read_payload(file)
+
+
+def load_cache(
+    file: Path, object_hook: Callable[[dict[str, Any]], Any] | None = None
+) -> Any:
+    """Decode a cache written by 'dump_cache', after checking its metadata."""
+    return json.loads(_read_payload(file), object_hook=object_hook)
@@ -0,0 +1,163 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+This file defines the persistent per-file index of the source code linker.
+For every scanned file it remembers the stat information (and optionally a content
+digest) together with the NeedLinks found in it. On the next run only files whose
+fingerprint changed have to be read again.
+
+The links are stored as rows of plain values, without the file (that is the key
+of the entry). Loading a large index then does not build a NeedLink per link,
+they are only added to a NeedLinkColumns, see 'index_links'.
+"""
+
+# req-Id: tool_req__docs_dd_link_source_code_link
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+    InvalidCacheError,
+    dump_cache,
+    load_cache,
+)
+from src.extensions.score_source_code_linker.needlinks import (
+    NeedLink,
+    NeedLinkColumns,
+)
+
+# Bump this whenever the layout of the index or of NeedLink changes.
+# Indexes with a different version are discarded and rebuilt.
+FILE_INDEX_VERSION = 2
+
+
+@dataclass
+class FileIndexEntry:
+    mtime_ns: int
+    size: int
+    # [line, tag, need, full_line] of every NeedLink found in the file
+    links: list[list[Any]] = field(default_factory=list)
+    digest: str | None = None
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+
+# Keys are paths relative to the scanned root, as strings.
+FileIndex = dict[str, FileIndexEntry]
+
+
+DIGEST_ALGORITHM = "blake2b"
+
+
+def file_digest(file: Path) -> str:
+    """Content digest used to detect files that were touched but not changed."""
+    with open(file, "rb") as f:
+        return hashlib.file_digest(f, DIGEST_ALGORITHM).hexdigest()
+
+
+def link_rows(links: Iterable[NeedLink]) -> list[list[Any]]:
+    return [[link.line, link.tag, link.need, link.full_line] for link in links]
+
+
+def index_links(index: FileIndex, keys: Iterable[str]) -> NeedLinkColumns:
+    """The links of the given index entries, in the order of 'keys'."""
+    columns = NeedLinkColumns()
+    for key in keys:
+        file = Path(key)
+        for line, tag, need, full_line in index[key].links:
+            columns.add(file, line, tag, need, full_line)
+    return columns
+
+
+class FileIndexEncoder(json.JSONEncoder):
+    def default(self, o: object):
+        if isinstance(o, FileIndexEntry):
+            return {
+                "mtime_ns": o.mtime_ns,
+                "size": o.size,
+                "digest": o.digest,
+                "links": o.links,
+            }
+        return super().default(o)
+
+
+def file_index_decoder(d: dict[str, Any]) -> FileIndexEntry | dict[str, Any]:
+    if {"mtime_ns", "size", "digest", "links"} <= d.keys():
+        return FileIndexEntry(
+            mtime_ns=d["mtime_ns"],
+            size=d["size"],
+            digest=d["digest"],
+            links=d["links"],
+        )
+    # It's something else, pass it on
+    return d
+
+
+def store_file_index(
+    file: Path,
+    root: Path,
+    tags: list[str],
+    index: FileIndex,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+):
+    dump_cache(
+        file,
+        {
+            "version": FILE_INDEX_VERSION,
+            "root": str(root),
+            "tags": tags,
+            "files": index,
+        },
+        FileIndexEncoder,
+        cache_format,
+    )
+
+
+def read_file_index(file: Path) -> tuple[Path, list[str], FileIndex] | None:
+    """
+    Read the index written by a previous run, together with the root and tags
+    it was written for.
+    Returns None if there is none, if it is corrupt or if it was written by
+    another version.
+    """
+    try:
+        data = load_cache(file, object_hook=file_index_decoder)
+    except (InvalidCacheError, json.JSONDecodeError, TypeError, KeyError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != FILE_INDEX_VERSION:
+        return None
+    index: FileIndex = data["files"]
+    assert all(isinstance(entry, FileIndexEntry) for entry in index.values()), (
+        "All items in the file index should be FileIndexEntry objects."
+    )
+    return Path(data["root"]), data["tags"], index
+
+
+def load_file_index(file: Path, root: Path, tags: list[str]) -> FileIndex:
+    """
+    Load the index written by a previous run.
+    Returns an empty index if there is none, if it is corrupt, or if it was
+    written by another version, for another root or with other tags, as none of
+    its entries can be trusted then.
+    """
+    stored = read_file_index(file)
+    if stored is None or stored[0] != root or stored[1] != tags:
+        return {}
+    return stored[2]
@@ -17,33 +17,125 @@ for the needs. It's split this way, so that the live_preview action does not nee
 parse everything on every run.
 """
 
+import mmap
 import os
+import re
+import subprocess
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
 from pathlib import Path
 
+from sphinx_needs.logging import get_logger
+
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+)
+from src.extensions.score_source_code_linker.file_index import (
+    FileIndex,
+    FileIndexEntry,
+    file_digest,
+    index_links,
+    link_rows,
+    load_file_index,
+    read_file_index,
+    store_file_index,
+)
 from src.extensions.score_source_code_linker.needlinks import (
     NeedLink,
+    NeedLinkColumns,
     store_source_code_links_json,
 )
 
-TAGS = [
-    "# " + "req-traceability:",
-    "# " + "req-Id:",
-]
+LOGGER = get_logger(__name__)
 
+# Number of files handed to a worker process at once. Big enough to amortize the
+# inter-process overhead, small enough to keep all workers busy until the end.
+SCAN_CHUNK_SIZE = 512
 
-def _extract_references_from_line(line: str):
-    """Extract requirement IDs from a line containing a tag."""
+DEFAULT_TAG_KEYWORDS = ["req-traceability:", "req-Id:"]
+DEFAULT_COMMENT_PREFIXES = ["#"]
 
-    for tag in TAGS:
-        tag_index = line.find(tag)
-        if tag_index >= 0:
-            line_after_tag = line[tag_index + len(tag) :].strip()
+
+class TagMatcher:
+    """
+    Finds all configured tags in a single pass.
+
+    A tag is '<comment prefix> <keyword>', e.g. '# req-Id:' or '// req-Id:'.
+    All tags are compiled into one alternation, so adding comment syntaxes or
+    keywords does not add another pass over each file or line.
+    """
+
+    def __init__(self, keywords: list[str], comment_prefixes: list[str]):
+        # Duplicated keywords or prefixes in the config give each tag only once
+        keywords = list(dict.fromkeys(keywords))
+        comment_prefixes = list(dict.fromkeys(comment_prefixes))
+        self.tags = [
+            f"{prefix} {keyword}" for keyword in keywords for prefix in comment_prefixes
+        ]
+        self._canonical_tags = {tag: tag for tag in self.tags}
+        # Longest first, so a tag is never shadowed by a shorter one at the same spot
+        alternation = "|".join(
+            re.escape(tag) for tag in sorted(self.tags, key=len, reverse=True)
+        )
+        self.line_pattern = re.compile(alternation)
+        self.tag_pattern = re.compile(alternation.encode("utf-8"))
+        # Prefilter on the keywords only. They usually share a literal prefix,
+        # which lets the regex engine skip through files without any tag about
+        # as fast as a plain 'find'.
+        self.keyword_pattern = re.compile(
+            "|".join(re.escape(keyword) for keyword in keywords).encode("utf-8")
+        )
+
+    @classmethod
+    def from_tags(cls, tags: list[str]) -> "TagMatcher":
+        """Rebuild a matcher from its 'tags', e.g. the ones stored in a file index."""
+        prefixes: dict[str, None] = {}
+        keywords: dict[str, None] = {}
+        for tag in tags:
+            prefix, keyword = tag.split(" ", 1)
+            prefixes[prefix] = None
+            keywords[keyword] = None
+        return cls(list(keywords), list(prefixes))
+
+    def may_contain_tag(self, buffer: bytes | mmap.mmap) -> bool:
+        return self.keyword_pattern.search(buffer) is not None
+
+    def tagged_line_offsets(self, data: bytes) -> list[int]:
+        """Return the sorted start offsets of all lines that contain a tag."""
+        line_starts: list[int] = []
+        for match in self.tag_pattern.finditer(data):
+            line_start = data.rfind(b"\n", 0, match.start()) + 1
+            if not line_starts or line_starts[-1] != line_start:
+                line_starts.append(line_start)
+        return line_starts
+
+    def references_in_line(self, line: str) -> Iterator[tuple[str, str]]:
+        """
+        Extract requirement IDs from a line containing a tag.
+        Only the first occurrence of each tag counts. Tags are handed out in the
+        order of 'tags', not in the order they appear in the line.
+        """
+        first_matches: dict[str, re.Match[str]] = {}
+        for match in self.line_pattern.finditer(line):
+            # Hand out the configured tag string instead of a new copy per match
+            first_matches.setdefault(self._canonical_tags[match.group()], match)
+        for tag in self.tags:
+            match = first_matches.get(tag)
+            if match is None:
+                continue
+            line_after_tag = line[match.end() :].strip()
             # Split by comma or space to get multiple requirements
             for req in line_after_tag.replace(",", " ").split():
                 yield tag, req.strip()
 
 
-def _extract_references_from_file(root: Path, file_path: Path) -> list[NeedLink]:
+DEFAULT_TAG_MATCHER = TagMatcher(DEFAULT_TAG_KEYWORDS, DEFAULT_COMMENT_PREFIXES)
+
+
+def _extract_references_from_file(
+    root: Path, file_path: Path, matcher: TagMatcher = DEFAULT_TAG_MATCHER
+) -> list[NeedLink]:
     """Scan a single file for template strings and return findings."""
     assert root.is_absolute(), "Root path must be absolute"
     assert not file_path.is_absolute(), "File path must be relative to the root"
@@ -57,41 +149,146 @@ def _extract_references_from_file(root: Path, file_path: Path) -> list[NeedLink]
     findings: list[NeedLink] = []
 
     try:
-        with open(root / file_path, encoding="utf-8", errors="ignore") as f:
-            for line_num, line in enumerate(f, 1):
-                for tag, req in _extract_references_from_line(line):
-                    findings.append(
-                        NeedLink(
-                            file=file_path,
-                            line=line_num,
-                            tag=tag,
-                            need=req,
-                            full_line=line.strip(),
-                        )
-                    )
-    except (UnicodeDecodeError, PermissionError, OSError):
-        # Skip files that can't be read as text
-        pass
+        with open(root / file_path, "rb") as f:
+            # Empty files can not be memory mapped (and contain no tags anyway)
+            if os.fstat(f.fileno()).st_size == 0:
+                return findings
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                # Fast path: the vast majority of files contains no tag at all,
+                # those are never decoded or split into lines.
+                if not matcher.may_contain_tag(buffer):
+                    return findings
+                data = buffer[:]
+    except (PermissionError, OSError, ValueError):
+        # Skip files that can't be read
+        return findings
+
+    # Lines are found via b"\n" only. Like the universal newlines of text mode,
+    # a lone b"\r" (old Mac line endings) ends a line too.
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    line_num = 1
+    counted_until = 0
+    for line_start in matcher.tagged_line_offsets(data):
+        line_num += data.count(b"\n", counted_until, line_start)
+        counted_until = line_start
+        line_end = data.find(b"\n", line_start)
+        if line_end < 0:
+            line_end = len(data)
+        line = data[line_start:line_end].decode("utf-8", errors="ignore")
+        full_line = line.strip()
+        for tag, req in matcher.references_in_line(line):
+            findings.append(
+                NeedLink(
+                    file=file_path,
+                    line=line_num,
+                    tag=tag,
+                    need=req,
+                    full_line=full_line,
+                )
+            )
 
     return findings
 
 
-def iterate_files_recursively(search_path: Path):
-    def _should_skip_file(file_path: Path) -> bool:
-        """Check if a file should be skipped during scanning."""
-        # TODO: consider using .gitignore
-        return (
-            file_path.is_dir()
-            or file_path.name.startswith((".", "_"))
-            or file_path.suffix in [".pyc", ".so", ".exe", ".bin"]
+SKIPPED_DIR_PREFIXES = (".", "_", "bazel-")
+
+
+def _git_listed_files(
+    search_path: Path, paths: list[Path] | None = None
+) -> list[Path] | None:
+    """
+    List the files git knows about below 'search_path': tracked files plus
+    untracked files that are not excluded via .gitignore.
+    With 'paths', only those of the given paths are listed.
+
+    Returns None outside of a git repository or if git is not available
+    (e.g. inside the 'bazel build' sandbox).
+    """
+    pathspec = ["--", *map(str, paths)] if paths is not None else []
+    try:
+        process = subprocess.run(
+            [
+                "git",
+                "--literal-pathspecs",
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                *pathspec,
+            ],
+            cwd=search_path,
+            capture_output=True,
+            check=True,
         )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    # Unmerged files are listed once per stage, dict keeps the first occurrence
+    listed = dict.fromkeys(p for p in process.stdout.split(b"\0") if p)
+    return [Path(os.fsdecode(p)) for p in listed]
+
+
+def _should_skip_file(file_path: Path) -> bool:
+    """Check if a file should be skipped during scanning."""
+    return (
+        file_path.is_dir()
+        or file_path.name.startswith((".", "_"))
+        or file_path.suffix in [".pyc", ".so", ".exe", ".bin"]
+    )
+
+
+def _in_skipped_dir(file: Path) -> bool:
+    return any(d.startswith(SKIPPED_DIR_PREFIXES) for d in file.parts[:-1])
+
+
+def iterate_files_recursively(search_path: Path, paths: list[Path] | None = None):
+    """
+    Yield all files below 'search_path' that are scanned, relative to it.
+    With 'paths' (relative to 'search_path'), only those of the given paths are
+    yielded that a full enumeration would yield as well, e.g. to rescan the
+    files a watcher reported as changed.
+    """
+    if paths is not None and not paths:
+        return
+    git_files = _git_listed_files(search_path, paths)
+    if git_files is not None:
+        for f in git_files:
+            # Same rules as for the os.walk fallback below
+            if _in_skipped_dir(f):
+                continue
+            path = search_path / f
+            # Submodules (and untracked nested repositories) are listed as one
+            # directory entry, their files are listed by their own git.
+            if path.is_dir() and not path.is_symlink():
+                if not f.name.startswith(SKIPPED_DIR_PREFIXES):
+                    yield from (f / sub for sub in iterate_files_recursively(path))
+            # Files deleted in the working tree are still listed by git
+            elif path.is_file() and not _should_skip_file(path):
+                yield f
+        return
+
+    if paths is not None:
+        for f in paths:
+            path = search_path / f
+            if path.is_dir():
+                if not any(d.startswith(SKIPPED_DIR_PREFIXES) for d in f.parts):
+                    yield from (f / sub for sub in iterate_files_recursively(path))
+            elif (
+                path.is_file()
+                and not _in_skipped_dir(f)
+                and not _should_skip_file(path)
+            ):
+                yield f
+        return
 
     for root, dirs, files in os.walk(search_path):
         root_path = Path(root)
 
         # Skip directories that start with '.' or '_' by modifying dirs in-place
         # This prevents os.walk from descending into these directories
-        dirs[:] = [d for d in dirs if not d.startswith((".", "_", "bazel-"))]
+        dirs[:] = [d for d in dirs if not d.startswith(SKIPPED_DIR_PREFIXES)]
 
         for file in files:
             f = root_path / file
@@ -99,24 +296,156 @@ def iterate_files_recursively(search_path: Path):
                 yield f.relative_to(search_path)
 
 
-def find_all_need_references(search_path: Path) -> list[NeedLink]:
+def _extract_references_from_files(
+    root: Path, files: list[Path], matcher: TagMatcher
+) -> list[list[NeedLink]]:
+    """Scan a chunk of files. This is the unit of work of a worker process."""
+    return [_extract_references_from_file(root, file, matcher) for file in files]
+
+
+def _chunked(files: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    it = iter(files)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def scan_files(
+    search_path: Path,
+    files: list[Path],
+    workers: int | None = None,
+    matcher: TagMatcher = DEFAULT_TAG_MATCHER,
+) -> list[list[NeedLink]]:
+    """
+    Scan the given files, in parallel if more than one chunk of files is passed.
+
+    Returns:
+        list[list[NeedLink]]: The findings of each file, in the order of 'files'.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    results: list[list[NeedLink]] = []
+    chunks = _chunked(files, SCAN_CHUNK_SIZE)
+    if workers <= 1 or len(files) <= SCAN_CHUNK_SIZE:
+        for chunk in chunks:
+            results.extend(_extract_references_from_files(search_path, chunk, matcher))
+    else:
+        # 'map' yields results in submission order, so the merged list is
+        # deterministic no matter which worker finishes first.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for references in executor.map(
+                _extract_references_from_files,
+                repeat(search_path),
+                chunks,
+                repeat(matcher),
+            ):
+                results.extend(references)
+    return results
+
+
+def update_file_index(
+    search_path: Path,
+    files: list[Path],
+    index: FileIndex,
+    workers: int | None = None,
+    use_digest: bool = False,
+    matcher: TagMatcher = DEFAULT_TAG_MATCHER,
+) -> FileIndex:
+    """
+    Bring the per-file index up to date with the files currently on disk.
+    Only new files and files whose (mtime, size) changed are read again.
+    Files that no longer exist are dropped from the index.
+
+    With 'use_digest', a content digest is stored for every scanned file. Files
+    whose stat changed but whose content did not (e.g. after a branch switch)
+    then keep their cached findings.
+    """
+    new_index: FileIndex = {}
+    stale: list[Path] = []
+    for file in files:
+        key = str(file)
+        stat = (search_path / file).stat()
+        entry = index.get(key)
+        if entry is not None and not entry.matches(stat):
+            if (
+                use_digest
+                and entry.digest is not None
+                and entry.size == stat.st_size
+                and entry.digest == file_digest(search_path / file)
+            ):
+                entry.mtime_ns = stat.st_mtime_ns
+            else:
+                entry = None
+        if entry is None:
+            new_index[key] = FileIndexEntry(
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                digest=file_digest(search_path / file) if use_digest else None,
+            )
+            stale.append(file)
+        else:
+            new_index[key] = entry
+
+    for file, links in zip(
+        stale, scan_files(search_path, stale, workers, matcher), strict=True
+    ):
+        new_index[str(file)].links = link_rows(links)
+
+    LOGGER.debug(
+        f"Source code linker index: rescanned {len(stale)} of {len(files)} files, "
+        f"dropped {len(index.keys() - new_index.keys())}",
+        type="score_source_code_linker",
+    )
+    return new_index
+
+
+def find_all_need_references(
+    search_path: Path,
+    workers: int | None = None,
+    index_file: Path | None = None,
+    use_digest: bool = False,
+    matcher: TagMatcher = DEFAULT_TAG_MATCHER,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+) -> NeedLinkColumns:
     """
     Find all need references in all files in git root.
-    Search for any appearance of TAGS and collect line numbers and referenced
-    requirements.
+    Search for any appearance of the matcher's tags and collect line numbers and
+    referenced requirements.
+
+    Args:
+        search_path: Root directory that is scanned recursively.
+        workers: Number of processes used for scanning. Defaults to the CPU count.
+                 With 1 (or less) everything is scanned in the current process.
+        index_file: Optional per-file index. If given, only files that changed
+                    since the index was written are read, and the index is
+                    updated afterwards.
+        use_digest: Also compare content digests, see 'update_file_index'.
+        matcher: The tags to search for. Defaults to '# req-Id:' and
+                 '# req-traceability:'.
+        cache_format: Format the index is written in, see 'cache_format.py'.
 
     Returns:
-        list[FileFindings]: List of FileFindings objects containing all findings
-                           for each file that contains template strings.
+        NeedLinkColumns: All findings, in the order the files were enumerated.
     """
     start_time = os.times().elapsed
 
-    all_need_references: list[NeedLink] = []
-
-    # Use os.walk to have better control over directory traversal
-    for file in iterate_files_recursively(search_path):
-        references = _extract_references_from_file(search_path, file)
-        all_need_references.extend(references)
+    files = list(iterate_files_recursively(search_path))
+    if index_file is None:
+        all_need_references = NeedLinkColumns(
+            chain.from_iterable(scan_files(search_path, files, workers, matcher))
+        )
+    else:
+        index = update_file_index(
+            search_path,
+            files,
+            load_file_index(index_file, search_path, matcher.tags),
+            workers,
+            use_digest,
+            matcher,
+        )
+        store_file_index(index_file, search_path, matcher.tags, index, cache_format)
+        # No NeedLink is built for the files that were not rescanned
+        all_need_references = index_links(index, (str(file) for file in files))
 
     elapsed_time = os.times().elapsed - start_time
     print(
@@ -127,10 +456,82 @@ def find_all_need_references(search_path: Path) -> list[NeedLink]:
     return all_need_references
 
 
-def generate_source_code_links_json(search_path: Path, file: Path):
+def generate_source_code_links_json(
+    search_path: Path,
+    file: Path,
+    workers: int | None = None,
+    index_file: Path | None = None,
+    use_digest: bool = False,
+    matcher: TagMatcher = DEFAULT_TAG_MATCHER,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+):
     """
     Generate a JSON file with all source code links for the needs.
     This is used to link the needs to the source code in the documentation.
     """
-    needlinks = find_all_need_references(search_path)
-    store_source_code_links_json(file, needlinks)
+    needlinks = find_all_need_references(
+        search_path, workers, index_file, use_digest, matcher, cache_format
+    )
+    store_source_code_links_json(file, needlinks, cache_format)
+
+
+def refresh_source_code_links(
+    search_path: Path,
+    file: Path,
+    index_file: Path,
+    changed: Iterable[Path],
+    workers: int | None = None,
+    use_digest: bool = False,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+) -> bool:
+    """
+    Update the caches written by 'generate_source_code_links_json' for the
+    'changed' files (relative to 'search_path') only, without enumerating or
+    checking any other file. Changed files that no longer exist or are not
+    scanned are dropped.
+
+    The tags are taken from the index, so the result is the same as a full scan
+    with the configuration of the build that wrote it.
+    Returns False if there is no index of 'search_path' to update, then a full
+    scan is needed.
+    """
+    stored = read_file_index(index_file)
+    if stored is None or stored[0] != search_path:
+        return False
+    _, tags, index = stored
+    matcher = TagMatcher.from_tags(tags)
+
+    changed_paths = sorted(set(changed))
+    files = list(iterate_files_recursively(search_path, changed_paths))
+    changed_keys = {str(path) for path in chain(changed_paths, files)}
+    # A removed or renamed directory may be reported instead of the files in it
+    changed_dirs = tuple(
+        f"{path}{os.sep}"
+        for path in changed_paths
+        if not (search_path / path).is_file()
+    )
+    changed_keys.update(key for key in index if key.startswith(changed_dirs))
+    refreshed = update_file_index(
+        search_path,
+        files,
+        {str(f): index[str(f)] for f in files if str(f) in index},
+        workers,
+        use_digest,
+        matcher,
+    )
+    # Keep the enumeration order of the full scan, new files go to the end
+    merged: FileIndex = {}
+    for key, entry in index.items():
+        if key in changed_keys:
+            entry = refreshed.pop(key, None)
+        if entry is not None:
+            merged[key] = entry
+    merged.update(refreshed)
+
+    store_file_index(index_file, search_path, tags, merged, cache_format)
+    store_source_code_links_json(
+        file,
+        index_links(merged, merged),
+        cache_format,
+    )
+    return True
@@ -20,15 +20,29 @@ decoder and encoder for SourceCodeLinks to enable JSON read/write
 # req-Id: tool_req__docs_dd_link_source_code_link
 
 import json
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+    compact_rows,
+    dump_cache_items,
+    is_compact_payload,
+    load_cache,
+)
 from src.extensions.score_source_code_linker.needlinks import (
+    NEEDLINK_COLUMNS,
     NeedLink,
+    decode_needlink_rows,
+    encode_needlink_rows,
 )
 from src.extensions.score_source_code_linker.testlink import (
+    TESTLINK_COLUMNS,
     DataForTestLink,
+    decode_test_link_rows,
+    encode_test_link_rows,
 )
 
 
@@ -71,40 +85,76 @@ def SourceCodeLinks_JSON_Decoder(d: dict[str, Any]) -> SourceCodeLinks | dict[st
         return SourceCodeLinks(
             need=d["need"],
             links=NeedSourceLinks(
-                CodeLinks=[NeedLink(**cl) for cl in links.get("CodeLinks", [])],
-                TestLinks=[DataForTestLink(**tl) for tl in links.get("TestLinks", [])],
+                CodeLinks=[
+                    NeedLink(**{**cl, "file": Path(cl["file"])})
+                    for cl in links.get("CodeLinks", [])
+                ],
+                TestLinks=[
+                    DataForTestLink(**{**tl, "file": Path(tl["file"])})
+                    for tl in links.get("TestLinks", [])
+                ],
             ),
         )
     return d
 
 
+# Layout of one grouped entry in 'compact' caches: [need, CodeLinks, TestLinks]
+GROUPED_COLUMNS = {"CodeLinks": NEEDLINK_COLUMNS, "TestLinks": TESTLINK_COLUMNS}
+
+
 def store_source_code_links_combined_json(
-    file: Path, source_code_links: list[SourceCodeLinks]
+    file: Path,
+    source_code_links: Iterable[SourceCodeLinks],
+    cache_format: str = DEFAULT_CACHE_FORMAT,
 ):
-    # After `rm -rf _build` or on clean builds the directory does not exist, so we need
-    # to create it
-    file.parent.mkdir(exist_ok=True)
-    with open(file, "w") as f:
-        json.dump(
-            source_code_links,
-            f,
-            cls=SourceCodeLinks_JSON_Encoder,
-            indent=2,
-            ensure_ascii=False,
+    """
+    Writes the grouped links one need at a time, so 'source_code_links' can be
+    a generator (see 'iter_grouped_by_need').
+    """
+    if cache_format == "compact":
+        dump_cache_items(
+            file,
+            (
+                [
+                    scl.need,
+                    encode_needlink_rows(scl.links.CodeLinks),
+                    encode_test_link_rows(scl.links.TestLinks),
+                ]
+                for scl in source_code_links
+            ),
+            cache_format=cache_format,
+            columns=GROUPED_COLUMNS,
+        )
+    else:
+        dump_cache_items(
+            file, source_code_links, SourceCodeLinks_JSON_Encoder, cache_format
         )
 
 
 def load_source_code_links_combined_json(file: Path) -> list[SourceCodeLinks]:
-    links: list[SourceCodeLinks] = json.loads(
-        file.read_text(encoding="utf-8"),
-        object_hook=SourceCodeLinks_JSON_Decoder,
-    )
-    assert isinstance(links, list), (
+    data = load_cache(file)
+    if is_compact_payload(data):
+        paths: dict[str, Path] = {}
+        return [
+            SourceCodeLinks(
+                need=need,
+                links=NeedSourceLinks(
+                    CodeLinks=decode_needlink_rows(code_links, paths),
+                    TestLinks=decode_test_link_rows(test_links, paths),
+                ),
+            )
+            for need, code_links, test_links in compact_rows(data, GROUPED_COLUMNS)
+        ]
+    assert isinstance(data, list), (
         "The combined source code linker links should be "
         "a list of SourceCodeLinks objects."
     )
-    assert all(isinstance(link, SourceCodeLinks) for link in links), (
-        "All items in combined_source_code_linker_cache should be "
-        "SourceCodeLinks objects."
-    )
+    links: list[SourceCodeLinks] = []
+    for d in data:
+        link = SourceCodeLinks_JSON_Decoder(d)
+        assert isinstance(link, SourceCodeLinks), (
+            "All items in combined_source_code_linker_cache should be "
+            "SourceCodeLinks objects."
+        )
+        links.append(link)
     return links
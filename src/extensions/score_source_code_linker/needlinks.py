@@ -13,12 +13,24 @@
 # req-Id: tool_req__docs_dd_link_source_code_link
 
 import json
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, overload
 
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+    compact_payload,
+    compact_rows,
+    dump_cache,
+    is_compact_payload,
+    load_cache,
+)
 
-@dataclass(frozen=True, order=True)
+
+@dataclass(frozen=True, order=True, slots=True)
 class NeedLink:
     """Represents a single template string finding in a file."""
 
@@ -47,6 +59,8 @@ class NeedLinkEncoder(json.JSONEncoder):
     def default(self, o: object):
         if isinstance(o, NeedLink):
             return asdict(o)
+        if isinstance(o, NeedLinkColumns):
+            return list(o)
         if isinstance(o, Path):
             return str(o)
         return super().default(o)
@@ -65,29 +79,188 @@ def needlink_decoder(d: dict[str, Any]) -> NeedLink | dict[str, Any]:
     return d
 
 
-def store_source_code_links_json(file: Path, needlist: list[NeedLink]):
-    # After `rm -rf _build` or on clean builds the directory does not exist,
-    # so we need to create it
-    file.parent.mkdir(exist_ok=True)
-    with open(file, "w") as f:
-        json.dump(
-            needlist,
-            f,
-            cls=NeedLinkEncoder,  # use your custom encoder
-            indent=2,
-            ensure_ascii=False,
+class NeedLinkColumns(Sequence[NeedLink]):
+    """
+    Memory efficient collection of NeedLinks, stored column wise.
+
+    Files and tags repeat a lot, each distinct one is stored once and referenced by
+    index. Line numbers and indices live in 'array's, need IDs are interned.
+    NeedLink objects are only built when they are accessed, so code expecting a
+    list of NeedLinks keeps working.
+    """
+
+    def __init__(self, links: Iterable[NeedLink] = ()):
+        self._files: list[Path] = []
+        self._file_ids: dict[Path, int] = {}
+        self._tags: list[str] = []
+        self._tag_ids: dict[str, int] = {}
+        self._file_column = array("I")
+        self._tag_column = array("I")
+        self._lines = array("I")
+        self._needs: list[str] = []
+        self._full_lines: list[str] = []
+        self.extend(links)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list[Any]]) -> "NeedLinkColumns":
+        """Build the collection from compact rows without creating NeedLinks."""
+        columns = cls()
+        paths: dict[str, Path] = {}
+        for file, line, tag, need, full_line in rows:
+            path = paths.get(file) or paths.setdefault(file, Path(file))
+            columns.add(path, line, tag, need, full_line)
+        return columns
+
+    def add(self, file: Path, line: int, tag: str, need: str, full_line: str):
+        file_id = self._file_ids.get(file)
+        if file_id is None:
+            file_id = self._file_ids[file] = len(self._files)
+            self._files.append(file)
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_ids[tag] = len(self._tags)
+            self._tags.append(tag)
+        # Several needs referenced in one line share the same full_line
+        if self._full_lines and self._full_lines[-1] == full_line:
+            full_line = self._full_lines[-1]
+        self._file_column.append(file_id)
+        self._tag_column.append(tag_id)
+        self._lines.append(line)
+        self._needs.append(sys.intern(need))
+        self._full_lines.append(full_line)
+
+    def append(self, link: NeedLink):
+        self.add(link.file, link.line, link.tag, link.need, link.full_line)
+
+    def extend(self, links: Iterable[NeedLink]):
+        for link in links:
+            self.append(link)
+
+    @property
+    def needs(self) -> list[str]:
+        """The need IDs of all links, without building the NeedLinks."""
+        return self._needs
+
+    def rows(self) -> list[list[Any]]:
+        files = [str(file) for file in self._files]
+        return [
+            [files[file_id], line, self._tags[tag_id], need, full_line]
+            for file_id, line, tag_id, need, full_line in zip(
+                self._file_column,
+                self._lines,
+                self._tag_column,
+                self._needs,
+                self._full_lines,
+                strict=True,
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self._needs)
+
+    @overload
+    def __getitem__(self, index: int) -> NeedLink: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "NeedLinkColumns": ...
+
+    def __getitem__(self, index: int | slice) -> "NeedLink | NeedLinkColumns":
+        if isinstance(index, slice):
+            return NeedLinkColumns(self[i] for i in range(*index.indices(len(self))))
+        return NeedLink(
+            file=self._files[self._file_column[index]],
+            line=self._lines[index],
+            tag=self._tags[self._tag_column[index]],
+            need=self._needs[index],
+            full_line=self._full_lines[index],
+        )
+
+    def __iter__(self) -> Iterator[NeedLink]:
+        for file_id, line, tag_id, need, full_line in zip(
+            self._file_column,
+            self._lines,
+            self._tag_column,
+            self._needs,
+            self._full_lines,
+            strict=True,
+        ):
+            yield NeedLink(
+                file=self._files[file_id],
+                line=line,
+                tag=self._tags[tag_id],
+                need=need,
+                full_line=full_line,
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NeedLinkColumns | list | tuple):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    def __repr__(self) -> str:
+        return f"NeedLinkColumns({list(self)!r})"
+
+
+# Column order of NeedLinks in 'compact' caches
+NEEDLINK_COLUMNS = ["file", "line", "tag", "need", "full_line"]
+_NEEDLINK_KEYS = frozenset(NEEDLINK_COLUMNS)
+
+
+def encode_needlink_rows(needlist: Sequence[NeedLink]) -> list[list[Any]]:
+    if isinstance(needlist, NeedLinkColumns):
+        return needlist.rows()
+    return [
+        [str(link.file), link.line, link.tag, link.need, link.full_line]
+        for link in needlist
+    ]
+
+
+def decode_needlink_rows(
+    rows: list[list[Any]], paths: dict[str, Path] | None = None
+) -> list[NeedLink]:
+    """
+    Build NeedLinks from compact rows.
+    Many links share a file, so every Path is only built once and stored in
+    'paths', which can be shared between calls.
+    """
+    paths = {} if paths is None else paths
+    return [
+        NeedLink(
+            file=paths.get(file) or paths.setdefault(file, Path(file)),
+            line=line,
+            tag=tag,
+            need=need,
+            full_line=full_line,
         )
+        for file, line, tag, need, full_line in rows
+    ]
 
 
-def load_source_code_links_json(file: Path) -> list[NeedLink]:
-    links: list[NeedLink] = json.loads(
-        file.read_text(encoding="utf-8"),
-        object_hook=needlink_decoder,
+def store_source_code_links_json(
+    file: Path,
+    needlist: Sequence[NeedLink],
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+):
+    data = (
+        compact_payload(NEEDLINK_COLUMNS, encode_needlink_rows(needlist))
+        if cache_format == "compact"
+        else needlist
     )
-    assert isinstance(links, list), (
+    dump_cache(file, data, NeedLinkEncoder, cache_format)
+
+
+def load_source_code_links_json(file: Path) -> NeedLinkColumns:
+    data = load_cache(file)
+    if is_compact_payload(data):
+        return NeedLinkColumns.from_rows(compact_rows(data, NEEDLINK_COLUMNS))
+    assert isinstance(data, list), (
         "The source code links should be a list of NeedLink objects."
     )
-    assert all(isinstance(link, NeedLink) for link in links), (
+    assert all(isinstance(d, dict) and d.keys() >= _NEEDLINK_KEYS for d in data), (
         "All items in source_code_links should be NeedLink objects."
     )
-    return links
+    return NeedLinkColumns.from_rows(
+        [d[column] for column in NEEDLINK_COLUMNS] for d in data
+    )
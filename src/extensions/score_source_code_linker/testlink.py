@@ -23,6 +23,7 @@ TestLink => The datatype that is ultimately saved inside of the JSON
 import html
 import json
 import re
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
 from itertools import chain
 from pathlib import Path
@@ -33,7 +34,7 @@ from sphinx_needs import logging
 LOGGER = logging.get_logger(__name__)
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, order=True, slots=True)
 class DataForTestLink:
     name: str
     file: Path
@@ -76,6 +77,56 @@ def DataForTestLink_JSON_Decoder(d: dict[str, Any]) -> DataForTestLink | dict[st
     return d
 
 
+# Column order of DataForTestLinks in 'compact' caches
+TESTLINK_COLUMNS = [
+    "name",
+    "file",
+    "line",
+    "need",
+    "verify_type",
+    "result",
+    "result_text",
+]
+
+
+def encode_test_link_rows(testlist: list[DataForTestLink]) -> list[list[Any]]:
+    return [
+        [
+            link.name,
+            str(link.file),
+            link.line,
+            link.need,
+            link.verify_type,
+            link.result,
+            link.result_text,
+        ]
+        for link in testlist
+    ]
+
+
+def decode_test_link_rows(
+    rows: list[list[Any]], paths: dict[str, Path] | None = None
+) -> list[DataForTestLink]:
+    """
+    Build DataForTestLinks from compact rows.
+    Every Path is only built once and stored in 'paths', which can be shared
+    between calls.
+    """
+    paths = {} if paths is None else paths
+    return [
+        DataForTestLink(
+            name=name,
+            file=paths.get(file) or paths.setdefault(file, Path(file)),
+            line=line,
+            need=need,
+            verify_type=verify_type,
+            result=result,
+            result_text=result_text,
+        )
+        for name, file, line, need, verify_type, result, result_text in rows
+    ]
+
+
 # We will have everything as string here as that mirrors the xml file
 @dataclass
 class DataOfTestCase:
@@ -192,61 +243,10 @@ def DataOfTestCase_JSON_Decoder(d: dict[str, Any]) -> DataOfTestCase | dict[str,
     return d
 
 
-def store_test_xml_parsed_json(file: Path, testlist: list[DataForTestLink]):
+def derive_test_links(test_cases: Iterable[DataOfTestCase]) -> list[DataForTestLink]:
     """
+    Derive the TestLinks of the given testcases.
     TestCases that are 'skipped' do not have properties, therefore they will NOT be
-    saved/transformed to TestLinks.
+    transformed to TestLinks.
     """
-    # After `rm -rf _build` or on clean builds the directory does not exist, so we need
-    # to create it
-    file.parent.mkdir(exist_ok=True)
-    with open(file, "w") as f:
-        json.dump(
-            testlist,
-            f,
-            cls=DataForTestLink_JSON_Encoder,
-            indent=2,
-            ensure_ascii=False,
-        )
-
-
-def load_test_xml_parsed_json(file: Path) -> list[DataForTestLink]:
-    links: list[DataForTestLink] = json.loads(
-        file.read_text(encoding="utf-8"),
-        object_hook=DataForTestLink_JSON_Decoder,
-    )
-    assert isinstance(links, list), (
-        "The source xml parser links should be a list of TestLink objects."
-    )
-    assert all(isinstance(link, DataForTestLink) for link in links), (
-        "All items in source_xml_parser should be TestLink objects."
-    )
-    return links
-
-
-def store_data_of_test_case_json(file: Path, testneeds: list[DataOfTestCase]):
-    # After `rm -rf _build` or on clean builds the directory does not exist, so we need
-    # to create it
-    file.parent.mkdir(exist_ok=True)
-    with open(file, "w") as f:
-        json.dump(
-            testneeds,
-            f,
-            cls=DataOfTestCase_JSON_Encoder,
-            indent=2,
-            ensure_ascii=False,
-        )
-
-
-def load_data_of_test_case_json(file: Path) -> list[DataOfTestCase]:
-    links: list[DataOfTestCase] = json.loads(
-        file.read_text(encoding="utf-8"),
-        object_hook=DataOfTestCase_JSON_Decoder,
-    )
-    assert isinstance(links, list), (
-        "The test_case_need json should be a list of TestCaseNeed objects."
-    )
-    assert all(isinstance(link, DataOfTestCase) for link in links), (
-        "All items in source_xml_parser should be TestCaseNeed objects."
-    )
-    return links
+    return list(chain.from_iterable(tc.get_test_links() for tc in test_cases))
@@ -0,0 +1,148 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Measures store & load times and file sizes of the source code linker caches
+for every cache format.
+
+Run it from the repository root:
+    python -m src.extensions.score_source_code_linker.tests.benchmark_cache_format
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from src.extensions.score_source_code_linker.cache_format import CACHE_FORMATS
+from src.extensions.score_source_code_linker.need_source_links import (
+    NeedSourceLinks,
+    SourceCodeLinks,
+    load_source_code_links_combined_json,
+    store_source_code_links_combined_json,
+)
+from src.extensions.score_source_code_linker.needlinks import (
+    NeedLink,
+    load_source_code_links_json,
+    store_source_code_links_json,
+)
+from src.extensions.score_source_code_linker.testlink import DataForTestLink
+
+
+@dataclass
+class BenchmarkResult:
+    cache: str
+    cache_format: str
+    store_s: float
+    load_s: float
+    size: int
+
+
+def make_needlinks(count: int) -> list[NeedLink]:
+    return [
+        NeedLink(
+            file=Path(f"src/module_{i % 500}/file_{i % 50}.py"),
+            line=i,
+            tag="#" + " req-Id:",
+            need=f"tool_req__example_{i % 2000}",
+            full_line="#" + f" req-Id: tool_req__example_{i % 2000}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_grouped(needlinks: list[NeedLink]) -> list[SourceCodeLinks]:
+    grouped: dict[str, NeedSourceLinks] = {}
+    for i, link in enumerate(needlinks):
+        links = grouped.setdefault(link.need, NeedSourceLinks())
+        links.CodeLinks.append(link)
+        if i % 4 == 0:
+            links.TestLinks.append(
+                DataForTestLink(
+                    name=f"test_{i}",
+                    file=link.file,
+                    line=link.line,
+                    need=link.need,
+                    verify_type="partially",
+                    result="passed",
+                )
+            )
+    return [SourceCodeLinks(need=need, links=links) for need, links in grouped.items()]
+
+
+def _best_of(repeats: int, func: Callable[[], object]) -> float:
+    timings: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(count: int, repeats: int, directory: Path) -> list[BenchmarkResult]:
+    needlinks = make_needlinks(count)
+    grouped = make_grouped(needlinks)
+    results: list[BenchmarkResult] = []
+    for cache_format in CACHE_FORMATS:
+        file = directory / f"needlinks_{cache_format}.json"
+        store = partial(store_source_code_links_json, file, needlinks, cache_format)
+        results.append(
+            BenchmarkResult(
+                cache="needlinks",
+                cache_format=cache_format,
+                store_s=_best_of(repeats, store),
+                load_s=_best_of(repeats, partial(load_source_code_links_json, file)),
+                size=file.stat().st_size,
+            )
+        )
+
+        file = directory / f"grouped_{cache_format}.json"
+        store = partial(
+            store_source_code_links_combined_json, file, grouped, cache_format
+        )
+        load = partial(load_source_code_links_combined_json, file)
+        results.append(
+            BenchmarkResult(
+                cache="grouped",
+                cache_format=cache_format,
+                store_s=_best_of(repeats, store),
+                load_s=_best_of(repeats, load),
+                size=file.stat().st_size,
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmark(args.links, args.repeats, Path(tmp))
+
+    print(f"{args.links} NeedLinks, best of {args.repeats} runs")
+    print(f"| {'Cache':<10} | {'Format':<8} | Store [s] | Load [s] | Size [MB] |")
+    print(f"|{'-' * 12}|{'-' * 10}|-----------|----------|-----------|")
+    for r in results:
+        print(
+            f"| {r.cache:<10} | {r.cache_format:<8} | {r.store_s:9.3f} "
+            f"| {r.load_s:8.3f} | {r.size / 1_000_000:9.1f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import json
+from pathlib import Path
+
+import pytest
+from attribute_plugin import add_test_properties
+
+from src.extensions.score_source_code_linker import is_cache_usable
+from src.extensions.score_source_code_linker.cache_format import (
+    CACHE_FORMATS,
+    CACHE_SCHEMA_VERSION,
+    InvalidCacheError,
+    dump_cache,
+    dump_cache_items,
+    load_cache,
+    metadata_file,
+)
+from src.extensions.score_source_code_linker.need_source_links import (
+    NeedSourceLinks,
+    SourceCodeLinks,
+    load_source_code_links_combined_json,
+    store_source_code_links_combined_json,
+)
+from src.extensions.score_source_code_linker.needlinks import (
+    NeedLink,
+    load_source_code_links_json,
+    store_source_code_links_json,
+)
+from src.extensions.score_source_code_linker.testlink import DataForTestLink
+from src.extensions.score_source_code_linker.tests.benchmark_cache_format import (
+    run_benchmark,
+)
+
+
+@pytest.fixture
+def needlinks() -> list[NeedLink]:
+    return [
+        NeedLink(
+            file=Path("src/a.py"),
+            line=i,
+            tag="#" + " req-Id:",
+            need=f"TREQ_ID_{i % 2}",
+            full_line="#" + f" req-Id: TREQ_ID_{i % 2} ünïcödé",
+        )
+        for i in range(1, 5)
+    ]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+@pytest.mark.parametrize("cache_format", CACHE_FORMATS)
+def test_needlinks_roundtrip(
+    tmp_path: Path, needlinks: list[NeedLink], cache_format: str
+):
+    """Test that every cache format restores the same NeedLinks"""
+    file = tmp_path / "cache.json"
+    store_source_code_links_json(file, needlinks, cache_format)
+    assert load_source_code_links_json(file) == needlinks
+
+
+@add_test_properties(
+    partially_verifies=[
+        "tool_req__docs_dd_link_source_code_link",
+        "tool_req__docs_test_link_testcase",
+    ],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+@pytest.mark.parametrize("cache_format", CACHE_FORMATS)
+def test_grouped_roundtrip(
+    tmp_path: Path, needlinks: list[NeedLink], cache_format: str
+):
+    """Test that every cache format restores the same grouped links"""
+    grouped = [
+        SourceCodeLinks(
+            need="TREQ_ID_1",
+            links=NeedSourceLinks(
+                CodeLinks=needlinks[:2],
+                TestLinks=[
+                    DataForTestLink(
+                        name="test_a",
+                        file=Path("src/test_a.py"),
+                        line=3,
+                        need="TREQ_ID_1",
+                        verify_type="fully",
+                        result="failed",
+                        result_text="boom",
+                    )
+                ],
+            ),
+        ),
+        SourceCodeLinks(need="TREQ_ID_0", links=NeedSourceLinks()),
+    ]
+    file = tmp_path / "grouped.json"
+    store_source_code_links_combined_json(file, grouped, cache_format)
+    loaded = load_source_code_links_combined_json(file)
+    assert [scl.need for scl in loaded] == ["TREQ_ID_1", "TREQ_ID_0"]
+    assert loaded[0].links.TestLinks == grouped[0].links.TestLinks
+    assert [str(cl.file) for cl in loaded[0].links.CodeLinks] == ["src/a.py"] * 2
+    assert loaded[1].links == NeedSourceLinks()
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_compact_format_is_smaller_and_readable_json_stays_default(
+    tmp_path: Path, needlinks: list[NeedLink]
+):
+    """Test that 'compact' writes rows while the default stays indented objects"""
+    readable = tmp_path / "readable.json"
+    compact = tmp_path / "compact.json"
+    store_source_code_links_json(readable, needlinks)
+    store_source_code_links_json(compact, needlinks, "compact")
+
+    assert load_cache(readable)[0]["need"] == "TREQ_ID_1"
+    assert "\n  " in readable.read_text()
+    data = load_cache(compact)
+    assert data["columns"] == ["file", "line", "tag", "need", "full_line"]
+    assert data["rows"][0][:4] == ["src/a.py", 1, "#" + " req-Id:", "TREQ_ID_1"]
+    assert compact.stat().st_size < readable.stat().st_size
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_compact_cache_with_other_columns_is_rejected(
+    tmp_path: Path, needlinks: list[NeedLink]
+):
+    """Test that a compact cache with an unexpected layout is not misread"""
+    file = tmp_path / "compact.json"
+    store_source_code_links_json(file, needlinks, "compact")
+    data = load_cache(file)
+    data["columns"] = list(reversed(data["columns"]))
+    dump_cache(file, data, cache_format="compact")
+    with pytest.raises(AssertionError):
+        load_source_code_links_json(file)
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_cache_format_benchmark_runs(tmp_path: Path):
+    """Test that the cache format benchmark measures every format"""
+    results = run_benchmark(count=50, repeats=1, directory=tmp_path)
+    assert {(r.cache, r.cache_format) for r in results} == {
+        (cache, cache_format)
+        for cache in ("needlinks", "grouped")
+        for cache_format in CACHE_FORMATS
+    }
+    assert all(r.size > 0 for r in results)
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_corrupt_and_outdated_caches_are_rejected(
+    tmp_path: Path, needlinks: list[NeedLink]
+):
+    """Test that truncated, modified, unlabelled and old caches are not used"""
+    file = tmp_path / "cache.json"
+    store_source_code_links_json(file, needlinks)
+    content = file.read_bytes()
+    metadata = json.loads(metadata_file(file).read_bytes())
+    assert is_cache_usable(file)
+    # The cache itself is plain JSON
+    assert json.loads(content)[0]["need"] == "TREQ_ID_1"
+
+    file.write_bytes(content[:-10])
+    with pytest.raises(InvalidCacheError, match="truncated"):
+        load_source_code_links_json(file)
+
+    file.write_bytes(content.replace(b"TREQ_ID_1", b"TREQ_ID_7"))
+    with pytest.raises(InvalidCacheError, match="corrupt"):
+        load_source_code_links_json(file)
+
+    file.write_bytes(content)
+    metadata_file(file).unlink()
+    with pytest.raises(InvalidCacheError, match="no metadata"):
+        load_source_code_links_json(file)
+
+    old_metadata = metadata | {"schema": CACHE_SCHEMA_VERSION - 1}
+    metadata_file(file).write_text(json.dumps(old_metadata))
+    with pytest.raises(InvalidCacheError, match="schema"):
+        load_source_code_links_json(file)
+    assert not is_cache_usable(file)
+    assert not is_cache_usable(tmp_path / "missing.json")
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_interrupted_write_keeps_previous_cache(
+    tmp_path: Path, needlinks: list[NeedLink], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a failing write leaves the old cache and no temporary file"""
+    file = tmp_path / "cache.json"
+    store_source_code_links_json(file, needlinks)
+
+    def interrupted(*_args: object):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(
+        "src.extensions.score_source_code_linker.cache_format.os.replace",
+        interrupted,
+    )
+    with pytest.raises(KeyboardInterrupt):
+        store_source_code_links_json(file, needlinks[:1])
+    assert load_source_code_links_json(file) == needlinks
+    assert sorted(tmp_path.iterdir()) == [file, metadata_file(file)]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+@pytest.mark.parametrize("cache_format", CACHE_FORMATS)
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_streamed_items_match_dumped_list(
+    tmp_path: Path, cache_format: str, count: int
+):
+    """Test that writing items one at a time gives the same cache as a whole list"""
+    items = [
+        {"need": f"TREQ_ID_{i}", "lines": [i, i + 1], "text": "ü"} for i in range(count)
+    ]
+    dumped = tmp_path / "dumped.json"
+    streamed = tmp_path / "streamed.json"
+    if cache_format == "compact":
+        rows = [list(item.values()) for item in items]
+        dump_cache(
+            dumped,
+            {"format": "compact", "columns": ["a", "b"], "rows": rows},
+            cache_format=cache_format,
+        )
+        dump_cache_items(
+            streamed, iter(rows), cache_format=cache_format, columns=["a", "b"]
+        )
+    else:
+        dump_cache(dumped, items, cache_format=cache_format)
+        dump_cache_items(streamed, iter(items), cache_format=cache_format)
+    assert streamed.read_bytes() == dumped.read_bytes()
+    assert is_cache_usable(streamed)
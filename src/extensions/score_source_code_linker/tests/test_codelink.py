@@ -10,18 +10,22 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
+import importlib
 import json
 import os
 import subprocess
 import tempfile
+import tracemalloc
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, cast
 
 import pytest
 from attribute_plugin import add_test_properties
 from sphinx_needs.data import NeedsMutable
 
+import src.extensions.score_source_code_linker as scl
 from src.extensions.score_metamodel.tests import need as test_need
 
 # Import the module under test
@@ -31,16 +35,29 @@ from src.extensions.score_source_code_linker import (
     get_cache_filename,
     group_by_need,
 )
+from src.extensions.score_source_code_linker.need_source_links import (
+    NeedSourceLinks,
+    SourceCodeLinks,
+)
 from src.extensions.score_source_code_linker.needlinks import (
     NeedLink,
+    NeedLinkColumns,
     load_source_code_links_json,
     store_source_code_links_json,
 )
+from src.extensions.score_source_code_linker.testlink import DataForTestLink
 from src.helper_lib import (
+    RepoContext,
     get_current_git_hash,
 )
 from src.helper_lib.additional_functions import get_github_link
 
+# The package re-exports a function with the same name as this module,
+# so it has to be looked up explicitly.
+scan = importlib.import_module(
+    "src.extensions.score_source_code_linker.generate_source_code_links_json"
+)
+
 """
 #          ────────────────ATTENTION───────────────
 
@@ -319,6 +336,49 @@ def test_group_by_need_empty_list():
     assert len(result) == 0
 
 
+@add_test_properties(
+    partially_verifies=[
+        "tool_req__docs_dd_link_source_code_link",
+        "tool_req__docs_test_link_testcase",
+    ],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_group_by_need_merges_sorted_by_need(sample_needlinks):
+    """Test that code & test links are merged per need, ordered by need ID."""
+    testlinks = [
+        DataForTestLink(
+            name=f"test_{need}",
+            file=Path("src/test.py"),
+            line=1,
+            need=need,
+            verify_type="fully",
+            result="passed",
+        )
+        for need in ["TREQ_ID_3", "TREQ_ID_1", "TREQ_ID_0"]
+    ]
+    result = group_by_need(list(reversed(sample_needlinks)), testlinks)
+
+    assert [links.need for links in result] == [
+        "TREQ_ID_0",
+        "TREQ_ID_1",
+        "TREQ_ID_2",
+        "TREQ_ID_200",
+        "TREQ_ID_3",
+    ]
+    by_need = {links.need: links.links for links in result}
+    assert by_need["TREQ_ID_0"] == NeedSourceLinks(TestLinks=[testlinks[2]])
+    assert by_need["TREQ_ID_1"] == NeedSourceLinks(
+        # Links of one need keep the order they were found in
+        CodeLinks=[sample_needlinks[1], sample_needlinks[0]],
+        TestLinks=[testlinks[1]],
+    )
+    assert by_need["TREQ_ID_3"] == NeedSourceLinks(TestLinks=[testlinks[0]])
+    assert group_by_need(NeedLinkColumns(reversed(sample_needlinks)), testlinks) == (
+        result
+    )
+
+
 @add_test_properties(
     partially_verifies=["tool_req__docs_dd_link_source_code_link"],
     test_type="requirements-based",
@@ -580,3 +640,469 @@ def test_multiple_commits_hash_consistency(git_repo):
     os.chdir(Path(git_repo).absolute())
     github_link = get_github_link(needlink)
     assert new_hash in github_link
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_find_all_need_references_parallel_matches_serial(temp_dir, monkeypatch):
+    """Test that scanning with worker processes gives the same ordered result."""
+    for i in range(10):
+        (temp_dir / f"impl_{i}.py").write_text(
+            f"# Implementation {i}\n#" + f" req-Id: TREQ_ID_{i}\n"
+        )
+    # Force several chunks so that more than one worker gets work
+    monkeypatch.setattr(scan, "SCAN_CHUNK_SIZE", 3)
+
+    serial = scan.find_all_need_references(temp_dir, workers=1)
+    parallel = scan.find_all_need_references(temp_dir, workers=3)
+
+    assert len(serial) == 10
+    assert parallel == serial
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_extract_references_line_numbers(temp_dir):
+    """Test line numbers and full lines found via the byte level scan."""
+    (temp_dir / "empty.py").write_text("")
+    (temp_dir / "untagged.py").write_text("print('hello')\n")
+    (temp_dir / "tagged.py").write_bytes(
+        b"first line\r\n"
+        b"#" + b" req-Id: TREQ_ID_1, TREQ_ID_2\r\n"
+        b"\r\n"
+        b"x = 1  #" + b" req-traceability: TREQ_ID_3"
+    )
+
+    assert scan._extract_references_from_file(temp_dir, Path("empty.py")) == []
+    assert scan._extract_references_from_file(temp_dir, Path("untagged.py")) == []
+
+    found = scan._extract_references_from_file(temp_dir, Path("tagged.py"))
+    assert [(n.line, n.need) for n in found] == [
+        (2, "TREQ_ID_1"),
+        (2, "TREQ_ID_2"),
+        (4, "TREQ_ID_3"),
+    ]
+    assert found[0].full_line == "#" + " req-Id: TREQ_ID_1, TREQ_ID_2"
+    assert found[2].full_line == "x = 1  #" + " req-traceability: TREQ_ID_3"
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_extract_references_carriage_return_line_endings(temp_dir):
+    """Test that a lone carriage return ends a line, as in text mode."""
+    (temp_dir / "mac.py").write_bytes(
+        b"first line\r"
+        b"#" + b" req-Id: TREQ_ID_1\r"
+        b"next = 1\r\n"
+        b"#" + b" req-Id: TREQ_ID_2\r"
+    )
+
+    found = scan._extract_references_from_file(temp_dir, Path("mac.py"))
+    assert [(n.line, n.need) for n in found] == [(2, "TREQ_ID_1"), (4, "TREQ_ID_2")]
+    assert found[0].full_line == "#" + " req-Id: TREQ_ID_1"
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_iterate_files_respects_gitignore(git_repo):
+    """Test that ignored files are not enumerated inside a git repository."""
+    (git_repo / ".gitignore").write_text("node_modules/\n*.log\n")
+    (git_repo / "node_modules").mkdir()
+    (git_repo / "node_modules" / "dep.js").write_text("// dependency\n")
+    (git_repo / "build.log").write_text("log\n")
+    (git_repo / "untracked.py").write_text("print('new')\n")
+    (git_repo / "bazel-out").mkdir()
+    (git_repo / "bazel-out" / "gen.py").write_text("print('generated')\n")
+
+    files = set(scan.iterate_files_recursively(git_repo))
+    assert files == {Path("test_file.py"), Path("untracked.py")}
+
+    # Tracked files that were deleted in the working tree are skipped as well
+    (git_repo / "test_file.py").unlink()
+    assert set(scan.iterate_files_recursively(git_repo)) == {Path("untracked.py")}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_tags_inside_submodules_are_found(temp_dir, git_repo):
+    """Test that files of a submodule are scanned, git lists it as one entry."""
+    git = ["git", "-c", "user.email=test@example.com", "-c", "user.name=Test User"]
+    library = temp_dir / "library"
+    library.mkdir()
+    subprocess.run(["git", "init"], cwd=library, check=True, capture_output=True)
+    (library / "impl.py").write_text("#" + " req-Id: TREQ_ID_1\n")
+    subprocess.run([*git, "add", "."], cwd=library, check=True)
+    subprocess.run([*git, "commit", "-m", "Library"], cwd=library, check=True)
+    subprocess.run(
+        [
+            *git,
+            "-c",
+            "protocol.file.allow=always",
+            "submodule",
+            "add",
+            str(library),
+            "libs/library",
+        ],
+        cwd=git_repo,
+        check=True,
+        capture_output=True,
+    )
+
+    assert Path("libs/library/impl.py") in set(scan.iterate_files_recursively(git_repo))
+    cache = temp_dir / "cache.json"
+    scan.generate_source_code_links_json(git_repo, cache, workers=1)
+    assert [
+        (str(link.file), link.need) for link in load_source_code_links_json(cache)
+    ] == [("libs/library/impl.py", "TREQ_ID_1")]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_iterate_files_without_git(temp_dir):
+    """Test that enumeration falls back to walking the tree outside of git."""
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "impl.py").write_text("print('impl')\n")
+    (temp_dir / "_build").mkdir()
+    (temp_dir / "_build" / "cache.json").write_text("[]\n")
+
+    assert set(scan.iterate_files_recursively(temp_dir)) == {Path("src/impl.py")}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_tag_matcher_custom_comment_prefixes(temp_dir):
+    """Test that configured comment prefixes and keywords are all found."""
+    matcher = scan.TagMatcher(["req-Id:", "impl-Id:"], ["#", "//", "--"])
+    (temp_dir / "impl.cpp").write_text(
+        "//" + " req-Id: TREQ_ID_1\n"
+        "int x;  //" + " impl-Id: TREQ_ID_2\n"
+        "--" + " req-Id: TREQ_ID_3\n"
+        "#" + " unknown-Id: TREQ_ID_4\n"
+    )
+
+    found = scan._extract_references_from_file(temp_dir, Path("impl.cpp"), matcher)
+    assert [(n.line, n.tag, n.need) for n in found] == [
+        (1, "//" + " req-Id:", "TREQ_ID_1"),
+        (2, "//" + " impl-Id:", "TREQ_ID_2"),
+        (3, "--" + " req-Id:", "TREQ_ID_3"),
+    ]
+    # The default matcher only knows about python style comments
+    assert scan._extract_references_from_file(temp_dir, Path("impl.cpp")) == []
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_tag_matcher_uses_configured_tag_order():
+    """Test that tags are reported in configured order, duplicates only once."""
+    matcher = scan.TagMatcher(["req-Id:", "impl-Id:", "req-Id:"], ["#", "#"])
+    assert matcher.tags == ["#" + " req-Id:", "#" + " impl-Id:"]
+    assert scan.TagMatcher.from_tags(matcher.tags).tags == matcher.tags
+
+    line = "#" + " impl-Id: TREQ_ID_2 " + "#" + " req-Id: TREQ_ID_1"
+    # Everything after a tag is split into IDs, even a following tag
+    assert list(matcher.references_in_line(line)) == [
+        ("#" + " req-Id:", "TREQ_ID_1"),
+        ("#" + " impl-Id:", "TREQ_ID_2"),
+        ("#" + " impl-Id:", "#"),
+        ("#" + " impl-Id:", "req-Id:"),
+        ("#" + " impl-Id:", "TREQ_ID_1"),
+    ]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_inject_links_does_not_copy_all_needs(temp_dir, monkeypatch):
+    """Test that injecting links only touches linked needs and copies nothing."""
+    needs_count = 10_000
+    all_needs = NeedsMutable({})
+
+    class FakeNeedsData:
+        def __init__(self, env):
+            pass
+
+        def get_needs_mutable(self):
+            return all_needs
+
+        def remove_need_node(self, need_id):
+            pass
+
+    linked = [
+        SourceCodeLinks(
+            need="TREQ_ID_1",
+            links=NeedSourceLinks(
+                CodeLinks=[
+                    NeedLink(
+                        file=Path("src/implementation1.py"),
+                        line=3,
+                        tag="#" + " req-Id:",
+                        need="TREQ_ID_1",
+                        full_line="#" + " req-Id: TREQ_ID_1",
+                    )
+                ],
+                TestLinks=[],
+            ),
+        )
+    ]
+    repo = RepoContext(
+        root=temp_dir, base_url="https://github.com/org/repo", commit_hash="a" * 40
+    )
+    monkeypatch.setattr(scl, "SphinxNeedsData", FakeNeedsData)
+    monkeypatch.setattr(scl, "find_ws_root", lambda: temp_dir)
+    monkeypatch.setattr(scl, "resolve_repo_context", lambda: repo)
+    monkeypatch.setattr(
+        scl, "load_source_code_links_combined_json", lambda _file: linked
+    )
+    app = SimpleNamespace(
+        outdir=temp_dir, config=SimpleNamespace(needs_external_needs=[])
+    )
+
+    tracemalloc.start()
+    try:
+        all_needs.update(
+            (
+                f"TREQ_ID_{i}",
+                test_need(
+                    id=f"TREQ_ID_{i}",
+                    content=f"Content of requirement {i}",
+                    **{f"extra_option_{o}": f"value {o}" for o in range(40)},
+                ),
+            )
+            for i in range(needs_count)
+        )
+        needs_size, _ = tracemalloc.get_traced_memory()
+        original_objects = dict(all_needs)
+
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        scl.inject_links_into_needs(app, None)  # type: ignore[arg-type]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A copy of all needs would at least double the memory of the needs
+    assert peak - before < needs_size / 20
+    assert cast(dict[str, object], all_needs["TREQ_ID_1"])["source_code_link"] == (
+        f"{repo.blob_url('src/implementation1.py', 3)}<>src/implementation1.py:3"
+    )
+    assert all(all_needs[id] is need for id, need in original_objects.items())
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_apply_need_updates_in_one_pass():
+    """Test that link updates are applied without removing and re-adding needs."""
+    all_needs = make_needs(
+        {
+            "TREQ_ID_1": {"id": "TREQ_ID_1", "title": "Test requirement 1"},
+            "TREQ_ID_2": {"id": "TREQ_ID_2", "title": "Test requirement 2"},
+        }
+    )
+    untouched = all_needs["TREQ_ID_2"]
+    dropped_nodes: list[str] = []
+
+    class FakeNeedsData:
+        def get_needs_mutable(self):
+            return all_needs
+
+        def remove_need_node(self, need_id):
+            dropped_nodes.append(need_id)
+
+        def remove_need(self, need_id):
+            pytest.fail("Needs must not be removed one by one")
+
+        def add_need(self, need):
+            pytest.fail("Needs must not be added one by one")
+
+    scl.apply_need_updates(
+        FakeNeedsData(),  # type: ignore[arg-type]
+        {"TREQ_ID_1": {"source_code_link": "url<>file.py:1", "testlink": ""}},
+    )
+
+    linked = cast(dict[str, object], all_needs["TREQ_ID_1"])
+    assert linked["source_code_link"] == "url<>file.py:1"
+    assert linked["testlink"] == ""
+    assert all_needs["TREQ_ID_2"] is untouched
+    assert "source_code_link" not in all_needs["TREQ_ID_2"]
+    assert dropped_nodes == ["TREQ_ID_1"]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_repo_context_resolved_once_per_build(temp_dir, monkeypatch):
+    """Test that all links of a build share one RepoContext, git is queried once."""
+    resolved: list[RepoContext] = []
+
+    def _resolve() -> RepoContext:
+        resolved.append(
+            RepoContext(
+                root=temp_dir,
+                base_url="https://github.com/org/repo",
+                commit_hash=f"{len(resolved)}" * 40,
+            )
+        )
+        return resolved[-1]
+
+    monkeypatch.setattr(scl, "find_ws_root", lambda: temp_dir)
+    monkeypatch.setattr(scl, "resolve_repo_context", _resolve)
+
+    first = scl.get_repo_context()
+    assert scl.get_repo_context() is first
+    assert resolved == [first]
+
+    # The next build resolves it again, HEAD may have moved
+    scl.forget_repo_context(None, None, [])  # type: ignore[arg-type]
+    assert scl.get_repo_context() is resolved[1]
+    assert resolved[1].commit_hash != first.commit_hash
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_apply_need_updates_reports_changed_documents():
+    """Test that only documents of needs whose links changed are reported."""
+    all_needs = make_needs(
+        {
+            "TREQ_ID_1": {"id": "TREQ_ID_1", "docname": "a", "source_code_link": "x"},
+            "TREQ_ID_2": {"id": "TREQ_ID_2", "docname": "b", "source_code_link": "y"},
+        }
+    )
+
+    class FakeNeedsData:
+        def get_needs_mutable(self):
+            return all_needs
+
+        def remove_need_node(self, need_id):
+            pass
+
+    changed = scl.apply_need_updates(
+        FakeNeedsData(),  # type: ignore[arg-type]
+        {
+            "TREQ_ID_1": {"source_code_link": "x"},
+            "TREQ_ID_2": {"source_code_link": "z"},
+        },
+    )
+    assert changed == {"b"}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_find_need_with_prefixed_id_lookup():
+    """Test that the prebuilt lookup resolves exactly like trying all prefixes."""
+    all_needs = make_needs(
+        {
+            "REQ_001": {"id": "REQ_001", "title": "Local requirement"},
+            "FIRST_REQ_002": {"id": "FIRST_REQ_002", "title": "First"},
+            "SECOND_REQ_002": {"id": "SECOND_REQ_002", "title": "Second"},
+            "SECOND_REQ_003": {"id": "SECOND_REQ_003", "title": "Second only"},
+        }
+    )
+    prefixes = ["FIRST_", "SECOND_"]
+    lookup = scl.build_prefixed_id_lookup(all_needs, prefixes)
+
+    for need_id in ["REQ_001", "REQ_002", "REQ_003", "REQ_999", "FIRST_REQ_002"]:
+        expected = find_need(all_needs, need_id, prefixes)
+        found = find_need(all_needs, need_id, prefixes, lookup)
+        assert found is expected, need_id
+
+    found = find_need(all_needs, "REQ_002", prefixes, lookup)
+    assert found is not None
+    assert found["id"] == "FIRST_REQ_002"
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_needlink_columns_behave_like_a_list(sample_needlinks):
+    """Test that the columnar collection gives the same NeedLinks as a list."""
+    columns = NeedLinkColumns(sample_needlinks)
+
+    assert len(columns) == len(sample_needlinks)
+    assert columns == sample_needlinks
+    assert list(columns) == sample_needlinks
+    assert columns[0] == sample_needlinks[0]
+    assert columns[-1] == sample_needlinks[-1]
+    assert columns[1:3] == sample_needlinks[1:3]
+    assert columns.needs == [link.need for link in sample_needlinks]
+    assert NeedLinkColumns.from_rows(columns.rows()) == columns
+    assert group_by_need(columns) == group_by_need(sample_needlinks)
+    # Files and tags are stored once and shared by all links
+    shared = NeedLinkColumns.from_rows(
+        [["a.py", 1, "tag", "TREQ_ID_1", "line"], ["a.py", 2, "tag", "TREQ_ID_2", "x"]]
+    )
+    assert shared[0].file is shared[1].file
+    assert shared[0].tag is shared[1].tag
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_needlink_columns_memory():
+    """Test that many NeedLinks are held much more compactly as columns."""
+
+    def make_links():
+        for i in range(20_000):
+            yield NeedLink(
+                file=Path(f"src/module_{i % 100}.py"),
+                line=i,
+                tag="#" + " req-Id:",
+                need=f"TREQ_ID_{i % 500}",
+                full_line="#" + f" req-Id: TREQ_ID_{i % 500}",
+            )
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        as_list = list(make_links())
+        list_size = tracemalloc.get_traced_memory()[0] - before
+        del as_list
+
+        before, _ = tracemalloc.get_traced_memory()
+        as_columns = NeedLinkColumns(make_links())
+        columns_size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(as_columns) == 20_000
+    assert columns_size < list_size / 3
@@ -0,0 +1,221 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import importlib
+import json
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from attribute_plugin import add_test_properties
+
+from src.extensions.score_source_code_linker.cache_format import load_cache
+from src.extensions.score_source_code_linker.file_index import (
+    FILE_INDEX_VERSION,
+    FileIndexEntry,
+    index_links,
+    load_file_index,
+    store_file_index,
+)
+from src.extensions.score_source_code_linker.needlinks import (
+    NeedLink,
+    NeedLinkColumns,
+    needlink_decoder,
+    store_source_code_links_json,
+)
+
+scan = importlib.import_module(
+    "src.extensions.score_source_code_linker.generate_source_code_links_json"
+)
+TAGS = scan.DEFAULT_TAG_MATCHER.tags
+
+
+@pytest.fixture
+def source_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "ws"
+    root.mkdir()
+    (root / "a.py").write_text("# file a\n#" + " req-Id: TREQ_ID_1\n")
+    (root / "b.py").write_text("#" + " req-Id: TREQ_ID_2\n")
+    (root / "c.py").write_text("print('no tags here')\n")
+    return root
+
+
+@pytest.fixture
+def scanned_files(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Records every file that actually gets read by the scanner."""
+    seen: list[Path] = []
+    original = scan._extract_references_from_file
+
+    def _recording(root: Path, file_path: Path, *args: object) -> list[NeedLink]:
+        seen.append(file_path)
+        return original(root, file_path, *args)
+
+    monkeypatch.setattr(scan, "_extract_references_from_file", _recording)
+    return seen
+
+
+def _bump_mtime(file: Path):
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_file_index_roundtrip(tmp_path: Path):
+    """Test storing and loading the per-file index."""
+    index = {
+        "a.py": FileIndexEntry(
+            mtime_ns=1,
+            size=2,
+            digest="abc",
+            links=[[2, "#" + " req-Id:", "TREQ_ID_1", "#" + " req-Id: TREQ_ID_1"]],
+        )
+    }
+    index_file = tmp_path / "index.json"
+    store_file_index(index_file, Path("/ws"), TAGS, index)
+
+    assert load_file_index(index_file, Path("/ws"), TAGS) == index
+    # An index written for another root or other tags must not be reused
+    assert load_file_index(index_file, Path("/other"), TAGS) == {}
+    assert load_file_index(index_file, Path("/ws"), ["// req-Id:"]) == {}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_file_index_outdated_or_broken(tmp_path: Path):
+    """Test that outdated or unreadable indexes are treated as empty."""
+    index_file = tmp_path / "index.json"
+    assert load_file_index(index_file, Path("/ws"), TAGS) == {}
+
+    index_file.write_text(
+        json.dumps(
+            {
+                "version": FILE_INDEX_VERSION + 1,
+                "root": "/ws",
+                "tags": TAGS,
+                "files": {},
+            }
+        )
+    )
+    assert load_file_index(index_file, Path("/ws"), TAGS) == {}
+
+    index_file.write_text('{"version": 1, "root": "/ws", "fil')
+    assert load_file_index(index_file, Path("/ws"), TAGS) == {}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_warm_rescan_only_reads_changed_files(
+    source_tree: Path, tmp_path: Path, scanned_files: list[Path]
+):
+    """Test that only new or modified files are rescanned and deleted ones dropped."""
+    index_file = tmp_path / "index.json"
+
+    cold = scan.find_all_need_references(source_tree, 1, index_file)
+    assert sorted(scanned_files) == [Path("a.py"), Path("b.py"), Path("c.py")]
+    assert sorted(n.need for n in cold) == ["TREQ_ID_1", "TREQ_ID_2"]
+
+    scanned_files.clear()
+    warm = scan.find_all_need_references(source_tree, 1, index_file)
+    assert scanned_files == []
+    assert warm == cold
+
+    (source_tree / "a.py").write_text("#" + " req-Id: TREQ_ID_3\n")
+    _bump_mtime(source_tree / "a.py")
+    (source_tree / "b.py").unlink()
+    (source_tree / "d.py").write_text("#" + " req-Id: TREQ_ID_4\n")
+
+    scanned_files.clear()
+    updated = scan.find_all_need_references(source_tree, 1, index_file)
+    assert sorted(scanned_files) == [Path("a.py"), Path("d.py")]
+    assert sorted(n.need for n in updated) == ["TREQ_ID_3", "TREQ_ID_4"]
+    assert set(load_file_index(index_file, source_tree, TAGS)) == {
+        "a.py",
+        "c.py",
+        "d.py",
+    }
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_digest_skips_touched_files(
+    source_tree: Path, tmp_path: Path, scanned_files: list[Path]
+):
+    """Test that touched but unchanged files are not rescanned with digests on."""
+    index_file = tmp_path / "index.json"
+    scan.find_all_need_references(source_tree, 1, index_file, use_digest=True)
+
+    _bump_mtime(source_tree / "a.py")
+    scanned_files.clear()
+    scan.find_all_need_references(source_tree, 1, index_file, use_digest=True)
+    assert scanned_files == []
+
+    # Without digests the same touch leads to a rescan
+    scan.find_all_need_references(source_tree, 1, index_file)
+    _bump_mtime(source_tree / "a.py")
+    scanned_files.clear()
+    scan.find_all_need_references(source_tree, 1, index_file)
+    assert scanned_files == [Path("a.py")]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_indexed_links_load_without_needlinks(tmp_path: Path):
+    """Test that loading the links from the index needs less memory than NeedLinks."""
+    root = tmp_path / "ws"
+    root.mkdir()
+    for i in range(20):
+        (root / f"module_{i}.py").write_text(
+            "".join("#" + f" req-Id: TREQ_ID_{i}_{j}\n" for j in range(1000))
+        )
+    index_file = tmp_path / "index.json"
+    links = scan.find_all_need_references(root, 1, index_file)
+    # The same links, stored as one object per link, as the index used to be
+    links_file = tmp_path / "links.json"
+    store_source_code_links_json(links_file, links)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        index = load_file_index(index_file, root, TAGS)
+        from_index = index_links(index, index)
+        del index
+        index_peak = tracemalloc.get_traced_memory()[1] - before
+
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        from_objects = NeedLinkColumns(
+            load_cache(links_file, object_hook=needlink_decoder)
+        )
+        objects_peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    assert from_index == from_objects == links
+    assert index_peak < objects_peak * 0.75
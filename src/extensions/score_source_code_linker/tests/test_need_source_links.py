@@ -17,6 +17,7 @@ from typing import Any
 
 import pytest
 
+from src.extensions.score_source_code_linker.cache_format import dump_cache
 from src.extensions.score_source_code_linker.need_source_links import (
     NeedSourceLinks,
     SourceCodeLinks,
@@ -128,7 +129,7 @@ def test_store_and_load_json(tmp_path: Path, sample_source_code_links):
 
 def test_load_invalid_json_type(tmp_path: Path):
     test_file = tmp_path / "invalid.json"
-    test_file.write_text('{"not_a_list": true}', encoding="utf-8")
+    dump_cache(test_file, {"not_a_list": True})
 
     with pytest.raises(AssertionError, match="should be a list of SourceCodeLinks"):
         _ = load_source_code_links_combined_json(test_file)
@@ -137,7 +138,7 @@ def test_load_invalid_json_type(tmp_path: Path):
 def test_load_invalid_json_items(tmp_path: Path):
     test_file = tmp_path / "bad_items.json"
     # This is a list but doesn't contain SourceCodeLinks
-    test_file.write_text('[{"some": "thing"}]', encoding="utf-8")
+    dump_cache(test_file, [{"some": "thing"}])
 
     with pytest.raises(AssertionError, match="should be SourceCodeLinks objects"):
         _ = load_source_code_links_combined_json(test_file)
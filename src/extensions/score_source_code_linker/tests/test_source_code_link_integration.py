@@ -29,6 +29,7 @@ from src.extensions.score_source_code_linker.needlinks import NeedLink
 from src.extensions.score_source_code_linker.testlink import (
     DataForTestLink,
     DataForTestLink_JSON_Decoder,
+    derive_test_links,
 )
 from src.extensions.score_source_code_linker.tests.test_codelink import (
     needlink_test_decoder,
@@ -36,6 +37,10 @@ from src.extensions.score_source_code_linker.tests.test_codelink import (
 from src.extensions.score_source_code_linker.tests.test_need_source_links import (
     SourceCodeLinks_TEST_JSON_Decoder,
 )
+from src.extensions.score_source_code_linker.xml_manifest import (
+    load_xml_manifest,
+    manifest_test_cases,
+)
 from src.helper_lib import find_ws_root, get_github_base_url
 from src.helper_lib.additional_functions import get_github_link
 
@@ -492,11 +497,14 @@ def test_source_link_integration_ok(
             sphinx_base_dir / ".expected_codelink.json",
             needlink_test_decoder,
         )
-        compare_json_files(
-            app.outdir / "score_xml_parser_cache.json",
-            sphinx_base_dir / ".expected_testlink.json",
-            DataForTestLink_JSON_Decoder,
+        test_links = derive_test_links(
+            manifest_test_cases(
+                load_xml_manifest(app.outdir / "score_test_cases_cache.json")
+            )
         )
+        with open(sphinx_base_dir / ".expected_testlink.json") as f:
+            expected_test_links = json.load(f, object_hook=DataForTestLink_JSON_Decoder)
+        assert Counter(test_links) == Counter(expected_test_links)
         compare_grouped_json_files(
             app.outdir / "score_scl_grouped_cache.json",
             sphinx_base_dir / ".expected_grouped.json",
@@ -20,8 +20,7 @@ from src.extensions.score_source_code_linker.testlink import (
     DataForTestLink_JSON_Decoder,
     DataForTestLink_JSON_Encoder,
     DataOfTestCase,
-    load_test_xml_parsed_json,
-    store_test_xml_parsed_json,
+    derive_test_links,
 )
 
 
@@ -120,36 +119,44 @@ def test_testcaseneed_to_dict_multiple_links():
     test_type="requirements-based",
     derivation_technique="requirements-analysis",
 )
-def test_store_and_load_testlinks_roundtrip(tmp_path: Path):
-    """Ensure that Encode/Decode is reversible"""
-    file = tmp_path / "testlinks.json"
-
-    links = [
-        DataForTestLink(
+def test_derive_test_links():
+    """Ensure TestLinks are derived from all given testcases"""
+    test_cases = [
+        DataOfTestCase(
             name="L1",
-            file=Path("abc.py"),
-            line=1,
-            need="REQ_A",
-            verify_type="partially",
+            file="abc.py",
+            line="1",
             result="passed",
+            TestType="type",
+            DerivationTechnique="tech",
             result_text="Looks good",
+            PartiallyVerifies="REQ_A, REQ_C",
         ),
-        DataForTestLink(
+        DataOfTestCase(
             name="L2",
-            file=Path("def.py"),
-            line=2,
-            need="REQ_B",
-            verify_type="fully",
+            file="def.py",
+            line="2",
             result="failed",
+            TestType="type",
+            DerivationTechnique="tech",
             result_text="Needs work",
+            FullyVerifies="REQ_B",
         ),
     ]
 
-    store_test_xml_parsed_json(file, links)
-    assert file.exists()
+    links = derive_test_links(test_cases)
 
-    reloaded = load_test_xml_parsed_json(file)
-
-    assert reloaded == links
-    for link in reloaded:
-        assert isinstance(link, DataForTestLink)
+    assert [(link.name, link.need, link.verify_type) for link in links] == [
+        ("L1", "REQ_A", "partially"),
+        ("L1", "REQ_C", "partially"),
+        ("L2", "REQ_B", "fully"),
+    ]
+    assert links[2] == DataForTestLink(
+        name="L2",
+        file=Path("def.py"),
+        line=2,
+        need="REQ_B",
+        verify_type="fully",
+        result="failed",
+        result_text="Needs work",
+    )
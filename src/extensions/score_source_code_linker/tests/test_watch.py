@@ -0,0 +1,272 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+from attribute_plugin import add_test_properties
+
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+    cache_format_of,
+)
+from src.extensions.score_source_code_linker.need_source_links import (
+    load_source_code_links_combined_json,
+)
+from src.extensions.score_source_code_linker.needlinks import (
+    load_source_code_links_json,
+)
+from src.extensions.score_source_code_linker.watch import (
+    is_watched_path,
+    update_source_code_link_caches,
+    watch_source_code_links,
+    watched_paths,
+)
+
+# The package re-exports a function with the same name as this module,
+# so it has to be looked up explicitly.
+scan = importlib.import_module(
+    "src.extensions.score_source_code_linker.generate_source_code_links_json"
+)
+
+TAG = "#" + " req-Id:"
+
+
+def _write(root: Path, file: str, *needs: str):
+    (root / file).parent.mkdir(parents=True, exist_ok=True)
+    (root / file).write_text("".join(f"{TAG} {need}\n" for need in needs))
+
+
+@pytest.fixture(params=["plain", "git"])
+def workspace(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    root = tmp_path / "ws"
+    root.mkdir()
+    if request.param == "git":
+        subprocess.run(["git", "init"], cwd=root, check=True, capture_output=True)
+    _write(root, "src/a.py", "TREQ_ID_1")
+    _write(root, "src/b.py", "TREQ_ID_2")
+    _write(root, "src/old/c.py", "TREQ_ID_3")
+    _write(root, "docs/d.md", "TREQ_ID_1")
+    return root
+
+
+def _full_scan(root: Path, outdir: Path, cache_format: str = DEFAULT_CACHE_FORMAT):
+    scan.generate_source_code_links_json(
+        root,
+        outdir / "score_source_code_linker_cache.json",
+        workers=1,
+        index_file=outdir / "score_source_code_linker_file_index.json",
+        cache_format=cache_format,
+    )
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_changed_files_update_links_like_a_full_scan(workspace: Path, tmp_path: Path):
+    """Test that rescanning only changed files gives the links of a full scan"""
+    outdir = tmp_path / "_build"
+    assert not update_source_code_link_caches(workspace, outdir, [Path("src/a.py")])
+
+    _full_scan(workspace, outdir)
+    _write(workspace, "src/a.py", "TREQ_ID_4")
+    _write(workspace, "src/new/e.py", "TREQ_ID_5")
+    (workspace / "src/b.py").unlink()
+    (workspace / "src/old/c.py").unlink()
+    (workspace / "src/old").rmdir()
+
+    assert update_source_code_link_caches(
+        workspace,
+        outdir,
+        [Path("src/a.py"), Path("src/b.py"), Path("src/new"), Path("src/old")],
+    )
+    refreshed = load_source_code_links_json(
+        outdir / "score_source_code_linker_cache.json"
+    )
+    grouped = load_source_code_links_combined_json(
+        outdir / "score_scl_grouped_cache.json"
+    )
+
+    _full_scan(workspace, tmp_path / "full")
+    full = load_source_code_links_json(
+        tmp_path / "full" / "score_source_code_linker_cache.json"
+    )
+    assert sorted(refreshed) == sorted(full)
+    assert {
+        (scl.need, str(link.file)) for scl in grouped for link in scl.links.CodeLinks
+    } == {
+        ("TREQ_ID_1", "docs/d.md"),
+        ("TREQ_ID_4", "src/a.py"),
+        ("TREQ_ID_5", "src/new/e.py"),
+    }
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_changed_files_keep_the_cache_format_of_the_build(
+    workspace: Path, tmp_path: Path
+):
+    """Test that the watcher writes the caches in the format the build used"""
+    outdir = tmp_path / "_build"
+    _full_scan(workspace, outdir, cache_format="compact")
+    _write(workspace, "src/a.py", "TREQ_ID_4")
+
+    assert update_source_code_link_caches(workspace, outdir, [Path("src/a.py")])
+    for cache in [
+        "score_source_code_linker_cache.json",
+        "score_source_code_linker_file_index.json",
+        "score_scl_grouped_cache.json",
+    ]:
+        assert cache_format_of(outdir / cache) == "compact"
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_watcher_skips_unscanned_directories(tmp_path: Path):
+    """Test that build output, hidden and bazel directories are not watched"""
+    for directory in ["src", "docs", "_build", ".git", "bazel-out"]:
+        (tmp_path / directory).mkdir()
+    (tmp_path / "bazel-bin").symlink_to(tmp_path / "bazel-out")
+    (tmp_path / "linked").symlink_to(tmp_path / "src")
+
+    assert watched_paths(tmp_path) == [tmp_path / "docs", tmp_path / "src"]
+    assert is_watched_path(tmp_path, str(tmp_path / "src" / "a.py"))
+    assert not is_watched_path(tmp_path, str(tmp_path / "bazel-out" / "k8" / "c.py"))
+    assert not is_watched_path(tmp_path, str(tmp_path / "_build" / "cache.json"))
+    assert not is_watched_path(tmp_path, str(tmp_path / "src" / ".a.py.swp"))
+    assert not is_watched_path(tmp_path, "/somewhere/else.py")
+
+
+class FakeWatchfiles(ModuleType):
+    """
+    Stands in for 'watchfiles' and records what is watched. Every call to 'watch'
+    hands out the next scripted batches of changes for its kind of watch (through
+    the filter), then blocks until it is stopped.
+    """
+
+    def __init__(
+        self, batches: dict[bool, list[list[Callable[[], set[tuple[int, str]]]]]]
+    ):
+        super().__init__("watchfiles")
+        self.batches = batches
+        self.calls: list[tuple[list[Path], bool]] = []
+        self.on_exhausted: Callable[[], None] = lambda: None
+
+    def watch(
+        self,
+        *paths: Path,
+        watch_filter: Callable[[int, str], bool],
+        stop_event: threading.Event,
+        recursive: bool = True,
+    ) -> Iterator[set[tuple[int, str]]]:
+        self.calls.append((list(paths), recursive))
+        scripted = self.batches[recursive]
+        if not scripted:
+            self.on_exhausted()
+        for batch in scripted.pop(0) if scripted else []:
+            yield {(c, path) for c, path in batch() if watch_filter(c, path)}
+        while not stop_event.is_set():
+            time.sleep(0.01)
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_watch_loop_watches_top_level_entries_and_new_ones(
+    workspace: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test what is watched, and that a new top-level directory gets scanned"""
+    outdir = tmp_path / "_build"
+    _full_scan(workspace, outdir)
+    (workspace / "_build").mkdir()
+    (workspace / "bazel-out").mkdir()
+    (workspace / "bazel-bin").symlink_to(workspace / "bazel-out")
+    _write(workspace, "src/a.py", "TREQ_ID_4")
+    updated = threading.Event()
+
+    added, modified = 1, 2
+
+    def modify_a():
+        return {
+            (modified, str(workspace / "src" / "a.py")),
+            (modified, str(workspace / "bazel-out" / "x.py")),
+        }
+
+    def create_new():
+        # After the first update, so the new directory is not watched from start
+        assert updated.wait(timeout=10)
+        _write(workspace, "new/e.py", "TREQ_ID_5")
+        return {
+            (added, str(workspace / "bazel-new")),
+            (added, str(workspace / "new")),
+        }
+
+    watchfiles = FakeWatchfiles(
+        {
+            # The top-level entries, recursively
+            True: [[modify_a]],
+            # The workspace root only
+            False: [[create_new]],
+        }
+    )
+    stop_event = threading.Event()
+    watchfiles.on_exhausted = stop_event.set
+    monkeypatch.setitem(sys.modules, "watchfiles", watchfiles)
+    updates: list[int] = []
+
+    def on_update():
+        updates.append(1)
+        updated.set()
+
+    watch_source_code_links(workspace, outdir, on_update, stop_event=stop_event)
+
+    recursive = [paths for paths, is_recursive in watchfiles.calls if is_recursive]
+    assert recursive[0] == [workspace / "docs", workspace / "src"]
+    assert recursive[1] == [workspace / "docs", workspace / "new", workspace / "src"]
+    assert ([workspace], False) in watchfiles.calls
+    assert len(updates) == 2
+    links = load_source_code_links_json(outdir / "score_source_code_linker_cache.json")
+    assert {(str(link.file), link.need) for link in links} == {
+        ("docs/d.md", "TREQ_ID_1"),
+        ("new/e.py", "TREQ_ID_5"),
+        ("src/a.py", "TREQ_ID_4"),
+        ("src/b.py", "TREQ_ID_2"),
+        ("src/old/c.py", "TREQ_ID_3"),
+    }
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_dd_link_source_code_link"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_tag_matcher_from_tags():
+    """Test that a matcher can be rebuilt from the tags stored in a file index"""
+    matcher = scan.TagMatcher(["req-Id:", "req-traceability:"], ["#", "//"])
+    assert scan.TagMatcher.from_tags(matcher.tags).tags == matcher.tags
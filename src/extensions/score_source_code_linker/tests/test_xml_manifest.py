@@ -0,0 +1,169 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from attribute_plugin import add_test_properties
+
+from src.extensions.score_source_code_linker import xml_parser
+from src.extensions.score_source_code_linker.file_index import file_digest
+from src.extensions.score_source_code_linker.testlink import DataOfTestCase
+from src.extensions.score_source_code_linker.xml_manifest import (
+    XML_MANIFEST_VERSION,
+    XmlManifestEntry,
+    load_xml_manifest,
+    store_xml_manifest,
+)
+
+
+def _write_test_xml(file: Path, testcase: str):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(
+        "<testsuites><testsuite>"
+        f"<testcase name='{testcase}' file='f.py' line='1'>"
+        "<properties>"
+        "<property name='PartiallyVerifies' value='REQ1'/>"
+        "<property name='FullyVerifies' value=''/>"
+        "<property name='TestType' value='type'/>"
+        "<property name='DerivationTechnique' value='tech'/>"
+        "</properties>"
+        "</testcase>"
+        "</testsuite></testsuites>"
+    )
+
+
+def _bump_mtime(file: Path):
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def testlogs(tmp_path: Path) -> Path:
+    root = tmp_path / "bazel-testlogs"
+    _write_test_xml(root / "a" / "test.xml", "tc_a")
+    _write_test_xml(root / "b" / "test.xml", "tc_b")
+    return root
+
+
+@pytest.fixture
+def parsed_files(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Records every test.xml that actually gets parsed."""
+    seen: list[Path] = []
+    original = xml_parser.read_test_xml_file
+
+    def _recording(
+        file: Path, on_chunk: Callable[[bytes], object] | None = None
+    ) -> tuple[list[DataOfTestCase], list[str]]:
+        seen.append(file)
+        return original(file, on_chunk)
+
+    monkeypatch.setattr(xml_parser, "read_test_xml_file", _recording)
+    return seen
+
+
+def _build(testlogs: Path, manifest_file: Path, monkeypatch) -> list[str]:
+    monkeypatch.setattr(xml_parser, "construct_and_add_need", lambda *args: None)
+    tcns = xml_parser.build_test_needs_from_files(
+        None,  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        xml_parser.find_xml_files(testlogs),
+        None,  # type: ignore[arg-type]
+        workers=1,
+        manifest_file=manifest_file,
+    )
+    return [tcn.name for tcn in tcns]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_test_link_testcase"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_xml_manifest_roundtrip(tmp_path: Path):
+    """Test storing and loading the test.xml manifest"""
+    manifest = {
+        "/logs/a/test.xml": XmlManifestEntry(
+            mtime_ns=1,
+            size=2,
+            digest="abc",
+            test_cases=[
+                DataOfTestCase(
+                    name="tc_a",
+                    file="f.py",
+                    line="1",
+                    result="passed",
+                    TestType="type",
+                    DerivationTechnique="tech",
+                    PartiallyVerifies="REQ1",
+                )
+            ],
+            non_prop_tests=["tc_no_props"],
+        )
+    }
+    manifest_file = tmp_path / "manifest.json"
+    store_xml_manifest(manifest_file, manifest)
+    assert load_xml_manifest(manifest_file) == manifest
+
+    manifest_file.write_text(
+        json.dumps({"version": XML_MANIFEST_VERSION + 1, "files": {}})
+    )
+    assert load_xml_manifest(manifest_file) == {}
+    manifest_file.write_text('{"version": 1, "fil')
+    assert load_xml_manifest(manifest_file) == {}
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_test_link_testcase"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_only_changed_test_xml_files_are_parsed(
+    testlogs: Path, tmp_path: Path, parsed_files: list[Path], monkeypatch
+):
+    """Test that unchanged test.xml files are taken from the manifest"""
+    manifest_file = tmp_path / "_build" / "manifest.json"
+    assert _build(testlogs, manifest_file, monkeypatch) == ["tc_a", "tc_b"]
+    assert len(parsed_files) == 2
+
+    parsed_files.clear()
+    assert _build(testlogs, manifest_file, monkeypatch) == ["tc_a", "tc_b"]
+    assert parsed_files == []
+
+    # Rewritten with the same content (e.g. test re-ran) => digest still matches
+    _write_test_xml(testlogs / "a" / "test.xml", "tc_a")
+    _bump_mtime(testlogs / "a" / "test.xml")
+    assert _build(testlogs, manifest_file, monkeypatch) == ["tc_a", "tc_b"]
+    assert parsed_files == []
+
+    # Changed, new and removed test targets
+    _write_test_xml(testlogs / "a" / "test.xml", "tc_a_renamed")
+    _bump_mtime(testlogs / "a" / "test.xml")
+    _write_test_xml(testlogs / "c" / "test.xml", "tc_c")
+    (testlogs / "b" / "test.xml").unlink()
+    assert _build(testlogs, manifest_file, monkeypatch) == ["tc_a_renamed", "tc_c"]
+    assert sorted(parsed_files) == [
+        testlogs / "a" / "test.xml",
+        testlogs / "c" / "test.xml",
+    ]
+    manifest = load_xml_manifest(manifest_file)
+    assert sorted(manifest) == [
+        str(testlogs / "a" / "test.xml"),
+        str(testlogs / "c" / "test.xml"),
+    ]
+    # Computed while parsing, but the same as hashing the file on its own
+    assert all(
+        entry.digest == file_digest(Path(file)) for file, entry in manifest.items()
+    )
@@ -175,3 +175,96 @@ def test_short_hash_consistency_and_format():
     assert h1 == h2
     assert h1.isalpha()
     assert len(h1) == 5
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_test_link_testcase"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_streaming_parser_skips_output_payloads(tmp_path: Path, monkeypatch):
+    """Ensure testcases are streamed and system-out/err payloads are dropped"""
+    monkeypatch.setattr(xml_parser, "XML_READ_CHUNK_SIZE", 16)
+    xml_file = tmp_path / "test.xml"
+    xml_file.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        "<testsuites><testsuite>"
+        "<testcase name='a' file='f.py' line='3'>"
+        "<failure message='boom'/>"
+        "<system-out><nested>" + "x" * 1000 + "</nested></system-out>"
+        "<properties>"
+        "<property name='PartiallyVerifies' value='REQ1'/>"
+        "<property name='FullyVerifies' value=''/>"
+        "<property name='TestType' value='type'/>"
+        "<property name='DerivationTechnique' value='tech'/>"
+        "</properties>"
+        "</testcase>"
+        "<system-err>" + "y" * 1000 + "</system-err>"
+        "<testcase name='b'/>"
+        "</testsuite></testsuites>"
+    )
+
+    testcases = list(xml_parser.iter_testcase_elements(xml_file))
+    assert [tc.get("name") for tc in testcases] == ["a", "b"]
+    assert [child.tag for child in testcases[0]] == ["failure", "properties"]
+
+    needs, no_props = xml_parser.read_test_xml_file(xml_file)
+    assert [(n.name, n.result, n.result_text) for n in needs] == [
+        ("a", "failed", "boom")
+    ]
+    assert no_props == ["b"]
+
+
+@add_test_properties(
+    partially_verifies=["tool_req__docs_test_link_testcase"],
+    test_type="requirements-based",
+    derivation_technique="requirements-analysis",
+)
+def test_parallel_parsing_matches_serial(tmp_path: Path, monkeypatch):
+    """Ensure parallel parsing yields the same results in sorted path order"""
+    monkeypatch.setattr(xml_parser, "XML_PARSE_CHUNK_SIZE", 2)
+    properties = "".join(
+        f"<property name='{name}' value='{value}'/>"
+        for name, value in [
+            ("PartiallyVerifies", "REQ1"),
+            ("FullyVerifies", ""),
+            ("TestType", "type"),
+            ("DerivationTechnique", "tech"),
+        ]
+    )
+    for i in range(7):
+        target = tmp_path / f"target_{i}"
+        target.mkdir()
+        (target / "test.xml").write_text(
+            "<testsuites><testsuite>"
+            f"<testcase name='tc_{i}' file='f.py' line='{i}'>"
+            f"<properties>{properties}</properties>"
+            "</testcase>"
+            f"<testcase name='tc_{i}_no_props'/>"
+            "</testsuite></testsuites>"
+        )
+    xml_paths = sorted(xml_parser.find_xml_files(tmp_path))
+
+    serial = xml_parser.parse_test_xml_files(xml_paths, workers=1)
+    parallel = xml_parser.parse_test_xml_files(xml_paths, workers=3)
+    assert parallel == serial
+    assert [no_props for _, no_props in parallel] == [
+        [f"tc_{i}_no_props"] for i in range(7)
+    ]
+
+    # Needs are added in the main process, in sorted path order
+    added: list[str] = []
+    monkeypatch.setattr(
+        xml_parser,
+        "construct_and_add_need",
+        lambda app, tn, repo: added.append(tn.name),
+    )
+    tcns = xml_parser.build_test_needs_from_files(
+        None,  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        list(reversed(xml_paths)),
+        None,  # type: ignore[arg-type]
+        workers=3,
+    )
+    assert added == [f"tc_{i}" for i in range(7)]
+    assert [tcn.name for tcn in tcns] == added
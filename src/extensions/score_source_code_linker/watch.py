@@ -0,0 +1,211 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Keeps the source code links up to date while 'live_preview' is running.
+
+incremental.py runs 'watch_source_code_links' next to sphinx-autobuild. The OS
+reports changed files (inotify on Linux, via 'watchfiles'), only those are
+rescanned. The code link cache, the file index and the grouped cache are updated
+in place, and the Sphinx build triggered afterwards picks them up, as
+'skip_rescanning_via_source_code_linker' is set during 'live_preview'.
+"""
+
+# req-Id: tool_req__docs_dd_link_source_code_link
+
+import threading
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from src.extensions.score_source_code_linker import build_and_save_combined_file
+from src.extensions.score_source_code_linker.cache_format import cache_format_of
+from src.extensions.score_source_code_linker.generate_source_code_links_json import (
+    SKIPPED_DIR_PREFIXES,
+    refresh_source_code_links,
+)
+
+
+def is_watched_path(ws_root: Path, path: str) -> bool:
+    """
+    Changes below directories that are never scanned (e.g. '_build', '.git' or
+    'bazel-out') are ignored, everything else is checked by the rescan.
+    """
+    try:
+        relative = Path(path).relative_to(ws_root)
+    except ValueError:
+        return False
+    return not any(part.startswith(SKIPPED_DIR_PREFIXES) for part in relative.parts)
+
+
+def watched_paths(ws_root: Path) -> list[Path]:
+    """
+    The entries of the workspace root that are watched (recursively).
+    Skipped directories are left out instead of being filtered, so that no
+    watches are set up for the (huge) 'bazel-*' trees.
+    """
+    return sorted(
+        entry
+        for entry in ws_root.iterdir()
+        if not entry.name.startswith(SKIPPED_DIR_PREFIXES) and not entry.is_symlink()
+    )
+
+
+def update_source_code_link_caches(
+    ws_root: Path,
+    outdir: Path,
+    changed: list[Path],
+    cache_format: str | None = None,
+) -> bool:
+    """
+    Rescan the 'changed' files (relative to 'ws_root') and rebuild the grouped
+    cache. Returns False if nothing was updated, because no build has written
+    the caches for 'ws_root' yet.
+    Without a 'cache_format', the caches keep the format the build wrote them in,
+    which is the configured 'source_code_linker_cache_format'.
+    """
+    cache = outdir / "score_source_code_linker_cache.json"
+    if cache_format is None:
+        cache_format = cache_format_of(cache)
+    if not refresh_source_code_links(
+        ws_root,
+        cache,
+        outdir / "score_source_code_linker_file_index.json",
+        changed,
+        cache_format=cache_format,
+    ):
+        return False
+    build_and_save_combined_file(outdir, cache_format)
+    return True
+
+
+class _AnyEvent:
+    """Counts as set once any of 'events' is set, used as stop_event of watchfiles."""
+
+    def __init__(self, *events: threading.Event):
+        self._events = events
+
+    def is_set(self) -> bool:
+        return any(event.is_set() for event in self._events)
+
+
+def _wait_for_new_entries(
+    ws_root: Path,
+    known: set[Path],
+    found: threading.Event,
+    stop_event: threading.Event,
+):
+    """
+    Watch 'ws_root' itself (not recursively) and set 'found' once an entry
+    appears that is not 'known' yet and would be watched.
+    """
+    import watchfiles
+
+    def is_new_entry(_change: object, path: str) -> bool:
+        entry = Path(path)
+        return (
+            entry not in known
+            and is_watched_path(ws_root, path)
+            and not entry.is_symlink()
+        )
+
+    for _ in watchfiles.watch(
+        ws_root,
+        watch_filter=is_new_entry,
+        stop_event=_AnyEvent(stop_event, found),
+        recursive=False,
+    ):
+        found.set()
+
+
+def _apply_changes(
+    ws_root: Path,
+    outdir: Path,
+    on_update: Callable[[], None],
+    changed: list[Path],
+    cache_format: str | None,
+):
+    if update_source_code_link_caches(ws_root, outdir, changed, cache_format):
+        print(f"Source code linker: updated links of {len(changed)} changed files")
+        on_update()
+
+
+def watch_source_code_links(
+    ws_root: Path,
+    outdir: Path,
+    on_update: Callable[[], None],
+    stop_event: threading.Event | None = None,
+    cache_format: str | None = None,
+):
+    """
+    Update the caches in 'outdir' whenever files below 'ws_root' change, and call
+    'on_update' afterwards. Blocks until 'stop_event' is set.
+    Only the 'watched_paths' are watched recursively. 'ws_root' itself is watched
+    without its subdirectories, a new entry there is scanned and then watched too.
+    """
+    # Only needed during live_preview, it is installed with sphinx-autobuild
+    import watchfiles
+
+    stop_event = stop_event or threading.Event()
+    paths = watched_paths(ws_root)
+    while not stop_event.is_set():
+        found = threading.Event()
+        root_watcher = threading.Thread(
+            target=partial(
+                _wait_for_new_entries, ws_root, set(paths), found, stop_event
+            ),
+            name="source_code_link_root_watcher",
+            daemon=True,
+        )
+        root_watcher.start()
+        if paths:
+            for changes in watchfiles.watch(
+                *paths,
+                watch_filter=lambda _change, path: is_watched_path(ws_root, path),
+                stop_event=_AnyEvent(stop_event, found),
+            ):
+                changed = sorted(
+                    {Path(path).relative_to(ws_root) for _, path in changes}
+                )
+                _apply_changes(ws_root, outdir, on_update, changed, cache_format)
+        root_watcher.join()
+        if stop_event.is_set():
+            break
+        new_paths = watched_paths(ws_root)
+        added = sorted(
+            entry.relative_to(ws_root) for entry in set(new_paths) - set(paths)
+        )
+        if added:
+            _apply_changes(ws_root, outdir, on_update, added, cache_format)
+        paths = new_paths
+
+
+def start_watching(
+    ws_root: Path,
+    outdir: Path,
+    on_update: Callable[[], None],
+    cache_format: str | None = None,
+) -> threading.Thread:
+    """Run 'watch_source_code_links' in a daemon thread, it ends with the process."""
+    thread = threading.Thread(
+        target=partial(
+            watch_source_code_links,
+            ws_root,
+            outdir,
+            on_update,
+            cache_format=cache_format,
+        ),
+        name="source_code_link_watcher",
+        daemon=True,
+    )
+    thread.start()
+    return thread
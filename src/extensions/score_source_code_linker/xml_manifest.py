@@ -0,0 +1,124 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+This file defines the persistent manifest of parsed test.xml files.
+For every test.xml it remembers the fingerprint (mtime, size, digest) together
+with the testcases parsed out of it. Bazel only rewrites the test.xml of tests
+that actually ran, so on the next build only those have to be parsed again.
+
+The manifest is the only cache of testcases. Every testcase is stored once,
+the TestLinks are derived from it when needed.
+"""
+
+# req-Id: tool_req__docs_test_link_testcase
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
+    InvalidCacheError,
+    dump_cache,
+    load_cache,
+)
+from src.extensions.score_source_code_linker.testlink import (
+    DataOfTestCase,
+    DataOfTestCase_JSON_Decoder,
+    DataOfTestCase_JSON_Encoder,
+)
+
+# Bump this whenever the layout of the manifest or of DataOfTestCase changes.
+# Manifests with a different version are discarded and rebuilt.
+XML_MANIFEST_VERSION = 1
+
+
+@dataclass
+class XmlManifestEntry:
+    mtime_ns: int
+    size: int
+    digest: str
+    test_cases: list[DataOfTestCase] = field(default_factory=list)
+    # Names of testcases without properties, only kept to log them again
+    non_prop_tests: list[str] = field(default_factory=list)
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+
+# Keys are the paths of the test.xml files, as strings.
+XmlManifest = dict[str, XmlManifestEntry]
+
+
+class XmlManifestEncoder(DataOfTestCase_JSON_Encoder):
+    def default(self, o: object):
+        if isinstance(o, XmlManifestEntry):
+            return {
+                "mtime_ns": o.mtime_ns,
+                "size": o.size,
+                "digest": o.digest,
+                "test_cases": o.test_cases,
+                "non_prop_tests": o.non_prop_tests,
+            }
+        return super().default(o)
+
+
+def xml_manifest_decoder(
+    d: dict[str, Any],
+) -> XmlManifestEntry | DataOfTestCase | dict[str, Any]:
+    if {"mtime_ns", "size", "digest", "test_cases", "non_prop_tests"} <= d.keys():
+        return XmlManifestEntry(
+            mtime_ns=d["mtime_ns"],
+            size=d["size"],
+            digest=d["digest"],
+            test_cases=d["test_cases"],
+            non_prop_tests=d["non_prop_tests"],
+        )
+    return DataOfTestCase_JSON_Decoder(d)
+
+
+def manifest_test_cases(manifest: XmlManifest) -> list[DataOfTestCase]:
+    """All testcases of the manifest, in sorted order of their test.xml paths."""
+    return [tc for key in sorted(manifest) for tc in manifest[key].test_cases]
+
+
+def store_xml_manifest(
+    file: Path, manifest: XmlManifest, cache_format: str = DEFAULT_CACHE_FORMAT
+):
+    dump_cache(
+        file,
+        {"version": XML_MANIFEST_VERSION, "files": manifest},
+        XmlManifestEncoder,
+        cache_format,
+    )
+
+
+def load_xml_manifest(file: Path) -> XmlManifest:
+    """
+    Load the manifest written by a previous run.
+    Returns an empty manifest if there is none, if it is corrupt or if it was
+    written by another version, as none of its entries can be trusted then.
+    """
+    try:
+        data = load_cache(file, object_hook=xml_manifest_decoder)
+    except (InvalidCacheError, json.JSONDecodeError, TypeError, KeyError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != XML_MANIFEST_VERSION:
+        return {}
+    manifest: XmlManifest = data["files"]
+    assert all(isinstance(entry, XmlManifestEntry) for entry in manifest.values()), (
+        "All items in the test.xml manifest should be XmlManifestEntry objects."
+    )
+    return manifest
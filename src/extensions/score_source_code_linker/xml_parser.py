@@ -21,9 +21,10 @@ linking to requirements &gathering statistics
 import base64
 import contextlib
 import hashlib
-import itertools
 import os
 import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 from xml.etree.ElementTree import Element
@@ -33,12 +34,21 @@ from sphinx.environment import BuildEnvironment
 from sphinx_needs import logging
 from sphinx_needs.api import add_external_need
 
-from src.extensions.score_source_code_linker.testlink import (
-    DataOfTestCase,
-    store_data_of_test_case_json,
-    store_test_xml_parsed_json,
+from src.extensions.score_source_code_linker.cache_format import (
+    DEFAULT_CACHE_FORMAT,
 )
-from src.helper_lib import find_ws_root
+from src.extensions.score_source_code_linker.file_index import (
+    DIGEST_ALGORITHM,
+    file_digest,
+)
+from src.extensions.score_source_code_linker.testlink import DataOfTestCase
+from src.extensions.score_source_code_linker.xml_manifest import (
+    XmlManifest,
+    XmlManifestEntry,
+    load_xml_manifest,
+    store_xml_manifest,
+)
+from src.helper_lib import RepoContext, find_ws_root
 from src.helper_lib.additional_functions import get_github_link
 
 logger = logging.get_logger(__name__)
@@ -87,9 +97,90 @@ def parse_properties(case_properties: dict[str, Any], properties: Element):
     return case_properties
 
 
-def read_test_xml_file(file: Path) -> tuple[list[DataOfTestCase], list[str]]:
+class _TestCaseCollector:
+    """
+    XMLParser target that only builds the <testcase> elements of each <testsuite>
+    and hands them out as soon as they are closed.
+    Nothing else is kept in memory. The content of <system-out>/<system-err>,
+    which can be huge and is never used, is dropped while parsing.
+    """
+
+    SKIPPED_PAYLOADS = ("system-out", "system-err")
+
+    def __init__(self):
+        self.closed: list[Element] = []
+        self._path: list[str] = []
+        self._builder: ET.TreeBuilder | None = None
+        # Depth inside of a skipped payload element, 0 if outside
+        self._skip_depth = 0
+
+    def start(self, tag: str, attrib: dict[str, str]):
+        self._path.append(tag)
+        if self._builder is None:
+            # Same structure as before: <root><testsuite><testcase>
+            if not (
+                len(self._path) == 3
+                and self._path[1] == "testsuite"
+                and tag == "testcase"
+            ):
+                return
+            self._builder = ET.TreeBuilder()
+        if self._skip_depth or tag in self.SKIPPED_PAYLOADS:
+            self._skip_depth += 1
+            return
+        self._builder.start(tag, attrib)
+
+    def end(self, tag: str):
+        self._path.pop()
+        if self._builder is None:
+            return
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        self._builder.end(tag)
+        if len(self._path) == 2:
+            self.closed.append(self._builder.close())
+            self._builder = None
+
+    def data(self, data: str):
+        if self._builder is not None and not self._skip_depth:
+            self._builder.data(data)
+
+    def close(self):
+        return None
+
+
+# Bytes read from a test.xml at once while streaming through it
+XML_READ_CHUNK_SIZE = 64 * 1024
+
+
+def iter_testcase_elements(
+    file: Path, on_chunk: Callable[[bytes], object] | None = None
+) -> Iterator[Element]:
+    """
+    Stream through a test.xml and yield every <testcase> element once it is
+    closed. Memory usage does not depend on the size of the file.
+    Every chunk read is also passed to 'on_chunk', e.g. to hash the file.
+    """
+    collector = _TestCaseCollector()
+    parser = ET.XMLParser(target=collector)
+    with open(file, "rb") as f:
+        while chunk := f.read(XML_READ_CHUNK_SIZE):
+            if on_chunk is not None:
+                on_chunk(chunk)
+            parser.feed(chunk)
+            closed, collector.closed = collector.closed, []
+            yield from closed
+    parser.close()
+    yield from collector.closed
+
+
+def read_test_xml_file(
+    file: Path, on_chunk: Callable[[bytes], object] | None = None
+) -> tuple[list[DataOfTestCase], list[str]]:
     """
     Reading & parsing the test.xml files into TestCaseNeeds
+    'on_chunk' is passed on to 'iter_testcase_elements'.
 
     Returns:
         tuple consisting of:
@@ -98,55 +189,52 @@ def read_test_xml_file(file: Path) -> tuple[list[DataOfTestCase], list[str]]:
     """
     test_case_needs: list[DataOfTestCase] = []
     non_prop_tests: list[str] = []
-    tree = ET.parse(file)
-    root = tree.getroot()
-
-    for testsuite in root.findall("testsuite"):
-        for testcase in testsuite.findall("testcase"):
-            case_properties = {}
-            testname = testcase.get("name")
-            assert testname is not None, (
-                f"Testcase: {testcase} does not have a 'name' attribute. "
-                "This is mandatory. This should not happen, something is wrong."
-            )
-            test_file = testcase.get("file")
-            line = testcase.get("line")
-
-            #          ╭──────────────────────────────────────╮
-            #          │   Assert worldview that mandatory    │
-            #          │      things are actually there       │
-            #          │         Disabled temporarily         │
-            #          ╰──────────────────────────────────────╯
-
-            # assert test_file is not None, (
-            #     f"Testcase: {testname} does not have a 'file' attribute. This is mandatory"
-            # )
-            # assert lineNr is not None, (
-            #     f"Testcase: {testname} located in {test_file} does not have a 'lineNr' attribute. This is mandator"
-            # )
-            case_properties["name"] = testname
-            case_properties["file"] = test_file
-            case_properties["line"] = line
-            case_properties["result"], case_properties["result_text"] = (
-                parse_testcase_result(testcase)
-            )
 
-            properties_element = testcase.find("properties")
-            # HINT: This list is hard coded here, might not be ideal to have that in the
-            # long run.
-            if properties_element is None:
-                non_prop_tests.append(testname)
-                continue
-
-            # ╓                                      ╖
-            # ║ Disabled Temporarily                 ║
-            # ╙                                      ╜
-            # assert properties_element is not None, (
-            #     f"Testcase: {testname} located in {test_file}:{lineNr}, does not have any properties. Properties 'TestType', 'DerivationTechnique' and either 'PartiallyVerifies' or 'FullyVerifies' are mandatory."
-            # )
-
-            case_properties = parse_properties(case_properties, properties_element)
-            test_case_needs.append(DataOfTestCase.from_dict(case_properties))
+    for testcase in iter_testcase_elements(file, on_chunk):
+        case_properties = {}
+        testname = testcase.get("name")
+        assert testname is not None, (
+            f"Testcase: {testcase} does not have a 'name' attribute. "
+            "This is mandatory. This should not happen, something is wrong."
+        )
+        test_file = testcase.get("file")
+        line = testcase.get("line")
+
+        #          ╭──────────────────────────────────────╮
+        #          │   Assert worldview that mandatory    │
+        #          │      things are actually there       │
+        #          │         Disabled temporarily         │
+        #          ╰──────────────────────────────────────╯
+
+        # assert test_file is not None, (
+        #     f"Testcase: {testname} does not have a 'file' attribute. This is mandatory"
+        # )
+        # assert lineNr is not None, (
+        #     f"Testcase: {testname} located in {test_file} does not have a 'lineNr' attribute. This is mandator"
+        # )
+        case_properties["name"] = testname
+        case_properties["file"] = test_file
+        case_properties["line"] = line
+        case_properties["result"], case_properties["result_text"] = (
+            parse_testcase_result(testcase)
+        )
+
+        properties_element = testcase.find("properties")
+        # HINT: This list is hard coded here, might not be ideal to have that in the
+        # long run.
+        if properties_element is None:
+            non_prop_tests.append(testname)
+            continue
+
+        # ╓                                      ╖
+        # ║ Disabled Temporarily                 ║
+        # ╙                                      ╜
+        # assert properties_element is not None, (
+        #     f"Testcase: {testname} located in {test_file}:{lineNr}, does not have any properties. Properties 'TestType', 'DerivationTechnique' and either 'PartiallyVerifies' or 'FullyVerifies' are mandatory."
+        # )
+
+        case_properties = parse_properties(case_properties, properties_element)
+        test_case_needs.append(DataOfTestCase.from_dict(case_properties))
     return test_case_needs, non_prop_tests
 
 
@@ -167,7 +255,7 @@ def find_xml_files(dir: Path) -> list[Path]:
     return xml_paths
 
 
-def run_xml_parser(app: Sphinx, env: BuildEnvironment):
+def run_xml_parser(app: Sphinx, env: BuildEnvironment, repo: RepoContext):
     """
     This is the 'main' function for parsing test.xml's and
     building testcase needs.
@@ -177,38 +265,174 @@ def run_xml_parser(app: Sphinx, env: BuildEnvironment):
     assert ws_root is not None
     bazel_testlogs = ws_root / "bazel-testlogs"
     xml_file_paths = find_xml_files(bazel_testlogs)
-    test_case_needs = build_test_needs_from_files(app, env, xml_file_paths)
-    # Saving the test case needs for cache
-    store_data_of_test_case_json(
-        app.outdir / "score_testcaseneeds_cache.json", test_case_needs
+    # The manifest is the only cache of the parsed testcases. Test links are
+    # derived from it when the combined cache is built.
+    build_test_needs_from_files(
+        app,
+        env,
+        xml_file_paths,
+        repo,
+        app.config.source_code_linker_xml_workers,
+        app.outdir / "score_test_cases_cache.json",
+        app.config.source_code_linker_cache_format,
     )
-    output = list(
-        itertools.chain.from_iterable(tcn.get_test_links() for tcn in test_case_needs)
+
+
+# Number of test.xml files handed to a worker process at once.
+# Most test.xml files are tiny, so sending them one by one would mostly measure
+# the inter process communication.
+XML_PARSE_CHUNK_SIZE = 32
+
+
+def _read_test_xml_files(
+    files: list[Path],
+) -> list[tuple[list[DataOfTestCase], list[str]]]:
+    return [read_test_xml_file(f) for f in files]
+
+
+def _digest_and_read_test_xml_files(
+    files: list[Path],
+) -> list[tuple[str, tuple[list[DataOfTestCase], list[str]]]]:
+    results: list[tuple[str, tuple[list[DataOfTestCase], list[str]]]] = []
+    for f in files:
+        # Hashed while parsing, so the file is read only once
+        digest = hashlib.new(DIGEST_ALGORITHM)
+        parsed = read_test_xml_file(f, digest.update)
+        results.append((digest.hexdigest(), parsed))
+    return results
+
+
+def _map_in_chunks[T](
+    read_files: Callable[[list[Path]], list[T]],
+    xml_paths: list[Path],
+    workers: int | None,
+) -> list[T]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(xml_paths) <= XML_PARSE_CHUNK_SIZE:
+        return read_files(xml_paths)
+
+    chunks = [
+        xml_paths[i : i + XML_PARSE_CHUNK_SIZE]
+        for i in range(0, len(xml_paths), XML_PARSE_CHUNK_SIZE)
+    ]
+    results: list[T] = []
+    # 'map' yields results in submission order, so the merged list is
+    # deterministic no matter which worker finishes first.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for parsed in executor.map(read_files, chunks):
+            results.extend(parsed)
+    return results
+
+
+def parse_test_xml_files(
+    xml_paths: list[Path], workers: int | None = None
+) -> list[tuple[list[DataOfTestCase], list[str]]]:
+    """
+    Parse the given test.xml files, in parallel if more than one chunk is passed.
+
+    Returns:
+        - list[tuple[list[DataOfTestCase], list[str]]] => Result of
+          'read_test_xml_file' for each file, in the order of 'xml_paths'.
+    """
+    return _map_in_chunks(_read_test_xml_files, xml_paths, workers)
+
+
+def digest_and_parse_test_xml_files(
+    xml_paths: list[Path], workers: int | None = None
+) -> list[tuple[str, tuple[list[DataOfTestCase], list[str]]]]:
+    """
+    Same as 'parse_test_xml_files', but also returns the 'file_digest' of each
+    file, computed from the bytes read for parsing.
+    """
+    return _map_in_chunks(_digest_and_read_test_xml_files, xml_paths, workers)
+
+
+def update_xml_manifest(
+    xml_paths: list[Path], manifest: XmlManifest, workers: int | None = None
+) -> XmlManifest:
+    """
+    Bring the manifest up to date with the test.xml files currently on disk.
+    Only new files and files whose fingerprint changed are parsed again.
+    A file whose mtime changed but whose size and digest did not keeps its entry.
+    The digest of parsed files is computed while parsing them.
+    Files that no longer exist (e.g. removed test targets) are dropped.
+    """
+    new_manifest: XmlManifest = {}
+    stale: list[Path] = []
+    for file in xml_paths:
+        key = str(file)
+        stat = file.stat()
+        entry = manifest.get(key)
+        if entry is not None and not entry.matches(stat):
+            # Only a file of the same size can still have the same content
+            if entry.size == stat.st_size and entry.digest == file_digest(file):
+                entry.mtime_ns = stat.st_mtime_ns
+            else:
+                entry = None
+        if entry is None:
+            new_manifest[key] = XmlManifestEntry(
+                mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=""
+            )
+            stale.append(file)
+        else:
+            new_manifest[key] = entry
+
+    for file, (digest, (test_cases, non_prop_tests)) in zip(
+        stale, digest_and_parse_test_xml_files(stale, workers), strict=True
+    ):
+        new_manifest[str(file)].digest = digest
+        new_manifest[str(file)].test_cases = test_cases
+        new_manifest[str(file)].non_prop_tests = non_prop_tests
+    logger.debug(
+        f"DEBUG: Parsed {len(stale)} of {len(xml_paths)} test.xml files, "
+        f"{len(xml_paths) - len(stale)} were unchanged."
     )
-    # This is not ideal, due to duplication, but I can't think of a better solution
-    # right now
-    store_test_xml_parsed_json(app.outdir / "score_xml_parser_cache.json", output)
+    return new_manifest
 
 
 def build_test_needs_from_files(
-    app: Sphinx, env: BuildEnvironment, xml_paths: list[Path]
+    app: Sphinx,
+    env: BuildEnvironment,
+    xml_paths: list[Path],
+    repo: RepoContext,
+    workers: int | None = None,
+    manifest_file: Path | None = None,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
 ) -> list[DataOfTestCase]:
     """
     Reading in all test.xml files, and building 'testcase' external need objects out of
     them.
+    Parsing is spread over 'workers' processes, the needs themselves are added
+    here in the Sphinx process, in sorted order of the test.xml paths.
+    If 'manifest_file' is given, only test.xml files that changed since the last
+    run are parsed, all others are taken from the manifest.
+    The links of all testcases point to 'repo', resolved once per build.
 
     Returns:
         - list[TestCaseNeed]
     """
     tcns: list[DataOfTestCase] = []
-    for f in xml_paths:
-        b, z = read_test_xml_file(f)
+    xml_paths = sorted(xml_paths)
+    if manifest_file is None:
+        parsed = parse_test_xml_files(xml_paths, workers)
+    else:
+        manifest = update_xml_manifest(
+            xml_paths, load_xml_manifest(manifest_file), workers
+        )
+        store_xml_manifest(manifest_file, manifest, cache_format)
+        parsed = [
+            (manifest[str(f)].test_cases, manifest[str(f)].non_prop_tests)
+            for f in xml_paths
+        ]
+    for b, z in parsed:
         non_prop_tests = ", ".join(n for n in z)
         if non_prop_tests:
             logger.info(f"Tests missing properties: {non_prop_tests}")
         tcns.extend(b)
         for c in b:
-            construct_and_add_need(app, c)
+            construct_and_add_need(app, c, repo)
     return tcns
 
 
@@ -223,7 +447,9 @@ def short_hash(input_str: str, length: int = 5) -> str:
     return letters_only[:length].lower()
 
 
-def construct_and_add_need(app: Sphinx, tn: DataOfTestCase):
+def construct_and_add_need(
+    app: Sphinx, tn: DataOfTestCase, repo: RepoContext | None = None
+):
     # IDK if this is ideal or not
     with contextlib.suppress(BaseException):
         _ = add_external_need(
@@ -233,7 +459,7 @@ def construct_and_add_need(app: Sphinx, tn: DataOfTestCase):
             tags="TEST",
             id=f"testcase__{tn.name}_{short_hash(tn.file + tn.name).upper()}",
             name=tn.name,
-            external_url=get_github_link(tn),
+            external_url=get_github_link(tn, repo),
             fully_verifies=tn.FullyVerifies if tn.FullyVerifies is not None else "",
             partially_verifies=tn.PartiallyVerifies
             if tn.PartiallyVerifies is not None
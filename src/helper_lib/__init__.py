@@ -13,10 +13,13 @@
 
 import os
 import subprocess
+from dataclasses import dataclass
 from pathlib import Path
 
 from sphinx_needs.logging import get_logger
 
+from src.helper_lib.git_metadata import read_head_hash, read_remotes
+
 LOGGER = get_logger(__name__)
 
 
@@ -96,6 +99,21 @@ def get_github_repo_info(git_root_cwd: Path) -> str:
     Returns:
         Repository in format 'user/repo' or 'org/repo'
     """
+    # Prefer reading .git/config directly, spawning git is slow
+    remotes = read_remotes(git_root_cwd)
+    if remotes:
+        if "origin" in remotes:
+            repo = parse_remote_git_output(f"origin {remotes['origin']}")
+        else:
+            LOGGER.info(
+                "Did not find origin remote name. Will now take the first remote "
+                + "configured in .git/config"
+            )
+            name, url = next(iter(remotes.items()))
+            repo = parse_remote_git_output(f"{name} {url}")
+        if repo != "":
+            return repo
+
     process = subprocess.run(
         ["git", "remote", "-v"], capture_output=True, text=True, cwd=git_root_cwd
     )
@@ -151,6 +169,10 @@ def get_current_git_hash(git_root: Path) -> str:
     Returns:
         Full commit hash (40 character hex string)
     """
+    # Prefer reading .git directly, spawning git is slow
+    head_hash = read_head_hash(git_root)
+    if head_hash is not None:
+        return head_hash
     try:
         result = subprocess.run(
             ["git", "log", "-n", "1", "--pretty=format:%H"],
@@ -174,3 +196,38 @@ def get_current_git_hash(git_root: Path) -> str:
             exc_info=e,
         )
         raise
+
+
+@dataclass(frozen=True)
+class RepoContext:
+    """
+    Everything needed to build links into the repository on GitHub.
+    Resolve it once per build via 'resolve_repo_context' and pass it around,
+    so that building a link does not need to query git again.
+    """
+
+    root: Path
+    base_url: str
+    commit_hash: str
+
+    def blob_url(self, file: Path | str, line: int | str) -> str:
+        return f"{self.base_url}/blob/{self.commit_hash}/{file}#L{line}"
+
+
+def resolve_repo_context() -> RepoContext:
+    """
+    Query git once for the repository root, GitHub base URL and current commit.
+
+    Execution context behavior:
+    - 'bazel run' => ✅ Full context
+    - 'bazel build' => ⚠️ Uses Path() fallback when git_root is None
+    - 'direct sphinx' => ✅ Full context
+    """
+    git_root = find_git_root()
+    if git_root is None:
+        git_root = Path()
+    return RepoContext(
+        root=git_root,
+        base_url=f"https://github.com/{get_github_repo_info(git_root)}",
+        commit_hash=get_current_git_hash(git_root),
+    )
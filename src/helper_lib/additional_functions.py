@@ -10,29 +10,26 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
-from pathlib import Path
-
 # Import types that depend on score_source_code_linker
 from src.extensions.score_source_code_linker.needlinks import DefaultNeedLink, NeedLink
 from src.extensions.score_source_code_linker.testlink import (
     DataForTestLink,
     DataOfTestCase,
 )
-from src.helper_lib import (
-    find_git_root,
-    get_current_git_hash,
-    get_github_base_url,
-)
+from src.helper_lib import RepoContext, resolve_repo_context
 
 
 def get_github_link(
     link: NeedLink | DataForTestLink | DataOfTestCase | None = None,
+    repo: RepoContext | None = None,
 ) -> str:
+    """
+    Build the GitHub URL pointing to the line of 'link'.
+    Pass a 'repo' resolved once per build when creating many links; without it
+    git is queried on every call.
+    """
     if link is None:
         link = DefaultNeedLink()
-    passed_git_root = find_git_root()
-    if passed_git_root is None:
-        passed_git_root = Path()
-    base_url = get_github_base_url()
-    current_hash = get_current_git_hash(passed_git_root)
-    return f"{base_url}/blob/{current_hash}/{link.file}#L{link.line}"
+    if repo is None:
+        repo = resolve_repo_context()
+    return repo.blob_url(link.file, link.line)
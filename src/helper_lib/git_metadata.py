@@ -0,0 +1,158 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""
+Reads git metadata (HEAD commit, remotes) straight from the '.git' directory.
+
+This avoids spawning 'git' processes, which is slow and not possible in every
+sandbox. Every function returns None if it can not answer the question from the
+files alone, callers are expected to fall back to the git executable then.
+"""
+
+import os
+import re
+from pathlib import Path
+
+_HASH_RE = re.compile(r"[0-9a-f]{40}")
+# Section and key names are case-insensitive in git configs, subsection names
+# (here: the remote name) are not.
+_REMOTE_SECTION_RE = re.compile(r'\[\s*remote\s+"(?P<name>[^"]+)"\s*\]', re.IGNORECASE)
+_URL_RE = re.compile(r"url\s*=\s*(?P<url>.+)", re.IGNORECASE)
+# Sections that change the remote urls git reports ('url.<base>.insteadOf') or
+# pull in other config files. Only the git executable resolves them correctly.
+_UNSUPPORTED_SECTION_RE = re.compile(
+    r"^\s*\[\s*(url|include|includeif)\b", re.IGNORECASE | re.MULTILINE
+)
+
+
+def find_git_dir(git_root: Path) -> Path | None:
+    """
+    Return the git directory of the working tree at 'git_root'.
+
+    '.git' is either the directory itself or, for worktrees and submodules,
+    a file containing 'gitdir: <path>'.
+    """
+    dot_git = git_root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content.removeprefix("gitdir:").strip())
+            git_dir = git_root / git_dir if not git_dir.is_absolute() else git_dir
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def find_common_dir(git_dir: Path) -> Path:
+    """
+    Return the directory holding refs and config shared by all worktrees.
+    For the main worktree this is the git directory itself.
+    """
+    common_dir_file = git_dir / "commondir"
+    if common_dir_file.is_file():
+        common_dir = Path(common_dir_file.read_text(encoding="utf-8").strip())
+        return common_dir if common_dir.is_absolute() else git_dir / common_dir
+    return git_dir
+
+
+def _read_packed_ref(common_dir: Path, ref: str) -> str | None:
+    packed_refs = common_dir / "packed-refs"
+    if not packed_refs.is_file():
+        return None
+    for line in packed_refs.read_text(encoding="utf-8").splitlines():
+        # Skip the header ('#') and peeled tags ('^')
+        if line.startswith(("#", "^")):
+            continue
+        parts = line.split(maxsplit=1)
+        if len(parts) == 2 and parts[1] == ref:
+            return parts[0]
+    return None
+
+
+def _resolve_ref(git_dir: Path, common_dir: Path, content: str) -> str | None:
+    # Symbolic refs may point to other symbolic refs, but never very deep
+    for _ in range(5):
+        content = content.strip()
+        if _HASH_RE.fullmatch(content):
+            return content
+        if not content.startswith("ref:"):
+            return None
+        ref = content.removeprefix("ref:").strip()
+        # Loose refs are per worktree (e.g. HEAD) or shared (e.g. refs/heads/*)
+        for base in (git_dir, common_dir):
+            if (base / ref).is_file():
+                content = (base / ref).read_text(encoding="utf-8")
+                break
+        else:
+            return _read_packed_ref(common_dir, ref)
+    return None
+
+
+def read_head_hash(git_root: Path) -> str | None:
+    """
+    Return the commit hash HEAD points to, or None if it can not be determined
+    (no repository, no commits yet, unusual ref storage, ...).
+    """
+    try:
+        git_dir = find_git_dir(git_root)
+        if git_dir is None:
+            return None
+        head = (git_dir / "HEAD").read_text(encoding="utf-8")
+        return _resolve_ref(git_dir, find_common_dir(git_dir), head)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _global_config_files() -> list[Path]:
+    xdg_config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return [Path.home() / ".gitconfig", Path(xdg_config_home) / "git" / "config"]
+
+
+def _uses_unsupported_sections(config: str) -> bool:
+    return _UNSUPPORTED_SECTION_RE.search(config) is not None
+
+
+def read_remotes(git_root: Path) -> dict[str, str] | None:
+    """
+    Return the configured remotes as {name: url}, sorted by name like
+    'git remote -v' lists them.
+    None if the config can not be read, or uses 'url.<base>.insteadOf' rewrites
+    or includes (in the repository or the global config).
+    """
+    try:
+        git_dir = find_git_dir(git_root)
+        if git_dir is None:
+            return None
+        config = (find_common_dir(git_dir) / "config").read_text(encoding="utf-8")
+        if _uses_unsupported_sections(config):
+            return None
+        for global_config in _global_config_files():
+            if global_config.is_file() and _uses_unsupported_sections(
+                global_config.read_text(encoding="utf-8")
+            ):
+                return None
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    remotes: dict[str, str] = {}
+    current_remote: str | None = None
+    for line in config.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            section = _REMOTE_SECTION_RE.match(line)
+            current_remote = section.group("name") if section else None
+        elif current_remote is not None and current_remote not in remotes:
+            url = _URL_RE.match(line)
+            if url:
+                remotes[current_remote] = url.group("url").strip().strip('"')
+    return dict(sorted(remotes.items()))
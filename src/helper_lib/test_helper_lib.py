@@ -18,10 +18,13 @@ from pathlib import Path
 import pytest
 
 from src.helper_lib import (
+    RepoContext,
     get_current_git_hash,
     get_github_repo_info,
     parse_remote_git_output,
+    resolve_repo_context,
 )
+from src.helper_lib.git_metadata import read_head_hash, read_remotes
 
 
 @pytest.fixture
@@ -31,6 +34,16 @@ def temp_dir():
         yield Path(temp_dir)
 
 
+@pytest.fixture
+def no_global_git_config(temp_dir, monkeypatch):
+    """Hide the git config of the user, it may rewrite remote urls."""
+    home = temp_dir / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    return home
+
+
 @pytest.fixture
 def git_repo(temp_dir):
     """Create a real git repository for testing."""
@@ -238,3 +251,141 @@ def test_get_current_git_hash_invalid_repo(temp_dir):
     """Test getting git hash from invalid repository."""
     with pytest.raises(Exception):
         get_current_git_hash(temp_dir)
+
+
+def test_resolve_repo_context(git_repo, monkeypatch):
+    """Test resolving root, base url and hash of a repository at once."""
+    monkeypatch.delenv("BUILD_WORKSPACE_DIRECTORY", raising=False)
+    # Other tests leave the cwd in deleted temp directories, so no monkeypatch.chdir
+    os.chdir(git_repo)
+    repo = resolve_repo_context()
+    assert repo.root == git_repo.resolve()
+    assert repo.base_url == "https://github.com/test-user/test-repo"
+    assert repo.commit_hash == get_current_git_hash(git_repo)
+
+
+def test_repo_context_blob_url():
+    """Test that links are built from the context without querying git."""
+    repo = RepoContext(
+        root=Path("/ws"),
+        base_url="https://github.com/org/repo",
+        commit_hash="a" * 40,
+    )
+    assert (
+        repo.blob_url(Path("src/file.py"), 12)
+        == f"https://github.com/org/repo/blob/{'a' * 40}/src/file.py#L12"
+    )
+
+
+def _rev_parse(git_dir: Path, rev: str = "HEAD") -> str:
+    return subprocess.run(
+        ["git", "rev-parse", rev],
+        cwd=git_dir,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def test_read_head_hash_loose_and_packed_refs(git_repo):
+    """Test reading HEAD from loose refs as well as from packed-refs."""
+    expected = _rev_parse(git_repo)
+    assert read_head_hash(git_repo) == expected
+
+    subprocess.run(["git", "pack-refs", "--all"], cwd=git_repo, check=True)
+    assert not any((git_repo / ".git" / "refs" / "heads").iterdir())
+    assert read_head_hash(git_repo) == expected
+
+
+def test_read_head_hash_detached_and_worktree(git_repo, no_global_git_config):
+    """Test detached HEADs and worktrees with a 'gitdir:' file."""
+    first = _rev_parse(git_repo)
+    (git_repo / "second.py").write_text("print('second')\n")
+    subprocess.run(["git", "add", "."], cwd=git_repo, check=True)
+    subprocess.run(["git", "commit", "-m", "Second"], cwd=git_repo, check=True)
+
+    worktree = git_repo.parent / "worktree"
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", str(worktree), first],
+        cwd=git_repo,
+        check=True,
+        capture_output=True,
+    )
+    assert (worktree / ".git").is_file()
+    assert read_head_hash(worktree) == first
+    assert read_remotes(worktree) == {
+        "origin": "git@github.com:test-user/test-repo.git"
+    }
+    assert read_head_hash(git_repo) == _rev_parse(git_repo)
+
+
+def test_read_remotes_in_git_order(git_repo_multiple_remotes, no_global_git_config):
+    """Test that remotes are read from .git/config, sorted like 'git remote'."""
+    remotes = read_remotes(git_repo_multiple_remotes)
+    assert remotes is not None
+    # Compared as a list, dicts compare equal in any order
+    assert list(remotes.items()) == [
+        ("origin", "git@github.com:test-user/test-repo.git"),
+        ("upstream", "git@github.com:upstream/test-repo.git"),
+    ]
+    git_remotes = subprocess.run(
+        ["git", "remote"],
+        cwd=git_repo_multiple_remotes,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert list(remotes) == git_remotes
+
+
+def test_read_remotes_ignores_case_of_sections_and_keys(git_repo, no_global_git_config):
+    """Test that section and key names match in any case, remote names do not."""
+    config = git_repo / ".git" / "config"
+    config.write_text(
+        config.read_text() + '[Remote "Fork"]\n\tURL = git@github.com:fork/repo.git\n'
+    )
+    assert read_remotes(git_repo) == {
+        "Fork": "git@github.com:fork/repo.git",
+        "origin": "git@github.com:test-user/test-repo.git",
+    }
+
+
+@pytest.mark.parametrize(
+    "section",
+    [
+        '[url "git@github.com:"]\n\tinsteadOf = https://github.com/\n',
+        "[include]\n\tpath = other.config\n",
+        '[includeIf "gitdir:~/work/"]\n\tpath = work.config\n',
+    ],
+)
+def test_read_remotes_leaves_rewrites_and_includes_to_git(
+    git_repo, no_global_git_config, section
+):
+    """Test that configs git resolves differently fall back to the executable."""
+    config = git_repo / ".git" / "config"
+    original = config.read_text()
+    config.write_text(original + section)
+    assert read_remotes(git_repo) is None
+
+    # The same in the global config of the user
+    config.write_text(original)
+    (no_global_git_config / ".gitconfig").write_text(section)
+    assert read_remotes(git_repo) is None
+
+
+def test_git_metadata_outside_of_git(temp_dir):
+    """Test that the reader gives up outside of a repository."""
+    assert read_head_hash(temp_dir) is None
+    assert read_remotes(temp_dir) is None
+
+
+def test_git_functions_without_subprocess(git_repo, no_global_git_config, monkeypatch):
+    """Test that hash and repo info do not need the git executable."""
+    expected = _rev_parse(git_repo)
+
+    def _no_subprocess(*args, **kwargs):
+        raise AssertionError("git should not be executed")
+
+    monkeypatch.setattr(subprocess, "run", _no_subprocess)
+    assert get_current_git_hash(git_repo) == expected
+    assert get_github_repo_info(git_repo) == "test-user/test-repo"
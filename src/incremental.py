@@ -15,6 +15,7 @@ import argparse
 import logging
 import os
 import sys
+import tempfile
 import time
 from pathlib import Path
 
@@ -22,6 +23,8 @@ import debugpy
 from sphinx.cmd.build import main as sphinx_main
 from sphinx_autobuild.__main__ import main as sphinx_autobuild_main
 
+from src.extensions.score_source_code_linker.watch import start_watching
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,14 +97,32 @@ if __name__ == "__main__":
         Path(workspace + "/_build/score_source_code_linker_cache.json").unlink(
             missing_ok=True
         )
-        sphinx_autobuild_main(
-            base_arguments
-            + [
-                # Note: bools need to be passed via '0' and '1' from the command line.
-                "--define=skip_rescanning_via_source_code_linker=1",
-                f"--port={args.port}",
-            ]
-        )
+        # Source files outside of the docs are not watched by sphinx-autobuild.
+        # The source code link watcher updates the caches on changes and then
+        # touches a file in 'trigger_dir', which is watched, to start a rebuild.
+        with tempfile.TemporaryDirectory(prefix="score_live_preview_") as tmp:
+            trigger_dir = Path(tmp)
+
+            def trigger_rebuild():
+                (trigger_dir / "source_code_links").write_text(str(time.time_ns()))
+
+            if workspace:
+                # The caches keep the format the Sphinx build writes them in
+                start_watching(
+                    Path(workspace).resolve(),
+                    Path(workspace + "_build").resolve(),
+                    trigger_rebuild,
+                )
+            sphinx_autobuild_main(
+                base_arguments
+                + [
+                    # Note: bools need to be passed via '0' and '1' from the
+                    # command line.
+                    "--define=skip_rescanning_via_source_code_linker=1",
+                    f"--port={args.port}",
+                    f"--watch={trigger_dir}",
+                ]
+            )
     else:
         if action == "incremental":
             builder = "html"